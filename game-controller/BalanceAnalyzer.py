@@ -0,0 +1,316 @@
+#######################
+# IMPORTS AND MODULES #
+#######################
+import argparse
+import time
+
+import numpy as np
+
+from boards import Board, getBoard
+from CellType import CellType, GAIN_POINTS, LOSE_POINTS, MINIGAME_POINTS, MOVE_STEPS, RANDOM_EVENTS
+
+"""
+Monte Carlo balance analysis of boards and cell effects.
+Plays millions of games at once with NumPy, one array row per game, using the cells of a board
+and the effect distributions of GameSession, including chains of Move Forward, Move Backward
+and Random Event landings. Only the rules are simulated: each minigame has a single winner
+chosen uniformly among all players.
+Reports the game length, the win rate of every seat and the expected points of every cell.
+Requires NumPy, which the controller itself does not need (pip install numpy).
+
+Usage:
+    python BalanceAnalyzer.py [--boards ClassicBoard boards/classic.json] [--games 200000] [--players 2] [--win-points 50]
+"""
+
+# Codes of the cell types in the board arrays
+CELL_CODES = {cell: code for code, cell in enumerate(CellType)}
+GP, LP, MF, MG, MB, DE, SK, RE = (CELL_CODES[cell] for cell in (
+    CellType.GP, CellType.LP, CellType.MF, CellType.MG, CellType.MB, CellType.DE, CellType.SK, CellType.RE
+))
+
+# Games simulated together, bounding the memory used (a few MB per 100k games)
+BATCH_SIZE = 100_000
+
+# Turns after which a game is given up as unfinished
+MAX_TURNS = 10_000
+
+# Move Forward/Backward landings followed in a single turn; longer chains are cut (vanishingly rare)
+MAX_CHAIN = 64
+
+
+class BalanceReport:
+    """
+    Aggregated outcome of the games played on a board.
+
+    Attributes:
+        board (str): Name of the board
+        cells (list[CellType]): Cells of the board
+        num_players (int): Number of players per game
+        games (int): Number of games played
+        lengths (np.ndarray): Turns played by every finished game, skipped turns included
+        wins (np.ndarray): Games won by every seat, in turn order
+        draws (int): Games ending with several players tied on the best score
+        unfinished (int): Games given up after MAX_TURNS turns
+        landings (np.ndarray): Landings on every cell, chained landings included
+        cellPoints (np.ndarray): Points gained by the players landing on every cell
+    """
+
+    def __init__(self, board: str, cells: list[CellType], num_players: int) -> None:
+        """
+        Initialize an empty report.
+
+        Args:
+            board: Name of the board
+            cells: Cells of the board
+            num_players: Number of players per game
+
+        Returns:
+            None
+        """
+        self.board = board
+        self.cells = cells
+        self.num_players = num_players
+        self.games = 0
+        self.lengths = np.zeros(0, np.int32)
+        self.wins = np.zeros(num_players, np.int64)
+        self.draws = 0
+        self.unfinished = 0
+        self.landings = np.zeros(len(cells), np.int64)
+        self.cellPoints = np.zeros(len(cells), np.int64)
+
+    def __str__(self) -> str:
+        """
+        Summary of the report.
+
+        Returns:
+            str: Game lengths, win rates by seat and expected points per cell
+        """
+        lines = [f"{self.board}: {self.games} games, {self.num_players} players"]
+        if self.lengths.size:
+            p5, p50, p95 = np.percentile(self.lengths, (5, 50, 95))
+            lines.append(
+                f"  Turns per game: mean {self.lengths.mean():.1f}, p5 {p5:.0f}, median {p50:.0f}, p95 {p95:.0f}"
+            )
+        seats = ", ".join(f"P{seat + 1} {wins / self.games:.1%}" for seat, wins in enumerate(self.wins))
+        lines.append(f"  Win rate: {seats}, draws {self.draws / self.games:.1%}, unfinished {self.unfinished}")
+        lines.append(f"  {'cell':>6}  {'type':<14}{'landings':>10}{'points/landing':>16}")
+        total = max(1, self.landings.sum())
+        for position, cell in enumerate(self.cells):
+            landings = self.landings[position]
+            points = self.cellPoints[position] / landings if landings else 0
+            lines.append(f"  {position:>6}  {cell.value:<14}{landings / total:>10.1%}{points:>16.2f}")
+        return "\n".join(lines)
+
+
+class BalanceAnalyzer:
+    """
+    Vectorized simulator of the game rules on a board.
+
+    Attributes:
+        board (Board): Board the games are played on
+        num_players (int): Number of players per game
+        win_points (int): Points needed to win
+        cells (np.ndarray): Cell type code of every board position
+    """
+
+    def __init__(self, board: Board, num_players: int = 2, win_points: int = 50) -> None:
+        """
+        Initialize the analyzer.
+
+        Args:
+            board: Board the games are played on
+            num_players: Number of players per game (default: 2)
+            win_points: Points needed to win (default: 50)
+
+        Returns:
+            None
+        """
+        self.board = board
+        self.num_players = num_players
+        self.win_points = win_points
+        self.cells = np.array([CELL_CODES[cell] for cell in board.cells], np.int8)
+        self.randomEvents = np.array([CELL_CODES[cell] for cell in RANDOM_EVENTS], np.int8)
+        odds = np.array(list(RANDOM_EVENTS.values()))
+        self.randomOdds = np.cumsum(odds / odds.sum())
+
+        # Random amount of every effect, as sign * (low + floor(u * span)) for a uniform u in [0, 1):
+        # points for Gain/Lose Points, steps for Move Forward/Backward and the winner seat for MiniGame
+        self.amountSign = np.zeros(len(CELL_CODES), np.int32)
+        self.amountLow = np.zeros(len(CELL_CODES), np.int32)
+        self.amountSpan = np.zeros(len(CELL_CODES), np.float32)
+        amounts = (
+            (GP, 1, GAIN_POINTS),
+            (LP, -1, LOSE_POINTS),
+            (MF, 1, MOVE_STEPS),
+            (MB, -1, MOVE_STEPS),
+            (MG, 1, (0, num_players - 1)),
+        )
+        for code, sign, (low, high) in amounts:
+            self.amountSign[code], self.amountLow[code], self.amountSpan[code] = sign, low, high - low + 1
+        self.changesPoints = np.isin(np.arange(len(CELL_CODES)), (GP, LP))
+        self.moves = np.isin(np.arange(len(CELL_CODES)), (MF, MB))
+
+        # Same tables per board position, with the ranges the board sets for its cells,
+        # used when a cell plays its own effect (not a random event)
+        self.cellLow = self.amountLow[self.cells]
+        self.cellSpan = self.amountSpan[self.cells]
+        self.minigamePoints = np.full(len(self.cells), MINIGAME_POINTS, np.int32)
+        for position, cell in enumerate(board.cells):
+            if cell in (CellType.GP, CellType.LP, CellType.MF, CellType.MB):
+                low, high = board.getCellRange(position, (0, 0))
+                if high:
+                    self.cellLow[position], self.cellSpan[position] = low, high - low + 1
+            elif cell == CellType.MG:
+                self.minigamePoints[position] = board.getCellRange(position, (MINIGAME_POINTS, MINIGAME_POINTS))[0]
+
+    def run(self, games: int, seed: int = 0) -> BalanceReport:
+        """
+        Plays games in batches of BATCH_SIZE.
+
+        Args:
+            games: Number of games to play
+            seed: Seed of the random generator; the same seed gives the same report
+
+        Returns:
+            BalanceReport: Outcome of the games
+        """
+        rng = np.random.default_rng(seed)
+        report = BalanceReport(getattr(self.board, "name", type(self.board).__name__), self.board.cells, self.num_players)
+        lengths = []
+        for start in range(0, games, BATCH_SIZE):
+            lengths.append(self.playBatch(min(BATCH_SIZE, games - start), rng, report))
+        report.lengths = np.concatenate(lengths)
+        return report
+
+    def playBatch(self, games: int, rng: np.random.Generator, report: BalanceReport) -> np.ndarray:
+        """
+        Plays a batch of games in lockstep, one turn of every unfinished game at a time.
+        Every turn follows GameSession: a skipped player only clears the flag, the others roll,
+        move and play the cell, then any player at win_points ends the game.
+
+        Args:
+            games: Number of games in the batch
+            rng: Random generator
+            report: Report the outcome is added to
+
+        Returns:
+            np.ndarray: Turns played by every finished game
+        """
+        # One row per seat, so the state of the player whose turn it is is a contiguous array
+        points = np.zeros((self.num_players, games), np.int32)
+        position = np.zeros((self.num_players, games), np.int32)
+        skipped = np.zeros((self.num_players, games), bool)
+        playing = np.arange(games)
+        lengths = []
+
+        for turn in range(1, MAX_TURNS + 1):
+            seat = (turn - 1) % self.num_players
+            isSkipped = skipped[seat, playing]
+            skipped[seat, playing[isSkipped]] = False
+            moving = playing[~isSkipped]
+            steps = rng.integers(1, 7, moving.size)
+            position[seat, moving] = (position[seat, moving] + steps) % len(self.cells)
+            self.playCells(moving, points, position[seat], skipped[seat], seat, rng, report)
+
+            # Only the games that were playing can have a new winner
+            scores = points[:, playing]
+            best = scores[0]
+            for row in scores[1:]:
+                best = np.maximum(best, row)
+            over = best >= self.win_points
+            if over.any():
+                finished = scores[:, over]
+                leaders = finished == best[over]
+                single = leaders.sum(axis=0) == 1
+                report.wins += np.bincount(finished[:, single].argmax(axis=0), minlength=self.num_players)
+                report.draws += int((~single).sum())
+                lengths.append(np.full(int(over.sum()), turn, np.int32))
+                playing = playing[~over]
+            if playing.size == 0:
+                break
+
+        report.games += games
+        report.unfinished += playing.size
+        return np.concatenate(lengths) if lengths else np.zeros(0, np.int32)
+
+    def playCells(
+        self,
+        games: np.ndarray,
+        points: np.ndarray,
+        position: np.ndarray,
+        skipped: np.ndarray,
+        seat: int,
+        rng: np.random.Generator,
+        report: BalanceReport,
+    ) -> None:
+        """
+        Plays the cell every moving player landed on, following Move Forward/Backward chains.
+        The points a landing gives to its player are credited to the landed cell.
+
+        Args:
+            games: Games whose player in the seat moved this turn
+            points: Points of every player of every game, one row per seat
+            position: Position of the player in the seat in every game
+            skipped: Skipped flag of the player in the seat in every game
+            seat: Seat of the player whose turn it is
+            rng: Random generator
+            report: Report the landings are added to
+
+        Returns:
+            None
+        """
+        size = len(self.cells)
+        own = points[seat]
+        for _ in range(MAX_CHAIN):
+            if games.size == 0:
+                break
+            landed = position[games]
+            effect = self.cells[landed]
+            low, span = self.cellLow[landed], self.cellSpan[landed]
+            random = effect == RE
+            if random.any():
+                # Inverse transform sampling, much cheaper than Generator.choice with odds
+                draws = np.searchsorted(self.randomOdds, rng.random(int(random.sum())), side="right")
+                effect[random] = self.randomEvents[np.minimum(draws, len(self.randomEvents) - 1)]
+                low[random], span[random] = self.amountLow[effect[random]], self.amountSpan[effect[random]]
+
+            # Every landing has a single effect, so one uniform draw gives its random amount
+            uniform = rng.random(games.size, np.float32)
+            amount = self.amountSign[effect] * (low + (uniform * span).astype(np.int32))
+
+            # Points of the player: one gather, the effects as element-wise selections, one scatter
+            before = own[games]
+            after = np.where(self.changesPoints[effect], np.maximum(before + amount, 0), before)
+            after[effect == DE] = 0
+            own[games] = after
+            skipped[games[effect == SK]] = True
+            minigame = effect == MG
+            if minigame.any():
+                points[amount[minigame], games[minigame]] += self.minigamePoints[landed[minigame]]
+
+            report.landings += np.bincount(landed, minlength=size)
+            report.cellPoints += np.bincount(landed, own[games] - before, size).astype(np.int64)
+
+            # Moves land on a new cell, played in the next iteration
+            moved = self.moves[effect]
+            if not moved.any():
+                break
+            games = games[moved]
+            position[games] = (position[games] + amount[moved]) % size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo balance analysis of game boards")
+    parser.add_argument("--boards", nargs="+", default=["ClassicBoard"], help="board classes or board files to compare")
+    parser.add_argument("--games", type=int, default=200_000)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--win-points", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for name in args.boards:
+        analyzer = BalanceAnalyzer(getBoard(name), args.players, args.win_points)
+        start = time.perf_counter()
+        report = analyzer.run(args.games, args.seed)
+        print(report)
+        print(f"  ({time.perf_counter() - start:.1f}s)")
@@ -14,3 +14,18 @@ class CellType(Enum):
     DE = "Death"            # Lose all points
     SK = "Skip Turn"        # Skip next turn
     RE = "Random Event"     # Random effect occurs
+
+
+# Default cell effects: inclusive ranges of the random amounts, and the odds of every random event.
+# Boards can set the range of each of their cells.
+GAIN_POINTS = (5, 10)
+LOSE_POINTS = (1, 5)
+MOVE_STEPS = (1, 3)
+MINIGAME_POINTS = 10
+RANDOM_EVENTS = {
+    CellType.MF: 1 / 5,
+    CellType.MB: 1 / 5,
+    CellType.GP: 1 / 5,
+    CellType.LP: 1 / 5,
+    CellType.SK: 1 / 5,
+}
@@ -0,0 +1,184 @@
+import asyncio
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+
+
+class Clock(ABC):
+    """
+    Source of time for the game: every pause and timestamp goes through a clock,
+    so games can run in real time, in faster scaled time or in simulated time.
+    """
+
+    @abstractmethod
+    def time(self) -> float:
+        """
+        Current time of the clock.
+
+        Returns:
+            float: Seconds since an arbitrary reference point
+        """
+        pass
+
+    @abstractmethod
+    async def sleep(self, seconds: float) -> None:
+        """
+        Pause the calling coroutine.
+
+        Args:
+            seconds: Seconds to wait
+
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def wait(self, seconds: float) -> None:
+        """
+        Pause the calling thread, for code that does not run on an event loop.
+
+        Args:
+            seconds: Seconds to wait
+
+        Returns:
+            None
+        """
+        pass
+
+
+class RealClock(Clock):
+    """
+    Wall clock time, used when playing with real players.
+    """
+
+    def time(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    def wait(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class ScaledClock(Clock):
+    """
+    Wall clock time running faster (or slower) by a constant factor, for quick demos.
+    A scale of 4 turns a 4 second pause into 1 real second, and the clock reports 4 seconds elapsed.
+
+    Attributes:
+        scale (float): Simulated seconds per real second
+    """
+
+    def __init__(self, scale: float) -> None:
+        """
+        Initialize the clock.
+
+        Args:
+            scale: Simulated seconds per real second, must be positive
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the scale is not positive
+        """
+        if scale <= 0:
+            raise ValueError(f"Clock scale must be positive, not {scale}")
+        self.scale = scale
+        self.origin = time.monotonic()
+
+    def time(self) -> float:
+        return self.origin + (time.monotonic() - self.origin) * self.scale
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds / self.scale)
+
+    def wait(self, seconds: float) -> None:
+        time.sleep(seconds / self.scale)
+
+
+class VirtualClock(Clock):
+    """
+    Simulated time that only moves when advanced, used for simulations and tests.
+    Sleeping coroutines wait in a heap ordered by deadline (and call order for equal deadlines),
+    and advance() jumps straight to the next deadline, so pauses take no real time.
+    advanceBy() moves the clock manually, waking every coroutine whose deadline it passes.
+
+    Attributes:
+        now (float): Current simulated time in seconds
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        """
+        Initialize the clock.
+
+        Args:
+            start: Initial simulated time in seconds (default: 0)
+
+        Returns:
+            None
+        """
+        self.now = start
+        self.sleepers: list[tuple[float, int, asyncio.Future]] = []
+        self.counter = itertools.count()
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.sleepers, (self.now + max(seconds, 0), next(self.counter), future))
+        await future
+
+    def wait(self, seconds: float) -> None:
+        """
+        Refuses to block: simulated time is shared by every coroutine of the clock, so a blocking
+        wait (e.g. from another thread) must not move it.
+
+        Args:
+            seconds: Seconds to wait
+
+        Raises:
+            RuntimeError: Always, advance the clock from the event loop instead
+        """
+        raise RuntimeError("VirtualClock cannot block a thread; use advance() or advanceBy() from the event loop")
+
+    def advance(self) -> bool:
+        """
+        Jumps to the next deadline and wakes every coroutine sleeping until then.
+
+        Returns:
+            bool: False if no coroutine was sleeping
+        """
+        while self.sleepers and self.sleepers[0][2].done():  # Cancelled sleepers
+            heapq.heappop(self.sleepers)
+        if not self.sleepers:
+            return False
+        deadline = self.sleepers[0][0]
+        self.now = max(self.now, deadline)
+        while self.sleepers and self.sleepers[0][0] == deadline:
+            _, _, future = heapq.heappop(self.sleepers)
+            if not future.done():
+                future.set_result(None)
+        return True
+
+    def advanceBy(self, seconds: float) -> None:
+        """
+        Moves the clock forward, waking every coroutine sleeping until then.
+        Woken coroutines run the next time the event loop gets control.
+
+        Args:
+            seconds: Seconds to move forward
+
+        Returns:
+            None
+        """
+        target = self.now + max(seconds, 0)
+        while self.sleepers and self.sleepers[0][0] <= target:
+            _, _, future = heapq.heappop(self.sleepers)
+            if not future.done():
+                future.set_result(None)
+        self.now = target
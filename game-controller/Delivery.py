@@ -0,0 +1,62 @@
+"""
+Delivery policy of every class of MQTT topic used by the game.
+Player state that a base must not miss (its turn, the frame it should be showing while the
+game waits for it) is sent with QoS 1 and retained, so a lost message is redelivered and a
+rebooted base gets the current state as soon as it subscribes. Animation frames and sounds
+are only meaningful when they happen, so they stay QoS 0 and are not retained.
+"""
+
+# Topic classes
+TURN = "turn"            # {prefix}/players/{id}/turn
+LCD_FRAME = "lcd"        # LCD frames shown in passing (animations, countdowns, results)
+LCD_STATE = "lcd_state"  # LCD frames describing what the game is waiting for
+BUZZER = "buzzer"        # Sounds
+INPUT = "input"          # Subscriptions to the connection, button and hall sensor topics
+
+
+class DeliveryPolicy:
+    """
+    MQTT delivery options of a topic class.
+    Policies are immutable, so they can be shared by every publish.
+
+    Attributes:
+        qos (int): MQTT quality of service
+        retain (bool): Whether the broker keeps the last message for new subscribers
+    """
+
+    __slots__ = ("qos", "retain")
+
+    def __init__(self, qos: int = 0, retain: bool = False) -> None:
+        """
+        Initialize the policy.
+
+        Args:
+            qos: MQTT quality of service, 0 to 2
+            retain: Whether the broker retains the message
+
+        Raises:
+            ValueError: If the quality of service is not valid
+        """
+        if qos not in (0, 1, 2):
+            raise ValueError(f"Invalid QoS {qos}")
+        object.__setattr__(self, "qos", qos)
+        object.__setattr__(self, "retain", retain)
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"DeliveryPolicy(qos={self.qos}, retain={self.retain})"
+
+
+# Default policy of every topic class
+DELIVERY_POLICIES: dict[str, DeliveryPolicy] = {
+    TURN: DeliveryPolicy(qos=1, retain=True),
+    LCD_FRAME: DeliveryPolicy(qos=0, retain=False),
+    LCD_STATE: DeliveryPolicy(qos=1, retain=True),
+    BUZZER: DeliveryPolicy(qos=0, retain=False),
+    INPUT: DeliveryPolicy(qos=1),
+}
+
+# Policy of every topic class before policies existed: fire and forget
+BEST_EFFORT_POLICIES: dict[str, DeliveryPolicy] = {topic_class: DeliveryPolicy() for topic_class in DELIVERY_POLICIES}
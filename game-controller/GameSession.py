@@ -0,0 +1,1234 @@
+#######################
+# IMPORTS AND MODULES #
+#######################
+import json
+import time
+import asyncio
+import paho.mqtt.client as mqtt
+
+import Melodies
+import Screens
+
+from random import Random
+from CellType import CellType, GAIN_POINTS, LOSE_POINTS, MINIGAME_POINTS, MOVE_STEPS, RANDOM_EVENTS
+from Clock import Clock, RealClock
+from GameState import GameState, Phase, TRANSITIONS
+from Inbox import Inbox
+from InputEvent import InputEvent, decodeInput, SHORT_PRESS, LONG_PRESS
+from asyncio import Event
+from typing import Callable
+from Player import Player
+from Roster import Roster
+from Scoreboard import Scoreboard
+from Delivery import INPUT
+from Journal import Journal
+from Message import CODECS, DEFAULT_CODEC
+from Metrics import messagesIgnored, reactionSeconds, stateSeconds
+from Tracing import tracer
+from Utils import Utils, publishCounters, CONNECTION_COMPONENT, BUTTON_COMPONENT, HALL_SENSOR_COMPONENT
+from boards import *
+from minigames import *
+
+"""
+Game session module that owns the state of a single game (one table).
+Each session keeps its own players, board, turn, state and synchronization events,
+so several sessions can share one MQTT connection and one Python process.
+Turn phases are coroutines: pauses are clock sleeps and inputs are asyncio events
+set from the session event loop, so many sessions can run on a single loop.
+The clock and random generator are injectable, so games can also be simulated.
+With a journal, every turn is recorded as events, and an interrupted game is resumed on restart.
+"""
+
+######################
+# MQTT TOPIC STRINGS #
+######################
+# Components
+PLAYERS_CONNECTION_TOPIC = "{prefix}/players/{id}/connection"
+PLAYERS_LCD_TOPIC = "{prefix}/players/{id}/components/lcd"
+PLAYERS_BUZZER_TOPIC = "{prefix}/players/{id}/components/buzzer"
+PLAYERS_BUTTON_TOPIC = "{prefix}/players/{id}/components/button"
+PLAYERS_TURN_TOPIC = "{prefix}/players/{id}/turn"
+PLAYERS_HALL_SENSOR_TOPIC = "{prefix}/players/{id}/movement"
+
+# Inputs the session subscribes to once, for every player; each phase only handles the ones it expects
+PLAYERS_INPUT_TOPICS = (PLAYERS_CONNECTION_TOPIC, PLAYERS_BUTTON_TOPIC, PLAYERS_HALL_SENSOR_TOPIC)
+
+# Prefix used by the original single-table deployment
+DEFAULT_PREFIX = "game"
+
+# Supported number of players per table
+MIN_PLAYERS = 2
+MAX_PLAYERS = 16
+
+# Seconds each page of the stats screen is shown
+STATS_PAGE_TIME = 3
+
+# Available minigames configuration
+MINIGAMES = {
+    MinigameType.Hot_Potato: HotPotato,
+    MinigameType.Number_Guesser: NumberGuesser,
+    MinigameType.Tug_of_War: TugOfWar,
+    MinigameType.Last_Stick_Standing: LastStickStanding,
+    # MinigameType.Blind_Timer: Minigame,
+    # MinigameType.Rock_Paper_Scissors: Minigame,
+    # MinigameType.Quick_Reflexes: Minigame,
+}
+
+
+class GameSession:
+    """
+    A single game running on one table.
+    Owns the players, board, turn and game state that used to live in the controller globals,
+    together with the events used to coordinate the game flow with incoming MQTT messages.
+
+    Attributes:
+        client (mqtt.Client): Shared MQTT client used for publishing
+        prefix (str): Topic prefix of the table (e.g. "game" or "game/table-2")
+        players (Roster): Players of this session, in turn order
+        scoreboard (Scoreboard): Points and leaderboard of the players; every change of points goes through it
+        board (Board): Board used in this session
+        phase (Phase): State of the game, its input handlers and the minigame being played,
+            replaced as a whole by setGameState (current_state and current_minigame read it)
+        turn (int): Index of the player whose turn it is
+        loop (asyncio.AbstractEventLoop): Event loop running the session, while it runs
+        clock (Clock): Clock used for every pause of the game
+        rng (Random): Random generator behind dice, cell effects and minigames
+        quiet (bool): Whether to skip the progress messages printed to the console
+        journal (Journal): Journal the game events are recorded in, if any
+        board_file (str): Board file loaded when the game starts, if any
+    """
+
+    def __init__(
+        self,
+        client: mqtt.Client,
+        prefix: str = DEFAULT_PREFIX,
+        num_players: int = 2,
+        win_points: int = 50,
+        debug: bool = False,
+        clock: Clock = None,
+        rng: Random = None,
+        quiet: bool = False,
+        journal: Journal = None,
+        board_file: str = None,
+        inbox: Inbox = None,
+    ) -> None:
+        """
+        Initialize a new game session.
+
+        Args:
+            client: Shared MQTT client instance
+            prefix: Topic prefix identifying the table
+            num_players: Number of players in the session
+            win_points: Points needed to win the game
+            debug: Boolean flag for debug mode
+            clock: Clock used for pauses (default: real time)
+            rng: Random generator, seeded for reproducible games (default: unseeded)
+            quiet: Skip the progress messages printed to the console
+            journal: Journal to record the game in and recover it from (default: none)
+            board_file: Board file loaded when the game starts, so it can change between games
+                (default: the built-in board)
+            inbox: Queue of the messages waiting for the session event loop (default: a new inbox)
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the number of players is not supported
+        """
+        if not MIN_PLAYERS <= num_players <= MAX_PLAYERS:
+            raise ValueError(f"Sessions support {MIN_PLAYERS} to {MAX_PLAYERS} players, not {num_players}")
+        self.client = client
+        self.prefix = prefix
+        self.debug = debug
+        self.clock = clock or RealClock()
+        self.rng = rng or Random()
+        self.quiet = quiet
+        self.journal = journal
+        self.board_file = board_file
+        self.inbox = inbox or Inbox()
+        self.num_players = num_players
+        self.win_points = win_points
+        self.players = Roster(Player(i) for i in range(1, num_players + 1))
+        self.scoreboard = Scoreboard(self.players, win_points, self.reachedWinPoints)
+        self.inbox.addPlayers(player.id for player in self.players)
+        self.utils = Utils(client, self.players, debug, prefix)
+
+        # Events for coordinating game flow
+        self.waitPlayersEvent = Event()
+        self.waitDiceEvent = Event()
+        self.waitMovementEvent = Event()
+        self.waitMinigameElectionEvent = Event()
+
+        # Track turn (the game state is in the phase, set below)
+        self.turn = 0
+        self.board = DebugBoard() if debug else ClassicBoard()
+        self.minigames = MINIGAMES
+        self.loop: asyncio.AbstractEventLoop = None
+
+        # Debug mode minigame selection helpers
+        self.orderedMinigames: list[MinigameType] = list(sorted(self.minigames, key=lambda x: x.name))
+        self.randomGameDebug: MinigameType = None
+        self.minigameIndex: int = 0
+
+        # Message handlers of every state, indexed by topic component
+        self.stateHandlers: dict[GameState, dict[str, Callable[[InputEvent], None]]] = {
+            GameState.WAITING_FOR_PLAYERS: {CONNECTION_COMPONENT: self.managePlayersConnection},
+            GameState.ROLLING_DICE: {BUTTON_COMPONENT: self.manageDiceRoll},
+            GameState.MOVING: {HALL_SENSOR_COMPONENT: self.managePlayerHallSensor},
+            GameState.MINIGAME_ELECTION: {BUTTON_COMPONENT: self.manageGameElectionManually},  # Only for debug mode
+        }
+        self.phase = Phase(
+            GameState.WAITING_FOR_PLAYERS, self.stateHandlers[GameState.WAITING_FOR_PLAYERS], since=self.clock.time()
+        )
+
+    @property
+    def current_state(self) -> GameState:
+        """
+        Current state of the game.
+
+        Returns:
+            GameState: State of the current phase
+        """
+        return self.phase.state
+
+    @property
+    def handlers(self) -> dict[str, Callable[[InputEvent], None]]:
+        """
+        Input handlers of the current state, indexed by topic component.
+
+        Returns:
+            dict[str, Callable[[InputEvent], None]]: Handlers of the current phase
+        """
+        return self.phase.handlers
+
+    @property
+    def current_minigame(self) -> Minigame | None:
+        """
+        Minigame being played.
+
+        Returns:
+            Minigame | None: Minigame of the current phase, None outside the MINIGAME state
+        """
+        return self.phase.minigame
+
+    def log(self, message) -> None:
+        """
+        Prints a progress message of the session, tagged with its prefix.
+
+        Args:
+            message: Message to print
+
+        Returns:
+            None
+        """
+        if not self.quiet:
+            print(f"[{self.prefix}] {message}")
+
+    def topic(self, template: str, player_id) -> str:
+        """
+        Builds a topic of this session for the given player.
+
+        Args:
+            template: Topic template with {prefix} and {id} placeholders
+            player_id: Player identifier or MQTT wildcard
+
+        Returns:
+            str: Topic string
+        """
+        return template.format(prefix=self.prefix, id=player_id)
+
+    async def run(self) -> None:
+        """
+        Runs the whole session: waits for the players and plays the game until it is over.
+        Inputs received before the session started are handled once it has recovered its journal.
+
+        Returns:
+            None
+        """
+        self.loop = asyncio.get_running_loop()
+        if self.inbox.scheduled:
+            self.loop.call_soon(self.drainInbox)
+        try:
+            self.subscribeInputs()
+            if self.board_file:
+                self.board = loadBoard(self.board_file)
+            resumed = self.recover()
+            await self.waitForPlayers()
+            await self.initGame(resumed)
+        finally:
+            self.loop = None
+
+    def runBlocking(self) -> None:
+        """
+        Runs the session on its own event loop, blocking the calling thread until it is over.
+        Compatibility path for running every session in a dedicated thread.
+
+        Returns:
+            None
+        """
+        asyncio.run(self.run())
+
+    ###########
+    # JOURNAL #
+    ###########
+    def record(self, event_type: str, **fields) -> None:
+        """
+        Records a game event in the journal, if the session has one.
+        Events hold absolute values (e.g. the new position), so replaying them is idempotent.
+
+        Args:
+            event_type: Type of the event
+            **fields: Data of the event
+
+        Returns:
+            None
+        """
+        if self.journal is not None:
+            self.journal.append(event_type, **fields)
+
+    def commitTurn(self) -> None:
+        """
+        Writes the events of the turn that just ended to the journal.
+
+        Returns:
+            None
+        """
+        if self.journal is not None:
+            self.journal.commit(self.snapshotState)
+
+    def snapshotState(self) -> dict:
+        """
+        Captures the state needed to resume the game.
+
+        Returns:
+            dict: Number of players, turn, whether the game is over and the state of every player
+        """
+        return {
+            "num_players": self.num_players,
+            "board_size": self.board.size,
+            "turn": self.turn,
+            "over": self.current_state == GameState.GAME_OVER,
+            "players": [
+                {"points": player.points, "position": player.position, "skipped": player.skipped}
+                for player in self.players
+            ],
+        }
+
+    def restoreState(self, state: dict) -> None:
+        """
+        Restores a state captured by snapshotState.
+
+        Args:
+            state: Snapshot state
+
+        Returns:
+            None
+        """
+        self.turn = state["turn"]
+        for player, saved in zip(self.players, state["players"]):
+            player.points = saved["points"]
+            player.position = saved["position"]
+            player.skipped = saved["skipped"]
+        self.scoreboard.rebuild()
+
+    def applyEvent(self, event: dict) -> None:
+        """
+        Replays a journal event on the session state.
+
+        Args:
+            event: Journal event
+
+        Returns:
+            None
+        """
+        match event["type"]:
+            case "move":
+                self.players.get(event["player"]).position = event["position"]
+            case "points":
+                self.scoreboard.set(self.players.get(event["player"]), event["points"])
+            case "skip":
+                self.players.get(event["player"]).skipped = event["skipped"]
+            case "turn":
+                self.turn = event["turn"]
+
+    def recover(self) -> bool:
+        """
+        Rebuilds the state of an interrupted game from the journal: the latest snapshot, then
+        the events of the turns played after it. The turn being played when the game stopped is
+        played again from the start. Finished games, or games with another number of players
+        or board size, are discarded.
+
+        Returns:
+            bool: Whether a game was resumed
+        """
+        if self.journal is None:
+            return False
+        state, events = self.journal.recover()
+        if state is None and not events:
+            return False
+        starts = [event for event in events if event["type"] == "start"]
+        setup = state if state is not None else starts[0] if starts else {}
+        if (
+            setup.get("num_players") != self.num_players
+            or setup.get("board_size") != self.board.size
+            or (state is not None and state["over"])
+            or any(event["type"] == "game_over" for event in events)
+        ):
+            self.journal.reset()
+            return False
+
+        if state is not None:
+            self.restoreState(state)
+        for event in events:
+            self.applyEvent(event)
+        self.log(f"Resumed game at turn of Player {self.players[self.turn].id} ({len(events)} events replayed)")
+        return True
+
+    ##########################
+    # MQTT MESSAGE HANDLING  #
+    ##########################
+    def subscribeInputs(self) -> None:
+        """
+        Subscribes once to the inputs of every player.
+        Messages are then gated in-process by the handlers of the current state,
+        instead of subscribing and unsubscribing on every turn phase.
+
+        Returns:
+            None
+        """
+        qos = self.utils.policies[INPUT].qos
+        for template in PLAYERS_INPUT_TOPICS:
+            self.client.subscribe(self.topic(template, "+"), qos)
+
+    def onMessage(self, player_id: int, component: str, message: mqtt.MQTTMessage) -> None:
+        """
+        Hands an MQTT message over to the session event loop through the inbox, undecoded.
+        Called from the MQTT network thread, so the game state is only ever touched by the loop,
+        the loop is only woken when the inbox was idle, and decoding runs on the loop too.
+        Inputs received while the session is not running wait in the inbox until it starts.
+        The loop is read after queueing: run() sets it before looking for inputs already queued,
+        so every input is either drained by run() or wakes the loop.
+
+        Args:
+            player_id: ID of the player the topic belongs to
+            component: Topic component (e.g. "components/button")
+            message: Received MQTT message
+
+        Returns:
+            None
+        """
+        if self.inbox.put(player_id, component, message.payload, time.perf_counter()):
+            loop = self.loop
+            if loop is not None:
+                loop.call_soon_threadsafe(self.drainInbox)
+
+    def drainInbox(self) -> None:
+        """
+        Handles a batch of the inputs waiting in the inbox, and schedules the next batch
+        if some are left, so other sessions and timers run in between. Inputs left once the
+        session is over stay in the inbox.
+
+        Returns:
+            None
+        """
+        pending = True
+        try:
+            pending = self.inbox.drain(self.handleInput)
+        finally:
+            loop = self.loop
+            if pending and loop is not None:
+                loop.call_soon(self.drainInbox)
+
+    def handleMessage(
+        self, player_id: int, component: str, message: mqtt.MQTTMessage, received: float = None
+    ) -> None:
+        """
+        Decodes an MQTT message and handles it right away, on the calling thread.
+        Used by the simulation and the benchmarks, which run on the session event loop.
+
+        Args:
+            player_id: ID of the player the topic belongs to
+            component: Topic component (e.g. "components/button")
+            message: Received MQTT message
+            received: time.perf_counter() when the message was received (default: unknown)
+
+        Returns:
+            None
+        """
+        self.handleInput(player_id, component, message.payload, received)
+
+    def handleInput(self, player_id: int, component: str, payload: bytes, received: float = None) -> None:
+        """
+        Decodes the payload of an input and handles it. Malformed inputs are dropped here.
+
+        Args:
+            player_id: ID of the player the topic belongs to
+            component: Topic component (e.g. "components/button")
+            payload: Payload of the message
+            received: time.perf_counter() when the message was received (default: unknown)
+
+        Returns:
+            None
+        """
+        event = decodeInput(player_id, component, payload, received)
+        if event is not None:
+            self.handleEvent(event)
+
+    def handleEvent(self, event: InputEvent) -> None:
+        """
+        Routes an input to the handler registered for its topic component in the current state.
+        Inputs without a handler are counted as ignored, and the time from receiving a minigame
+        button press to the LCD update it causes is measured (and traced, when tracing is enabled).
+
+        Args:
+            event: Decoded input of a player
+
+        Returns:
+            None
+        """
+        phase = self.phase
+        handler = phase.handlers.get(event.component)
+        if handler is None:
+            messagesIgnored.inc(phase.state.name)
+        elif phase.state == GameState.MINIGAME and event.received is not None:
+            minigame = type(phase.minigame).__name__
+            utils = phase.minigame.utils
+            shown = utils.lcdShown
+            if tracer.enabled and event.component == BUTTON_COMPONENT:
+                with tracer.trace(minigame, event.received):
+                    handler(event)
+            else:
+                handler(event)
+            if utils.lcdShown != shown:
+                reactionSeconds.observe(time.perf_counter() - event.received, minigame)
+        else:
+            handler(event)
+
+    #########################
+    # GAME STATE MANAGEMENT #
+    #########################
+    def onLoop(self) -> bool:
+        """
+        Tells whether the caller runs on the session event loop.
+
+        Returns:
+            bool: True if the session loop is the running loop of the calling thread
+        """
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def setGameState(self, state: GameState, minigame: Minigame = None) -> None:
+        """
+        Moves the game to a new state and logs the change for debugging.
+        The new phase replaces the current one in a single assignment, so readers on other threads
+        never see the state of one phase with the handlers of another.
+
+        Args:
+            state: New GameState to set
+            minigame: Minigame played in the MINIGAME state
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the game flow does not allow the transition
+            RuntimeError: If called outside the session event loop while the session runs
+        """
+        current = self.phase
+        if state not in TRANSITIONS[current.state]:
+            raise ValueError(f"[{self.prefix}] Invalid transition from {current.state.name} to {state.name}")
+        if self.loop is not None and not self.onLoop():
+            raise RuntimeError(f"[{self.prefix}] Game state changed outside the session event loop")
+        self.utils.printDebug(f"[{self.prefix}] Game state changed to {state.name}")
+        now = self.clock.time()
+        stateSeconds.observe(now - current.since, current.state.name)
+        handlers = minigame.handlers if state == GameState.MINIGAME else self.stateHandlers.get(state, {})
+        self.phase = Phase(state, handlers, minigame, now)
+
+    ##########################
+    # PLAYER INITIALIZATION  #
+    ##########################
+    async def waitForPlayers(self) -> None:
+        """
+        Initializes player connection phase and waits for all players to connect.
+        Subscribes to player connection topics and blocks until all players are ready.
+
+        Returns:
+            None
+        """
+        self.setGameState(GameState.WAITING_FOR_PLAYERS)
+        self.log("Waiting for players to connect...")
+        await self.waitEvent(self.waitPlayersEvent)
+        self.log("All players connected!")
+        await self.clock.sleep(2)
+
+    def managePlayersConnection(self, event: InputEvent) -> None:
+        """
+        Handles new player connections and initializes their game state.
+        The base may announce the wire format it understands, e.g. {"codec": "packed"}.
+
+        Args:
+            event: Connection of the player, with the connection message as payload
+
+        Returns:
+            None
+        """
+        player_id = event.player_id
+        player = self.players.get(player_id)
+        if player is not None:
+            if not player.connected:
+                player.connected = True
+                player.codec = self.connectionCodec(event.payload)
+                self.log(f"Player {player_id} connected ({player.codec})")
+                self.utils.showInLCD(
+                    player_id,
+                    Screens.CONNECTED.render(player=player_id),
+                    state=True,
+                )
+                if all(player.connected for player in self.players):
+                    self.waitPlayersEvent.set()
+        else:
+            self.log(f"Player {player_id} is not allowed to connect")
+
+    def connectionCodec(self, payload: bytes) -> str:
+        """
+        Reads the codec announced in a connection message.
+        Bases that send no codec, or one the controller does not know, get the default (JSON).
+
+        Args:
+            payload: Payload of the connection message
+
+        Returns:
+            str: Codec name
+        """
+        try:
+            payload = json.loads(payload)
+        except (ValueError, TypeError):
+            return DEFAULT_CODEC
+        codec = payload.get("codec") if isinstance(payload, dict) else None
+        return codec if codec in CODECS else DEFAULT_CODEC
+
+    def manageDiceRoll(self, event: InputEvent) -> None:
+        """
+        Processes dice roll button press messages from players.
+
+        Args:
+            event: Button press of the player
+
+        Returns:
+            None
+        """
+        if event.player_id == self.players[self.turn].id:
+            self.waitDiceEvent.set()
+
+    def manageGameElectionManually(self, event: InputEvent) -> None:
+        """
+        Handles manual minigame selection in debug mode.
+        Short press cycles through games, long press selects current game.
+
+        Args:
+            event: Button press of the player
+
+        Returns:
+            None
+        """
+        if event.player_id == self.players[self.turn].id:
+            if event.press_type == SHORT_PRESS:
+                self.minigameIndex = (self.minigameIndex + 1) % len(self.orderedMinigames)
+                nextMinigame: MinigameType = self.orderedMinigames[self.minigameIndex]
+                self.utils.showInAllLCD(Screens.OPTION.render(option=nextMinigame.name))
+            elif event.press_type == LONG_PRESS:
+                self.randomGameDebug = self.orderedMinigames[self.minigameIndex]
+                self.minigameIndex = 0
+                self.waitMinigameElectionEvent.set()
+
+    def managePlayerHallSensor(self, event: InputEvent) -> None:
+        """
+        Processes hall sensor triggers during player movement.
+
+        Args:
+            event: Hall sensor trigger of the player
+
+        Returns:
+            None
+        """
+        if event.player_id == self.players[self.turn].id:
+            self.waitMovementEvent.set()
+
+    ##################
+    # GAME FLOW      #
+    ##################
+    async def initGame(self, resumed: bool = False) -> None:
+        """
+        Main game loop that manages turns and overall game flow.
+        Handles welcome sequence, player turns, and checks for win conditions.
+        Updates game state and player stats after each turn, and journals every turn.
+
+        Args:
+            resumed: Whether the game was recovered from the journal
+
+        Returns:
+            None
+        """
+        self.setGameState(GameState.PLAYING)
+        if resumed:
+            self.utils.showInAllLCD(Screens.GAME_RESUMED.render())
+            await self.showStats()
+        else:
+            self.record("start", num_players=self.num_players, win_points=self.win_points, board_size=self.board.size)
+            self.commitTurn()
+            self.utils.showInAllLCD(Screens.WELCOME.render())
+        self.utils.playInAllBuzzer(Melodies.GAME_TUNE)
+        await self.clock.sleep(5)
+
+        while self.current_state != GameState.GAME_OVER:
+            await self.playTurn(self.players[self.turn])
+            self.log(self.players)
+            await self.showStats()
+            await self.clock.sleep(2)
+            await self.checkWinner()
+            self.turn = (self.turn + 1) % len(self.players)
+            self.record("turn", turn=self.turn)
+            self.commitTurn()
+
+    def reachedWinPoints(self, player: Player) -> None:
+        """
+        Called by the scoreboard the moment a player reaches the winning points.
+        The game ends when the turn does, so the player may still lose them during the turn.
+
+        Args:
+            player: Player who reached the winning points
+
+        Returns:
+            None
+        """
+        self.log(f"Player {player.id} reached {self.win_points} points")
+
+    async def checkWinner(self) -> None:
+        """
+        Checks if any player has reached winning conditions.
+        Updates game state and displays appropriate messages if game is over.
+
+        Returns:
+            None
+        """
+        # Highest score wins, players tied on it draw
+        leaders = self.scoreboard.winners()
+        if not leaders:
+            return
+        self.setGameState(GameState.GAME_OVER)
+        self.record("game_over", winners=[player.id for player in leaders])
+        if len(leaders) == 1:
+            winner = leaders[0]
+            message = Screens.GAME_OVER.render(player=winner.id)
+        else:
+            message = Screens.GAME_OVER_DRAW.render()
+
+        self.utils.showInAllLCD(message, state=True)
+        self.utils.playInAllBuzzer(Melodies.GAME_OVER_TUNE)
+        self.utils.printDebug(f"[{self.prefix}] Multi-player publishes: {dict(publishCounters)}")
+        await self.clock.sleep(5)
+
+    async def playTurn(self, player: Player) -> None:
+        """
+        Executes a single player's turn including dice roll, movement, and cell action.
+
+        Args:
+            player: Player instance whose turn is being executed
+
+        Returns:
+            None
+        """
+        # Turn phases:
+        # 1. Check if turn should be skipped
+        # 2. Notify turn start via MQTT
+        # 3. Play turn indicators
+        # 4. Execute turn actions (roll, move, cell effect)
+        # 5. End turn notification
+
+        self.log(f"Player {player.id} turn!")
+
+        # Check if player is skipped
+        if player.skipped:
+            self.utils.showInLCD(player.id, Screens.TURN_SKIPPED.render())
+            self.utils.showInOtherLCD(player.id, Screens.PLAYER_TURN_SKIPPED.render(player=player.id))
+            player.skipped = False
+            self.record("skip", player=player.id, skipped=False)
+            await self.clock.sleep(3)
+            return
+
+        # Publish the player's turn
+        self.utils.setTurn(player.id, True)
+
+        # Play your turn sound
+        self.utils.playInBuzzer(player.id, Melodies.YOUR_TURN_SOUND)
+        # Show the player's turn in the LCDs
+        self.utils.showInLCD(player.id, Screens.YOUR_TURN.render(), state=True)
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_TURN.render(player=player.id), state=True)
+        await self.clock.sleep(3)
+
+        # Roll the dice and play the turn
+        steps = await self.rollDice(player)
+        await self.movePlayer(player, steps)
+        await self.playCell(player, self.board.getCellType(player.position))
+        self.utils.setTurn(player.id, False)
+
+    async def movePlayer(self, player: Player, steps: int) -> None:
+        """
+        Handles player movement including hall sensor detection and position updates.
+
+        Args:
+            player: Player to move
+            steps: Number of steps to move (positive for forward, negative for backward)
+
+        Returns:
+            None
+        """
+        await self.moveWithHallSensor(player, steps)
+        if steps > 0:
+            player.moveForward(steps, self.board.size)
+        else:
+            player.moveBackward(abs(steps), self.board.size)
+        self.record("move", player=player.id, position=player.position)
+        self.utils.showInLCD(player.id, Screens.MOVED.render(position=player.position))
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_MOVED.render(player=player.id, position=player.position))
+        self.log(f"Player {player.id} moved to cell {player.position} - {self.board.getCellName(player.position)}")
+        await self.clock.sleep(4)
+
+    async def moveWithHallSensor(self, player: Player, steps: int) -> None:
+        """
+        Manages physical movement detection using hall sensor.
+        Shows movement instructions and waits for sensor triggers.
+
+        Args:
+            player: Player who is moving
+            steps: Number of steps to detect
+
+        Returns:
+            None
+        """
+        self.setGameState(GameState.MOVING)
+
+        for i in range(abs(steps), 0, -1):
+            self.utils.showInLCD(
+                player.id,
+                Screens.MOVE_MEEPLE.render(moves=i),
+                state=True,
+            )
+            self.utils.showInOtherLCD(
+                player.id,
+                Screens.PLAYER_MOVING.render(player=player.id, moves=i),
+                state=True,
+            )
+            await self.waitEvent(self.waitMovementEvent)
+            # Play the sound of the movement
+            self.utils.playInAllBuzzer(Melodies.MOVE_SOUND)
+
+        # Stop handling the hall sensor, so extra triggers do not count for the next move
+        self.setGameState(GameState.PLAYING)
+
+    async def rollDice(self, player: Player) -> int:
+        """
+        Handles dice rolling mechanics including UI feedback.
+
+        Args:
+            player: Player whose turn it is to roll
+
+        Returns:
+            int: Result of the dice roll (1-6)
+        """
+        self.utils.showInLCD(player.id, Screens.ROLL_DICE.render(), state=True)
+
+        self.setGameState(GameState.ROLLING_DICE)
+        await self.waitEvent(self.waitDiceEvent)
+        self.setGameState(GameState.PLAYING)
+        result = self.rng.randint(1, 6)
+        self.record("roll", player=player.id, value=result)
+
+        self.utils.showInLCD(player.id, Screens.DICE_ROLLED.render(value=result))
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_ROLLED.render(player=player.id, value=result))
+        await self.clock.sleep(4)
+        return result
+
+    async def waitEvent(self, event: Event) -> bool:
+        """
+        Waits for an event to be set and clears it afterward.
+
+        Args:
+            event: asyncio Event to wait for
+
+        Returns:
+            bool: True once the event was set
+        """
+        res = await event.wait()
+        event.clear()
+        return res
+
+    ################
+    # CELL EFFECTS #
+    ################
+    def cellRange(self, player: Player, cell_type: CellType, default: tuple[int, int]) -> tuple[int, int]:
+        """
+        Range of the random amount of a cell effect: the range of the cell the player stands on
+        when the board sets one, the game default otherwise (or when it comes from a random event).
+
+        Args:
+            player: Player playing the effect
+            cell_type: Effect being played
+            default: Game default range of the effect
+
+        Returns:
+            tuple[int, int]: Inclusive range of the amount
+        """
+        if self.board.getCellType(player.position) != cell_type:
+            return default
+        return self.board.getCellRange(player.position, default)
+
+    async def playCell(self, player: Player, cell_type: CellType) -> None:
+        """
+        Executes the effect of landing on a specific cell type.
+
+        Args:
+            player: Player who landed on the cell
+            cell_type: Type of cell landed on
+
+        Returns:
+            None
+        """
+        self.setGameState(GameState.PLAYING)
+        match cell_type:
+            case CellType.GP:
+                await self.gainPoints(player)
+            case CellType.LP:
+                await self.losePoints(player)
+            case CellType.MF:
+                await self.moveForward(player)
+            case CellType.MG:
+                await self.miniGame()
+            case CellType.MB:
+                await self.moveBackward(player)
+            case CellType.DE:
+                await self.deathEvent(player)
+            case CellType.SK:
+                await self.skipTurn(player)
+            case CellType.RE:
+                await self.randomEvent(player)
+
+    async def gainPoints(self, player: Player) -> None:
+        """
+        Handles gaining points cell effect with UI feedback.
+        Awards 5-10 random points to the player, or the range set by the cell.
+
+        Args:
+            player: Player who gained points
+
+        Returns:
+            None
+        """
+        self.utils.playInAllBuzzer(Melodies.GAIN_POINTS_TUNE)
+        self.utils.showInLCD(player.id, Screens.CELL_LANDED[CellType.GP].render())
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_LANDED.render(player=player.id, cell="Gain Points"))
+        await self.clock.sleep(4)
+        points = self.rng.randint(*self.cellRange(player, CellType.GP, GAIN_POINTS))
+        self.scoreboard.gain(player, points)
+        self.record("points", player=player.id, points=player.points)
+        self.utils.showInLCD(player.id, Screens.GAINED.render(points=points))
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_GAINED.render(player=player.id, points=points))
+        await self.clock.sleep(4)
+
+    async def losePoints(self, player: Player) -> None:
+        """
+        Handles losing points cell effect with UI feedback.
+        Deducts 1-5 random points from the player, or the range set by the cell.
+
+        Args:
+            player: Player who lost points
+
+        Returns:
+            None
+        """
+        self.utils.playInAllBuzzer(Melodies.LOSE_POINTS_TUNE)
+        self.utils.showInLCD(player.id, Screens.CELL_LANDED[CellType.LP].render())
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_LANDED.render(player=player.id, cell="Lose Points"))
+        await self.clock.sleep(4)
+        points = self.rng.randint(*self.cellRange(player, CellType.LP, LOSE_POINTS))
+        self.scoreboard.lose(player, points)
+        self.record("points", player=player.id, points=player.points)
+        self.utils.showInLCD(player.id, Screens.LOST.render(points=points))
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_LOST.render(player=player.id, points=points))
+        await self.clock.sleep(4)
+
+    async def skipTurn(self, player: Player) -> None:
+        """
+        Handles skip turn cell effect with UI feedback.
+        Marks player to skip their next turn.
+
+        Args:
+            player: Player who will skip next turn
+
+        Returns:
+            None
+        """
+        self.utils.playInAllBuzzer(Melodies.SKIP_TURN_TUNE)
+        self.utils.showInLCD(player.id, Screens.CELL_LANDED[CellType.SK].render())
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_LANDED.render(player=player.id, cell="Skip Turn"))
+        await self.clock.sleep(4)
+
+        self.utils.showInLCD(player.id, Screens.SKIP_NEXT_TURN.render())
+        await self.clock.sleep(2)
+
+        # Set skipped status for next turn
+        player.skipped = True
+        self.record("skip", player=player.id, skipped=True)
+
+    async def randomEvent(self, player: Player) -> None:
+        """
+        Handles random event cell effect with animation and sound feedback.
+        Randomly selects from available events with equal probability.
+
+        Args:
+            player: Player who triggered the random event
+
+        Returns:
+            None
+        """
+        self.utils.playInAllBuzzer(Melodies.RANDOM_EVENT_TUNE)
+        events, probs = zip(*RANDOM_EVENTS.items())
+        random_event = self.rng.choices(events, probs)[0]
+        self.utils.showInLCD(player.id, Screens.CELL_LANDED[CellType.RE].render())
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_LANDED.render(player=player.id, cell="Random Event"))
+        await self.clock.sleep(4)
+
+        # Selection animation
+        await self.animateOptions([str(event.value) for event in events])
+
+        # Play the selected event
+        await self.playCell(player, random_event)
+
+    async def moveForward(self, player: Player) -> None:
+        """
+        Handles move forward cell effect with UI feedback.
+        Moves player 1-3 steps forward (or the range set by the cell) and triggers new cell effect.
+
+        Args:
+            player: Player to move forward
+
+        Returns:
+            None
+        """
+        self.utils.playInAllBuzzer(Melodies.MOVE_FORWARD_TUNE)
+        self.utils.showInLCD(player.id, Screens.CELL_LANDED[CellType.MF].render())
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_LANDED.render(player=player.id, cell="Move Forward"))
+        await self.clock.sleep(4)
+        steps = self.rng.randint(*self.cellRange(player, CellType.MF, MOVE_STEPS))
+        self.utils.showInLCD(player.id, Screens.MOVE_FORWARD.render(steps=steps))
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_MOVES_FORWARD.render(player=player.id, steps=steps))
+        await self.clock.sleep(4)
+        await self.movePlayer(player, steps)
+        await self.playCell(player, self.board.getCellType(player.position))
+
+    async def moveBackward(self, player: Player) -> None:
+        """
+        Handles move backward cell effect with UI feedback.
+        Moves player 1-3 steps backward (or the range set by the cell) and triggers new cell effect.
+
+        Args:
+            player: Player to move backward
+
+        Returns:
+            None
+        """
+        self.utils.playInAllBuzzer(Melodies.MOVE_BACKWARD_TUNE)
+        self.utils.showInLCD(player.id, Screens.CELL_LANDED[CellType.MB].render())
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_LANDED.render(player=player.id, cell="Move Backward"))
+        await self.clock.sleep(4)
+        steps = self.rng.randint(*self.cellRange(player, CellType.MB, MOVE_STEPS))
+        self.utils.showInLCD(player.id, Screens.MOVE_BACKWARD.render(steps=steps))
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_MOVES_BACKWARD.render(player=player.id, steps=steps))
+        await self.clock.sleep(4)
+        await self.movePlayer(player, -steps)
+        await self.playCell(player, self.board.getCellType(player.position))
+
+    async def deathEvent(self, player: Player) -> None:
+        """
+        Handles death event cell effect with UI feedback.
+        Player loses all accumulated points.
+
+        Args:
+            player: Player who triggered death event
+
+        Returns:
+            None
+        """
+        self.utils.playInAllBuzzer(Melodies.DEATH_TUNE)
+        self.utils.showInLCD(player.id, Screens.CELL_LANDED[CellType.DE].render())
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_LANDED.render(player=player.id, cell="Death Event"))
+        await self.clock.sleep(4)
+        self.utils.showInLCD(player.id, Screens.DIED.render())
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_DIED.render(player=player.id))
+        await self.clock.sleep(2)
+        self.utils.showInLCD(player.id, Screens.LOST_ALL.render())
+        self.utils.showInOtherLCD(player.id, Screens.PLAYER_LOST_ALL.render(player=player.id))
+        self.scoreboard.set(player, 0)
+        self.record("points", player=player.id, points=player.points)
+        await self.clock.sleep(4)
+
+    ##################
+    # USER INTERFACE #
+    ##################
+    async def showStats(self) -> None:
+        """
+        Displays the leaderboard on all LCD screens, two ranks per page.
+        Only the ranks whose player or points changed since the last time are shown,
+        so turns that change no points show no stats.
+
+        Returns:
+            None
+        """
+        lines = [f"{rank + 1}. P{player.id}: {player.points} pts" for rank, player in self.scoreboard.takeChanges()]
+        for page in range(0, len(lines), 2):
+            top, down = (lines[page:page + 2] + [""])[:2]
+            self.utils.showInAllLCD(Screens.STATS.render(top=top, down=down))
+            await self.clock.sleep(STATS_PAGE_TIME)
+
+    async def animateOptions(self, options: list[str]) -> None:
+        """
+        Animates a selection from a list of options on the LCD screens.
+
+        Args:
+            options: A list of strings representing the options.
+
+        Returns:
+            None
+        """
+        animation_duration = 3  # Total animation time in seconds
+        frames_per_second = 5  # Number of options displayed per second
+        num_frames = int(animation_duration * frames_per_second)
+
+        # Sound effect
+        self.utils.playInAllBuzzer(Melodies.SELECTION_SOUND)
+
+        for i in range(num_frames):
+            current_index = i % len(options)  # Cycle through all options
+            self.utils.showInAllLCD(Screens.OPTION.render(option=options[current_index]))
+            await self.clock.sleep(1 / frames_per_second)
+
+        self.utils.showInAllLCD(Screens.CLEAR.render())  # Clear the LCD at the end of the animation
+
+    #############
+    # MINIGAMES #
+    #############
+    async def miniGame(self) -> None:
+        """
+        Initiates and manages a random minigame sequence.
+        Handles minigame selection, execution, and winner resolution.
+
+        Returns:
+            None
+        """
+        self.utils.playInAllBuzzer(Melodies.MINIGAME_CELL_TUNE)
+        self.utils.showInAllLCD(Screens.MINIGAME_TIME.render())
+        await self.clock.sleep(4)
+
+        # Minigame cells set a fixed number of points
+        winning_points, _ = self.cellRange(self.players[self.turn], CellType.MG, (MINIGAME_POINTS, MINIGAME_POINTS))
+        randomGame = await self.getRandomGame()
+        minigame = self.minigames[randomGame](
+            self.players, self.client, self.debug, self.prefix, self.clock, self.rng
+        )
+        self.setGameState(GameState.MINIGAME, minigame)
+        self.log(f"Playing minigame: {randomGame.name}")
+        winners: list[Player] = await minigame.playGame()
+        self.setGameState(GameState.PLAYING)
+        self.record("minigame", game=randomGame.name, winners=[player.id for player in winners])
+        await self.handleWinners(winners, winning_points)
+        await self.clock.sleep(4)
+
+    async def getRandomGame(self) -> MinigameType:
+        """
+        Selects a random minigame with animation feedback.
+        Uses manual selection in debug mode.
+
+        Returns:
+            MinigameType: Selected minigame type
+        """
+        game: MinigameType = None
+        if self.debug:
+            game = await self.waitForMinigameElection()
+        else:
+            # Animate the minigame selection
+            minigame_names = [str(game.name).replace("_", " ") for game in self.minigames.keys()]
+            await self.animateOptions(minigame_names)
+            game = self.rng.choice(list(self.minigames.keys()))
+        return game
+
+    async def waitForMinigameElection(self) -> MinigameType:
+        """
+        Waits for the election of a minigame with the button of the player whose turn it is.
+        It sets the game state to MINIGAME_ELECTION, and waits for the minigame election event.
+        After the event is received, it stops handling the button and returns the
+        selected minigame type.
+
+        Returns:
+            MinigameType: The type of the randomly selected minigame.
+        """
+        self.utils.showInAllLCD(Screens.OPTION.render(option=self.orderedMinigames[0].name))
+        self.setGameState(GameState.MINIGAME_ELECTION)
+        await self.waitEvent(self.waitMinigameElectionEvent)
+        self.setGameState(GameState.PLAYING)
+        return self.randomGameDebug
+
+    async def handleWinners(self, winners: list[Player], winning_points: int) -> None:
+        """
+        Handles the outcome of a game by processing the winners and providing feedback.
+
+        Args:
+            winners (list[Player]): A list of Player objects who have won the game.
+            winning_points (int): The number of points awarded to the winners.
+
+        Returns:
+            None
+        """
+        # NO WINNERS
+        if len(winners) == 0:
+            self.utils.showInAllLCD(Screens.NO_WINNERS.render())
+            self.utils.playInAllBuzzer(Melodies.LOSING_SOUND)
+
+        # 1 WINNER
+        elif len(winners) == 1:
+            # Update points
+            winner = winners[0]
+            self.scoreboard.gain(winner, winning_points)
+            self.record("points", player=winner.id, points=winner.points)
+
+            # Feedback
+            # Buzzers -> winning/losing sound
+            self.utils.playInBuzzer(winner.id, Melodies.WINNING_SOUND)
+            self.utils.playInOtherBuzzer(winner.id, Melodies.LOSING_SOUND)
+
+            # You won/lost message
+            self.utils.showInLCD(winner.id, Screens.MINIGAME_WON.render())
+            self.utils.showInOtherLCD(winner.id, Screens.MINIGAME_LOST.render())
+            await self.clock.sleep(3)
+
+            # Congratulations message
+            self.utils.showInLCD(winner.id, Screens.GREAT_JOB.render())
+            self.utils.showInOtherLCD(winner.id, Screens.BETTER_LUCK.render())
+            await self.clock.sleep(3)
+
+            # Points feedback
+            self.utils.showInLCD(winner.id, Screens.WON_POINTS.render(points=winning_points))
+            self.utils.showInOtherLCD(
+                winner.id, Screens.PLAYER_WON_POINTS.render(player=winner.id, points=winning_points)
+            )
+            await self.clock.sleep(3)
+
+        # MULTIPLE WINNERS -> DRAW
+        else:
+            self.utils.showInAllLCD(Screens.DRAW_POINTS.render(points=winning_points))
+            for winner in winners:
+                self.scoreboard.gain(winner, max(1, winning_points // len(winners)))
+                self.record("points", player=winner.id, points=winner.points)
+                self.utils.playInBuzzer(winner.id, Melodies.WINNING_SOUND)
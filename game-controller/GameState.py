@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Callable
 
 class GameState(Enum):
     """
@@ -12,3 +13,64 @@ class GameState(Enum):
     MINIGAME = 4             # Currently playing a minigame
     MINIGAME_ELECTION = 5    # Selecting a minigame (debug mode)
     MOVING = 6               # Player is moving their piece
+
+
+# States each state can move to; any other transition is a bug in the game flow
+TRANSITIONS: dict[GameState, frozenset[GameState]] = {
+    GameState.WAITING_FOR_PLAYERS: frozenset({GameState.WAITING_FOR_PLAYERS, GameState.PLAYING}),
+    GameState.PLAYING: frozenset({
+        GameState.PLAYING,
+        GameState.ROLLING_DICE,
+        GameState.MOVING,
+        GameState.MINIGAME,
+        GameState.MINIGAME_ELECTION,
+        GameState.GAME_OVER,
+    }),
+    GameState.ROLLING_DICE: frozenset({GameState.PLAYING}),
+    GameState.MOVING: frozenset({GameState.PLAYING}),
+    GameState.MINIGAME: frozenset({GameState.PLAYING}),
+    GameState.MINIGAME_ELECTION: frozenset({GameState.PLAYING}),
+    GameState.GAME_OVER: frozenset(),
+}
+
+
+class Phase:
+    """
+    What a session is doing: its state, the handlers of its inputs and the minigame being played.
+    Phases are immutable and a session replaces its phase as a whole on every transition, so any
+    thread reading session.phase once gets a consistent state, handlers and minigame without a lock.
+
+    Attributes:
+        state (GameState): State of the game
+        handlers (dict[str, Callable]): Input handlers of the state, indexed by topic component
+        minigame (Minigame | None): Minigame being played, in the MINIGAME state
+        since (float): Clock time the state was entered
+    """
+
+    __slots__ = ("state", "handlers", "minigame", "since")
+
+    def __init__(self, state: GameState, handlers: dict[str, Callable], minigame=None, since: float = 0.0) -> None:
+        """
+        Initialize the phase.
+
+        Args:
+            state: State of the game
+            handlers: Input handlers of the state
+            minigame: Minigame being played (default: none)
+            since: Clock time the state was entered (default: 0)
+
+        Raises:
+            ValueError: If the state is MINIGAME without a minigame
+        """
+        if state == GameState.MINIGAME and minigame is None:
+            raise ValueError("The MINIGAME state needs a minigame")
+        object.__setattr__(self, "state", state)
+        object.__setattr__(self, "handlers", handlers)
+        object.__setattr__(self, "minigame", minigame)
+        object.__setattr__(self, "since", since)
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"Phase({self.state.name}, since={self.since})"
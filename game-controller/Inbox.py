@@ -0,0 +1,160 @@
+from collections import Counter, deque
+from threading import Lock
+from typing import Callable, Iterable
+from Metrics import messagesDropped
+from Utils import BUTTON_COMPONENT
+
+"""
+Bounded ingress queue between the MQTT network thread and a session event loop.
+The network thread only appends the raw input to the queue of its player and wakes the loop
+when the inbox was idle, so socket reads and keepalives never wait for decoding or a handler and
+a burst of messages costs a single cross-thread wakeup. The loop drains the queues in batches, taking
+players in turn, so the messages of a player keep their order and a player spamming the button
+cannot delay the others. Only the players of the session get a queue: messages for any other
+player ID are dropped, so no publisher can grow the inbox or take capacity for made-up players.
+"""
+
+# Messages kept per player before the oldest ones are dropped
+PLAYER_CAPACITY = 64
+
+# Messages handled per loop callback before yielding to the other tasks of the loop
+DRAIN_BATCH = 64
+
+# Components whose oldest messages are dropped first when a player queue is full
+DROPPABLE_COMPONENTS = (BUTTON_COMPONENT,)
+
+
+class Inbox:
+    """
+    Per-player queues of the messages received for one session, waiting for its event loop.
+    When the queue of a player is full, its oldest button press is dropped (or its oldest
+    message, if it has no pending press): a late press is worth less than the latest ones.
+
+    Attributes:
+        capacity (int): Messages kept per player
+        queues (dict[int, deque]): Pending (component, payload, received) of every player added
+        ready (deque[int]): Players with pending messages, in the order they are served
+        scheduled (bool): Whether a drain is scheduled on the loop
+        depth (int): Pending messages of every player
+        peak (int): Highest depth seen
+        stats (Counter[str]): Messages queued, handled, dropped (queue full) and unknown_player
+    """
+
+    def __init__(self, capacity: int = PLAYER_CAPACITY) -> None:
+        """
+        Initialize an empty inbox.
+
+        Args:
+            capacity: Messages kept per player (default: PLAYER_CAPACITY)
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the capacity is not positive
+        """
+        if capacity < 1:
+            raise ValueError(f"Inbox capacity must be positive, not {capacity}")
+        self.capacity = capacity
+        self.queues: dict[int, deque[tuple[str, bytes, float]]] = {}
+        self.ready: deque[int] = deque()
+        self.scheduled = False
+        self.depth = 0
+        self.peak = 0
+        self.stats: Counter[str] = Counter()
+        self.lock = Lock()
+
+    def addPlayers(self, player_ids: Iterable[int]) -> None:
+        """
+        Creates the queues of the players whose messages are accepted.
+
+        Args:
+            player_ids: IDs of the players of the session
+
+        Returns:
+            None
+        """
+        with self.lock:
+            for player_id in player_ids:
+                self.queues.setdefault(player_id, deque())
+
+    def put(self, player_id: int, component: str, payload: bytes, received: float) -> bool:
+        """
+        Queues an input, still undecoded, if its player was added. Called from the MQTT network thread.
+
+        Args:
+            player_id: ID of the player the topic belongs to
+            component: Topic component (e.g. "components/button")
+            payload: Payload of the message
+            received: time.perf_counter() when the message was received
+
+        Returns:
+            bool: Whether the caller must schedule a drain on the loop
+        """
+        with self.lock:
+            queue = self.queues.get(player_id)
+            if queue is None:
+                self.stats["unknown_player"] += 1
+                messagesDropped.inc("unknown_player")
+                return False
+            if not queue:
+                self.ready.append(player_id)
+            elif len(queue) >= self.capacity:
+                self.dropOldest(queue)
+            queue.append((component, payload, received))
+            self.depth += 1
+            self.peak = max(self.peak, self.depth)
+            self.stats["queued"] += 1
+            wake = not self.scheduled
+            self.scheduled = True
+        return wake
+
+    def dropOldest(self, queue: deque) -> None:
+        """
+        Drops the oldest droppable message of a full player queue, or its oldest message.
+        Must be called with the lock held.
+
+        Args:
+            queue: Full queue of a player
+
+        Returns:
+            None
+        """
+        for entry in queue:
+            if entry[0] in DROPPABLE_COMPONENTS:
+                queue.remove(entry)
+                break
+        else:
+            queue.popleft()
+        self.depth -= 1
+        self.stats["dropped"] += 1
+        messagesDropped.inc("inbox_full")
+
+    def drain(self, handle: Callable[[int, str, bytes, float], None], batch: int = DRAIN_BATCH) -> bool:
+        """
+        Handles pending messages, one player at a time. Called from the session event loop.
+        The lock is not held while a handler runs, so the network thread keeps queueing.
+
+        Args:
+            handle: Function handling an input (player ID, component, payload, received time)
+            batch: Most messages handled in this call (default: DRAIN_BATCH)
+
+        Returns:
+            bool: Whether messages are still pending, so another drain must be scheduled
+        """
+        for _ in range(batch):
+            with self.lock:
+                if not self.ready:
+                    self.scheduled = False
+                    return False
+                player_id = self.ready.popleft()
+                queue = self.queues[player_id]
+                component, payload, received = queue.popleft()
+                if queue:
+                    self.ready.append(player_id)
+                self.depth -= 1
+            self.stats["handled"] += 1
+            handle(player_id, component, payload, received)
+        with self.lock:
+            self.scheduled = bool(self.ready)
+            return self.scheduled
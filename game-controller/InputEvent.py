@@ -0,0 +1,94 @@
+import json
+from Metrics import messagesDropped
+from Utils import BUTTON_COMPONENT
+
+"""
+Decoding of the inputs sent by the player bases.
+Every message is decoded once, on the session event loop, into an InputEvent that the handlers
+read instead of the raw payload. Button payloads sent by the bases are matched byte for byte, so a
+press is only parsed as JSON when its payload has an unusual shape, and presses that are not
+valid are dropped here instead of failing in every handler.
+"""
+
+# Button press types
+SHORT_PRESS = "short"
+LONG_PRESS = "long"
+PRESS_TYPES = (SHORT_PRESS, LONG_PRESS)
+
+# Button payloads decoded without parsing: compact and json.dumps spacing
+KNOWN_PRESSES = {
+    payload.encode(): press_type
+    for press_type in PRESS_TYPES
+    for payload in (f'{{"type":"{press_type}"}}', json.dumps({"type": press_type}))
+}
+
+
+class InputEvent:
+    """
+    Input of a player, decoded from an MQTT message.
+
+    Attributes:
+        player_id (int): ID of the player the topic belongs to
+        component (str): Topic component (e.g. "components/button")
+        press_type (str | None): "short" or "long" for button presses, None for other inputs
+        received (float | None): time.perf_counter() when the message was received, None if unknown
+        payload (bytes): Raw payload, for inputs with more than a press type (e.g. connections)
+    """
+
+    __slots__ = ("player_id", "component", "press_type", "received", "payload")
+
+    def __init__(
+        self, player_id: int, component: str, press_type: str | None, received: float | None, payload: bytes = b""
+    ) -> None:
+        self.player_id = player_id
+        self.component = component
+        self.press_type = press_type
+        self.received = received
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        return f"InputEvent({self.player_id}, {self.component!r}, {self.press_type!r})"
+
+
+def decodePress(payload: bytes) -> str | None:
+    """
+    Read the press type of a button payload.
+
+    Args:
+        payload: Payload of the button message, e.g. b'{"type": "short"}'
+
+    Returns:
+        str | None: "short" or "long", None if the payload is not a valid press
+    """
+    press_type = KNOWN_PRESSES.get(payload)
+    if press_type is not None:
+        return press_type
+    try:
+        data = json.loads(payload)
+    except (ValueError, TypeError):
+        return None
+    press_type = data.get("type") if isinstance(data, dict) else None
+    return press_type if press_type in PRESS_TYPES else None
+
+
+def decodeInput(player_id: int, component: str, payload: bytes, received: float | None = None) -> InputEvent | None:
+    """
+    Decode the message of a player into an input event.
+    Invalid button presses are counted in the dropped messages and rejected.
+
+    Args:
+        player_id: ID of the player the topic belongs to
+        component: Topic component (e.g. "components/button")
+        payload: Payload of the message
+        received: time.perf_counter() when the message was received (default: unknown)
+
+    Returns:
+        InputEvent | None: Decoded input, None if the message is malformed
+    """
+    if component != BUTTON_COMPONENT:
+        return InputEvent(player_id, component, None, received, payload)
+    press_type = decodePress(payload)
+    if press_type is None:
+        messagesDropped.inc("malformed")
+        return None
+    return InputEvent(player_id, component, press_type, received, payload)
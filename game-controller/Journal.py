@@ -0,0 +1,158 @@
+import json
+import os
+from collections import Counter
+from typing import Callable
+
+"""
+Append-only journal of the events of a game, used to recover a game after a restart.
+Events are JSON lines grouped by turn: they are buffered during the turn and written with a
+single fsync when it ends, so a crash loses at most the turn being played.
+Every few turns a snapshot of the whole game state is written next to the journal, with the
+journal offset it covers, so recovery only replays the events written after it.
+"""
+
+# Turns between snapshots
+SNAPSHOT_EVERY = 20
+
+
+class Journal:
+    """
+    Journal of a single game session.
+
+    Attributes:
+        path (str): Path of the journal file; the snapshot is "{path}.snapshot"
+        snapshot_every (int): Turns between snapshots
+        pending (list[dict]): Events of the turn being played, not written yet
+        turns (int): Turns committed since the journal was opened or reset
+        stats (Counter[str]): Events, commits (one fsync each), snapshots and bytes written
+    """
+
+    def __init__(self, path: str, snapshot_every: int = SNAPSHOT_EVERY) -> None:
+        """
+        Initialize the journal, creating its directory if needed.
+
+        Args:
+            path: Path of the journal file
+            snapshot_every: Turns between snapshots (default: SNAPSHOT_EVERY)
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.snapshotPath = f"{path}.snapshot"
+        self.snapshot_every = snapshot_every
+        self.pending: list[dict] = []
+        self.turns = 0
+        self.stats: Counter[str] = Counter()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "ab")
+
+    def append(self, event_type: str, **fields) -> None:
+        """
+        Adds an event to the turn being played.
+
+        Args:
+            event_type: Type of the event (e.g. "roll", "move", "points")
+            **fields: Data of the event
+
+        Returns:
+            None
+        """
+        fields["type"] = event_type
+        self.pending.append(fields)
+
+    def commit(self, snapshot: Callable[[], dict] = None) -> None:
+        """
+        Writes the events of the turn and syncs them to disk, then takes a snapshot if one is due.
+
+        Args:
+            snapshot: Returns the current game state, called only when a snapshot is due
+
+        Returns:
+            None
+        """
+        if self.pending:
+            data = b"".join(json.dumps(event, separators=(",", ":")).encode() + b"\n" for event in self.pending)
+            self.file.write(data)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.stats["events"] += len(self.pending)
+            self.stats["bytes"] += len(data)
+            self.stats["commits"] += 1
+            self.pending.clear()
+        self.turns += 1
+        if snapshot is not None and self.turns % self.snapshot_every == 0:
+            self.snapshot(snapshot())
+
+    def snapshot(self, state: dict) -> None:
+        """
+        Atomically replaces the snapshot with the given state, covering the journal written so far.
+
+        Args:
+            state: Game state to save
+
+        Returns:
+            None
+        """
+        temporary = f"{self.snapshotPath}.tmp"
+        with open(temporary, "w") as file:
+            json.dump({"offset": self.file.tell(), "state": state}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.snapshotPath)
+        self.stats["snapshots"] += 1
+
+    def recover(self) -> tuple[dict | None, list[dict]]:
+        """
+        Reads the latest snapshot and the events written after it.
+        A partially written last line (crash during a write) is cut from the file, so the
+        next commit starts on a new line.
+
+        Returns:
+            tuple[dict | None, list[dict]]: Snapshot state (None without snapshot) and events to replay
+        """
+        state, offset = None, 0
+        if os.path.exists(self.snapshotPath):
+            with open(self.snapshotPath) as file:
+                snapshot = json.load(file)
+            state, offset = snapshot["state"], snapshot["offset"]
+
+        events = []
+        end = offset
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                events.append(json.loads(line))
+                end += len(line)
+        if os.path.getsize(self.path) > end:
+            self.file.truncate(end)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        return state, events
+
+    def reset(self) -> None:
+        """
+        Empties the journal and removes the snapshot, to start a new game.
+
+        Returns:
+            None
+        """
+        self.pending.clear()
+        self.turns = 0
+        self.file.truncate(0)
+        self.file.seek(0)
+        if os.path.exists(self.snapshotPath):
+            os.remove(self.snapshotPath)
+
+    def close(self) -> None:
+        """
+        Closes the journal file. Events of an unfinished turn are discarded.
+
+        Returns:
+            None
+        """
+        self.file.close()
@@ -0,0 +1,401 @@
+#######################
+# IMPORTS AND MODULES #
+#######################
+import argparse
+import time
+
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu, spsolve
+
+from boards import Board, getBoard
+from CellType import CellType, GAIN_POINTS, LOSE_POINTS, MINIGAME_POINTS, MOVE_STEPS, RANDOM_EVENTS
+
+"""
+Exact Markov-chain analysis of a board.
+A turn only depends on the position of the player and whether their next turn is skipped, so the
+board is a Markov chain over (position, skipped). Move Forward, Move Backward and Random Event
+chains are resolved exactly with a sparse solve over the landing cells, which gives the outcome
+of a turn from every position (where it ends and which effect it plays).
+From it the module computes the stationary distribution, the landings of every cell and the
+expected points per turn, and, adding the points of the player to the state, the distribution
+of the turns a player needs to reach the winning points.
+The only approximation is the minigames played on other players' turns: they are taken at the
+stationary rate, as if the other players were independent of this one.
+Analyses are cached per board layout, so editing a board only computes the layouts not seen yet.
+Requires NumPy and SciPy, which the controller itself does not need (pip install numpy scipy).
+
+Usage:
+    python MarkovAnalysis.py [--boards ClassicBoard] [--players 2] [--win-points 50]
+"""
+
+# Faces of the dice
+DICE = range(1, 7)
+
+# Effects ending a turn, each landing ends with exactly one of them
+NONE, GAIN, LOSE, DEATH, SKIP, MINIGAME = range(6)
+OUTCOMES = ("None", "Gain Points", "Lose Points", "Death", "Skip Turn", "MiniGame")
+OUTCOME_OF_CELL = {
+    CellType.ST: NONE,
+    CellType.GP: GAIN,
+    CellType.LP: LOSE,
+    CellType.DE: DEATH,
+    CellType.SK: SKIP,
+    CellType.MG: MINIGAME,
+}
+
+# Own turns after which the turns to win distribution is cut
+MAX_TURNS = 10_000
+
+# Probability mass left when the turns to win distribution is cut
+SURVIVAL_TOLERANCE = 1e-12
+
+
+class BoardAnalysis:
+    """
+    Exact outcome of a board for one player.
+
+    Attributes:
+        cells (tuple[CellType, ...]): Cells of the board
+        num_players (int): Number of players per game
+        win_points (int): Points needed to win
+        stationary (np.ndarray): Long-run share of turns starting at every position,
+            not skipped (first row) and skipped (second row)
+        landings (np.ndarray): Expected landings on every cell per turn, chained landings included
+        outcomes (np.ndarray): Probability of a turn ending with every effect of OUTCOMES
+        pointsPerTurn (float): Expected points per turn, minigames of other players included,
+            before Lose Points stops at 0 and without Death
+        survival (np.ndarray): Probability of not having won after every number of own turns
+        expectedTurns (float): Expected own turns to reach win_points
+        winRates (np.ndarray): Probability of every seat winning, players taken as independent
+        expectedGameTurns (float): Expected turns of a game, every player's turns included
+    """
+
+    def __init__(self, cells: tuple[CellType, ...], num_players: int, win_points: int) -> None:
+        self.cells = cells
+        self.num_players = num_players
+        self.win_points = win_points
+        self.stationary: np.ndarray = None
+        self.landings: np.ndarray = None
+        self.outcomes: np.ndarray = None
+        self.pointsPerTurn = 0.0
+        self.survival: np.ndarray = None
+        self.expectedTurns = 0.0
+        self.winRates: np.ndarray = None
+        self.expectedGameTurns = 0.0
+
+    def __str__(self) -> str:
+        """
+        Summary of the analysis.
+
+        Returns:
+            str: Game length, win rates by seat, turn outcomes and landings per cell
+        """
+        median = int(np.searchsorted(-self.survival, -0.5)) if self.survival[-1] < 0.5 else "-"
+        seats = ", ".join(f"P{seat + 1} {rate:.1%}" for seat, rate in enumerate(self.winRates))
+        outcomes = ", ".join(
+            f"{name} {rate:.1%}" for name, rate in zip(OUTCOMES, self.outcomes) if name != OUTCOMES[NONE]
+        )
+        lines = [
+            f"{len(self.cells)} cells, {self.num_players} players, {self.win_points} points to win",
+            f"  Own turns to win: mean {self.expectedTurns:.1f}, median {median}",
+            f"  Turns per game: mean {self.expectedGameTurns:.1f}",
+            f"  Win rate: {seats}",
+            f"  Turn outcomes: {outcomes}",
+            f"  Points per turn (without Death): {self.pointsPerTurn:.2f}",
+            f"  {'cell':>6}  {'type':<14}{'landings':>10}{'per turn':>10}",
+        ]
+        total = self.landings.sum()
+        for position, cell in enumerate(self.cells):
+            landings = self.landings[position]
+            lines.append(f"  {position:>6}  {cell.value:<14}{landings / total:>10.1%}{landings:>10.3f}")
+        return "\n".join(lines)
+
+
+# Cell type behind every outcome with a random amount, and the default range of the amount
+AMOUNTS = {
+    GAIN: (CellType.GP, GAIN_POINTS),
+    LOSE: (CellType.LP, LOSE_POINTS),
+    MINIGAME: (CellType.MG, (MINIGAME_POINTS, MINIGAME_POINTS)),
+}
+
+# Ranges set by the board for its cells, None where a cell uses the game default
+Ranges = tuple[tuple[int, int] | None, ...]
+
+
+def amountRange(cells: tuple[CellType, ...], ranges: Ranges, position: int, cell_type: CellType,
+                default: tuple[int, int]) -> tuple[int, int]:
+    """
+    Range of the random amount of an effect played at a position: the range of the cell when it
+    plays its own effect and the board sets one, the game default otherwise (e.g. random events).
+
+    Args:
+        cells: Cells of the board
+        ranges: Ranges set by the board
+        position: Position where the effect is played
+        cell_type: Effect played
+        default: Game default range of the effect
+
+    Returns:
+        tuple[int, int]: Inclusive range of the amount
+    """
+    if ranges is None or cells[position] != cell_type or ranges[position] is None:
+        return default
+    return ranges[position]
+
+
+@lru_cache(maxsize=256)
+def turnOutcomes(cells: tuple[CellType, ...], ranges: Ranges = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Resolves the landings of a board. A landing on Move Forward or Move Backward lands again,
+    every other landing (Random Event branches included) ends the turn with one outcome.
+    With M the chained landings and T the outcomes of a single landing, a landing on every cell
+    leads to (I - M)^-1 landings and to the outcomes (I - M)^-1 T.
+
+    Args:
+        cells: Cells of the board
+        ranges: Ranges set by the board (default: none)
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: For every start position of a turn, the probability of
+            ending at every position with every outcome (positions x cells * outcomes), and
+            the expected landings on every cell (positions x cells)
+
+    Raises:
+        ValueError: If a chain of moves can go on forever
+    """
+    size = len(cells)
+    randomOdds = np.array(list(RANDOM_EVENTS.values()))
+    randomEvents = list(zip(RANDOM_EVENTS, randomOdds / randomOdds.sum()))
+
+    chained = sparse.lil_matrix((size, size))
+    ends = sparse.lil_matrix((size, size * len(OUTCOMES)))
+    for position, cell in enumerate(cells):
+        for effect, odds in randomEvents if cell == CellType.RE else ((cell, 1.0),):
+            if effect in (CellType.MF, CellType.MB):
+                direction = 1 if effect == CellType.MF else -1
+                low, high = amountRange(cells, ranges, position, effect, MOVE_STEPS)
+                steps = range(low, high + 1)
+                for step in steps:
+                    chained[position, (position + direction * step) % size] += odds / len(steps)
+            else:
+                ends[position, position * len(OUTCOMES) + OUTCOME_OF_CELL[effect]] += odds
+
+    # I - M is singular when some chain of moves can never reach a cell ending the turn
+    ending = set(np.nonzero(ends.tocsr().getnnz(axis=1))[0])
+    pending = list(ending)
+    reverse = chained.T.tolil()
+    while pending:
+        for source in reverse.rows[pending.pop()]:
+            if source not in ending:
+                ending.add(source)
+                pending.append(source)
+    if len(ending) < size:
+        raise ValueError("The board has a chain of moves that never ends")
+
+    dice = sparse.lil_matrix((size, size))
+    for position in range(size):
+        for face in DICE:
+            dice[position, (position + face) % size] += 1 / len(DICE)
+
+    chains = splu((sparse.identity(size) - chained).tocsc())
+    landings = chains.solve(np.identity(size))
+    outcomes = chains.solve(ends.toarray())
+    return dice @ outcomes, dice @ landings
+
+
+def pointsOutcomes(
+    outcome: int, points: np.ndarray, num_players: int, amounts: tuple[int, int]
+) -> list[tuple[float, np.ndarray]]:
+    """
+    Points of the player after a turn outcome, for every points the player had.
+
+    Args:
+        outcome: Outcome of the turn
+        points: Points before the turn
+        num_players: Number of players per game
+        amounts: Range of the random amount of the outcome (the minigame points are the low end)
+
+    Returns:
+        list[tuple[float, np.ndarray]]: Probability and points after the turn of every branch
+    """
+    low, high = amounts
+    if outcome == GAIN:
+        return [(1 / (high - low + 1), points + amount) for amount in range(low, high + 1)]
+    if outcome == LOSE:
+        return [(1 / (high - low + 1), np.maximum(points - amount, 0)) for amount in range(low, high + 1)]
+    if outcome == DEATH:
+        return [(1.0, np.zeros_like(points))]
+    if outcome == MINIGAME:
+        return [(1 / num_players, points + low), (1 - 1 / num_players, points)]
+    return [(1.0, points)]
+
+
+@lru_cache(maxsize=256)
+def analyzeLayout(
+    cells: tuple[CellType, ...], ranges: Ranges = None, num_players: int = 2, win_points: int = 50
+) -> BoardAnalysis:
+    """
+    Analyzes a board layout. Results are cached per layout, number of players and winning points.
+
+    Args:
+        cells: Cells of the board
+        ranges: Ranges set by the board (default: none)
+        num_players: Number of players per game (default: 2)
+        win_points: Points needed to win (default: 50)
+
+    Returns:
+        BoardAnalysis: Outcome of the board
+
+    Raises:
+        ValueError: If a chain of moves can go on forever
+    """
+    analysis = BoardAnalysis(cells, num_players, win_points)
+    size, kinds = len(cells), len(OUTCOMES)
+    turn, landings = turnOutcomes(cells, ranges)
+    outcomes = turn.reshape(size, size, kinds)
+    amounts = {
+        (position, outcome): amountRange(cells, ranges, position, cell_type, default)
+        for position in range(size)
+        for outcome, (cell_type, default) in AMOUNTS.items()
+    }
+
+    # Position chain: state (skipped, position), a skipped turn only clears the flag
+    played = outcomes.sum(axis=2) - outcomes[:, :, SKIP]
+    chain = sparse.bmat([
+        [sparse.csr_matrix(played), sparse.csr_matrix(outcomes[:, :, SKIP])],
+        [sparse.identity(size), None],
+    ]).tocsc()
+    # Stationary distribution: pi (P - I) = 0 with the last equation replaced by sum(pi) = 1
+    system = (chain.T - sparse.identity(2 * size)).tolil()
+    system[-1, :] = np.ones(2 * size)
+    target = np.zeros(2 * size)
+    target[-1] = 1
+    analysis.stationary = spsolve(system.tocsc(), target).reshape(2, size)
+    playing = analysis.stationary[0]
+    analysis.landings = playing @ landings
+    ends = np.einsum("p,pqk->qk", playing, outcomes)
+    analysis.outcomes = ends.sum(axis=0)
+
+    # Every player lands on a minigame at the same rate and each one is won by one player,
+    # so a player wins minigames at that rate per round, on their own turns or the others'
+    minigames = analysis.outcomes[MINIGAME]
+    analysis.pointsPerTurn = sum(
+        ends[position, GAIN] * np.mean(amounts[position, GAIN])
+        - ends[position, LOSE] * np.mean(amounts[position, LOSE])
+        + ends[position, MINIGAME] * amounts[position, MINIGAME][0]
+        for position in range(size)
+    )
+
+    if analysis.outcomes[GAIN] + minigames == 0:
+        # Nobody ever scores
+        analysis.survival = np.ones(1)
+        analysis.expectedTurns = analysis.expectedGameTurns = float("inf")
+        analysis.winRates = np.zeros(num_players)
+        return analysis
+
+    # Points chain: state (skipped, position, points) until win_points, one step per round
+    points = np.arange(win_points)
+    # Points won in the minigames of one other player's turn, and of all of them
+    other = {0: 1 - minigames / num_players}
+    for position in np.nonzero(ends[:, MINIGAME])[0]:
+        won = amounts[position, MINIGAME][0]
+        other[won] = other.get(won, 0.0) + ends[position, MINIGAME] / num_players
+    others = [(1.0, 0)]
+    for _ in range(num_players - 1):
+        merged: dict[int, float] = {}
+        for odds, extra in others:
+            for won, chance in other.items():
+                merged[extra + won] = merged.get(extra + won, 0.0) + odds * chance
+        others = [(odds, extra) for extra, odds in merged.items()]
+
+    def state(skipped: int, position: int) -> int:
+        return (skipped * size + position) * win_points
+
+    rows, columns, values = [], [], []
+
+    def addTransitions(source: int, target: int, odds: float, after: np.ndarray) -> None:
+        for extraOdds, extra in others:
+            final = after + extra
+            keep = final < win_points
+            rows.append(source + points[keep])
+            columns.append(target + final[keep])
+            values.append(np.full(int(keep.sum()), odds * extraOdds))
+
+    for position in range(size):
+        addTransitions(state(1, position), state(0, position), 1.0, points)
+        for end, outcome in zip(*np.nonzero(outcomes[position])):
+            odds = outcomes[position, end, outcome]
+            skipped = 1 if outcome == SKIP else 0
+            for branchOdds, after in pointsOutcomes(outcome, points, num_players, amounts.get((end, outcome), (0, 0))):
+                addTransitions(state(0, position), state(skipped, end), odds * branchOdds, after)
+
+    states = 2 * size * win_points
+    transient = sparse.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))), shape=(states, states)
+    )
+    turnsToWin = spsolve((sparse.identity(states) - transient).tocsc(), np.ones(states))
+    analysis.expectedTurns = float(turnsToWin[state(0, 0)])
+
+    # Distribution of the own turns to win, from the start state
+    distribution = np.zeros(states)
+    distribution[state(0, 0)] = 1.0
+    survival = [1.0]
+    transposed = transient.T.tocsr()
+    while survival[-1] > SURVIVAL_TOLERANCE and len(survival) <= MAX_TURNS:
+        distribution = transposed @ distribution
+        survival.append(distribution.sum())
+    analysis.survival = np.array(survival)
+
+    # Seat i wins in round t if it wins then, the seats before it have not won by round t,
+    # and the seats after it had not won by round t - 1
+    wins = analysis.survival[:-1] - analysis.survival[1:]
+    rounds = np.arange(1, len(wins) + 1)
+    analysis.winRates = np.zeros(num_players)
+    for seat in range(num_players):
+        odds = wins * analysis.survival[1:] ** seat * analysis.survival[:-1] ** (num_players - 1 - seat)
+        analysis.winRates[seat] = odds.sum()
+        analysis.expectedGameTurns += (odds * ((rounds - 1) * num_players + seat + 1)).sum()
+    analysis.expectedGameTurns /= analysis.winRates.sum()
+    return analysis
+
+
+def analyze(board: Board, num_players: int = 2, win_points: int = 50) -> BoardAnalysis:
+    """
+    Analyzes a board, reusing the analysis of any board with the same cells and ranges.
+    Cached analyses are shared, so they must not be modified.
+
+    Args:
+        board: Board to analyze
+        num_players: Number of players per game (default: 2)
+        win_points: Points needed to win (default: 50)
+
+    Returns:
+        BoardAnalysis: Outcome of the board
+
+    Raises:
+        ValueError: If a chain of moves can go on forever
+    """
+    ranges = tuple(board.getCellRange(position, None) for position in range(board.size))
+    return analyzeLayout(tuple(board.cells), ranges, num_players, win_points)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exact Markov-chain analysis of game boards")
+    parser.add_argument("--boards", nargs="+", default=["ClassicBoard"], help="board classes or board files to analyze")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--win-points", type=int, default=50)
+    args = parser.parse_args()
+
+    for name in args.boards:
+        board = getBoard(name)
+        start = time.perf_counter()
+        analysis = analyze(board, args.players, args.win_points)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        analyze(board, args.players, args.win_points)
+        cached = time.perf_counter() - start
+        print(f"{name}: {analysis}")
+        print(f"  ({elapsed * 1000:.0f} ms, cached {cached * 1e6:.0f} us)")
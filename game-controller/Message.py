@@ -1,11 +1,137 @@
 import json
+import struct
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from string import Formatter
+
+# Size of each LCD line in characters
+LCD_WIDTH = 16
+
+# Alignments of the LCD lines: centered or right-aligned lines are padded to the LCD width,
+# left-aligned lines are only cut to it
+ALIGNMENTS = ("center", "left", "right")
+
+# Frames cached by every LCD template with slots
+FRAME_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=1024)
+def encodeLCD(top: str, down: str, time: int) -> bytes:
+    """
+    Serialize LCD message content to JSON bytes.
+    Cached by content, since the same frames are shown over and over.
+
+    Args:
+        top: Text for top line of LCD
+        down: Text for bottom line of LCD
+        time: Display duration in milliseconds
+
+    Returns:
+        bytes: UTF-8 encoded JSON payload
+    """
+    return json.dumps({"top": top, "down": down, "time": time}).encode()
+
+
+class Codec(ABC):
+    """
+    Wire format of the LCD and buzzer payloads sent to the player bases.
+    Each base announces the codec it understands in its connection message.
+
+    Attributes:
+        name (str): Codec name used in the connection message
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def encodeLCD(self, top: str, down: str, time: int) -> bytes:
+        """
+        Serialize LCD message content.
+
+        Args:
+            top: Text for top line of LCD
+            down: Text for bottom line of LCD
+            time: Display duration in milliseconds
+
+        Returns:
+            bytes: Encoded payload
+        """
+        pass
+
+    @abstractmethod
+    def encodeBuzzer(self, tones: tuple[int, ...], duration: tuple[int, ...]) -> bytes:
+        """
+        Serialize a buzzer tone sequence.
+
+        Args:
+            tones: Frequencies in Hz
+            duration: Durations in milliseconds
+
+        Returns:
+            bytes: Encoded payload
+        """
+        pass
+
+
+class JsonCodec(Codec):
+    """
+    JSON objects, understood by every base: {"top", "down", "time"} and {"tones", "duration"}.
+    """
+
+    name = "json"
+
+    def encodeLCD(self, top: str, down: str, time: int) -> bytes:
+        return encodeLCD(top, down, time)
+
+    def encodeBuzzer(self, tones: tuple[int, ...], duration: tuple[int, ...]) -> bytes:
+        return json.dumps({"tones": list(tones), "duration": list(duration)}).encode()
+
+
+class PackedCodec(Codec):
+    """
+    Fixed-layout little-endian binary frames for memory-constrained bases.
+    LCD: two 16 byte ASCII lines padded with spaces, then the duration as uint16 (34 bytes).
+    Buzzer: tone count and duration count as uint8, then the tones and the durations as uint16.
+    """
+
+    name = "packed"
+    lcdFormat = struct.Struct(f"<{LCD_WIDTH}s{LCD_WIDTH}sH")
+
+    def encodeLCD(self, top: str, down: str, time: int) -> bytes:
+        return self.lcdFormat.pack(self.encodeLine(top), self.encodeLine(down), time)
+
+    def encodeLine(self, text: str) -> bytes:
+        """
+        Encode an LCD line, replacing characters the display cannot show with "?".
+
+        Args:
+            text: Line text, cut to the LCD width
+
+        Returns:
+            bytes: ASCII line padded with spaces to the LCD width
+        """
+        return text[:LCD_WIDTH].ljust(LCD_WIDTH).encode("ascii", errors="replace")
+
+    def encodeBuzzer(self, tones: tuple[int, ...], duration: tuple[int, ...]) -> bytes:
+        return struct.pack(f"<BB{len(tones)}H{len(duration)}H", len(tones), len(duration), *tones, *duration)
+
+
+# Available codecs, indexed by the name the bases announce
+CODECS: dict[str, Codec] = {codec.name: codec for codec in (JsonCodec(), PackedCodec())}
+
+# Codec of the bases that do not announce one
+DEFAULT_CODEC = JsonCodec.name
+
 
 class LCDMessage:
     """
     Represents a message to be displayed on an LCD screen.
     Handles formatting and serialization of two-line LCD messages.
+    Messages are immutable, so their payload is encoded only once per codec.
     """
-    
+
+    __slots__ = ("top", "down", "time", "payload", "encodings")
+
     def __init__(self, top: str = "", down: str = "", time: int = 0) -> None:
         """
         Initialize LCD message with optional timing.
@@ -15,14 +141,19 @@ class LCDMessage:
             down: Text for bottom line of LCD
             time: Display duration in milliseconds
         """
-        self.top = top
-        self.down = down
-        self.time = time
+        object.__setattr__(self, "top", top)
+        object.__setattr__(self, "down", down)
+        object.__setattr__(self, "time", time)
+        object.__setattr__(self, "payload", encodeLCD(top, down, time))
+        object.__setattr__(self, "encodings", {DEFAULT_CODEC: self.payload})
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
     def __str__(self) -> str:
         """
         String representation of LCD message.
-        
+
         Returns:
             str: Formatted message content
         """
@@ -31,18 +162,37 @@ class LCDMessage:
     def toJson(self) -> str:
         """
         Serialize message to JSON format.
-        
+
         Returns:
             str: JSON representation of message
         """
-        return json.dumps({"top": self.top, "down": self.down, "time": self.time})
-    
+        return self.payload.decode()
+
+    def encode(self, codec: str) -> bytes:
+        """
+        Serialize message with a codec, caching the result.
+
+        Args:
+            codec: Name of the codec
+
+        Returns:
+            bytes: Encoded payload
+        """
+        payload = self.encodings.get(codec)
+        if payload is None:
+            payload = self.encodings[codec] = CODECS[codec].encodeLCD(self.top, self.down, self.time)
+        return payload
+
+
 class BuzzerMessage:
     """
     Represents a sequence of tones for buzzer output.
     Handles tone sequences and durations for sound effects.
+    Messages are immutable, so their payload is encoded only once per codec.
     """
-    
+
+    __slots__ = ("tones", "duration", "payload", "encodings")
+
     def __init__(self, tones: list[int], duration: list[int]) -> None:
         """
         Initialize buzzer message with tone sequence.
@@ -51,13 +201,18 @@ class BuzzerMessage:
             tones: List of frequencies in Hz
             duration: List of durations in milliseconds
         """
-        self.tones = tones
-        self.duration = duration
-        
+        object.__setattr__(self, "tones", tuple(tones))
+        object.__setattr__(self, "duration", tuple(duration))
+        object.__setattr__(self, "payload", json.dumps({"tones": tones, "duration": duration}).encode())
+        object.__setattr__(self, "encodings", {DEFAULT_CODEC: self.payload})
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
     def __str__(self) -> str:
         """
         String representation of buzzer sequence.
-        
+
         Returns:
             str: Formatted tone/duration pairs
         """
@@ -66,8 +221,126 @@ class BuzzerMessage:
     def toJson(self) -> str:
         """
         Serialize message to JSON format.
-        
+
         Returns:
             str: JSON representation of message
         """
-        return json.dumps({"tones": self.tones, "duration": self.duration})
+        return self.payload.decode()
+
+    def encode(self, codec: str) -> bytes:
+        """
+        Serialize message with a codec, caching the result.
+
+        Args:
+            codec: Name of the codec
+
+        Returns:
+            bytes: Encoded payload
+        """
+        payload = self.encodings.get(codec)
+        if payload is None:
+            payload = self.encodings[codec] = CODECS[codec].encodeBuzzer(self.tones, self.duration)
+        return payload
+
+
+@lru_cache(maxsize=4096)
+def fitLine(text: str, align: str = "center") -> str:
+    """
+    Cut a line to the LCD width and align it.
+
+    Args:
+        text: Line text
+        align: One of ALIGNMENTS (default: "center")
+
+    Returns:
+        str: Line as shown by the LCD, empty lines are left empty
+    """
+    text = text[:LCD_WIDTH]
+    if not text:
+        return text
+    if align == "center":
+        return text.center(LCD_WIDTH)
+    if align == "right":
+        return text.rjust(LCD_WIDTH)
+    return text
+
+
+class LCDTemplate:
+    """
+    Layout of a two-line LCD screen, whose lines may have {slots} filled when it is shown, e.g.
+    LCDTemplate("Player {player}", "rolled {value}").render(player=2, value=5).
+    The text around the slots must fit the LCD, filled lines are cut to it.
+    A screen without slots is rendered once, when it is defined; the frames of a screen with
+    slots are cached by slot values.
+
+    Attributes:
+        top (str): Template of the top line
+        down (str): Template of the bottom line
+        align (str): Alignment of both lines, one of ALIGNMENTS
+        time (int): Display duration in milliseconds
+        slots (frozenset[str]): Names of the slots of both lines
+        message (LCDMessage): Rendered screen, None when the screen has slots
+    """
+
+    def __init__(
+        self, top: str = "", down: str = "", align: str = "center", time: int = 0, cache_size: int = FRAME_CACHE_SIZE
+    ) -> None:
+        """
+        Initialize and validate the template.
+
+        Args:
+            top: Template of the top line
+            down: Template of the bottom line
+            align: Alignment of both lines (default: "center")
+            time: Display duration in milliseconds (default: 0)
+            cache_size: Frames cached when the screen has slots (default: FRAME_CACHE_SIZE)
+
+        Raises:
+            ValueError: If the alignment is unknown or the text of a line does not fit the LCD
+        """
+        if align not in ALIGNMENTS:
+            raise ValueError(f"Unknown alignment {align!r}, expected one of {', '.join(ALIGNMENTS)}")
+        slots = set()
+        for line in (top, down):
+            fields = list(Formatter().parse(line))
+            if len("".join(text for text, *_ in fields)) > LCD_WIDTH:
+                raise ValueError(f"LCD line {line!r} does not fit in {LCD_WIDTH} characters")
+            slots.update(name for _, name, *_ in fields if name is not None)
+        self.top = top
+        self.down = down
+        self.align = align
+        self.time = time
+        self.slots = frozenset(slots)
+        self.message = None if slots else self.build()
+        self.frame = lru_cache(maxsize=cache_size)(self.build)
+
+    def render(self, **slots) -> LCDMessage:
+        """
+        Render the screen.
+
+        Args:
+            **slots: Value of every slot
+
+        Returns:
+            LCDMessage: Rendered screen, shared by every render with the same slot values
+
+        Raises:
+            KeyError: If a slot has no value
+        """
+        if self.message is not None:
+            return self.message
+        return self.frame(**slots)
+
+    def build(self, **slots) -> LCDMessage:
+        """
+        Fill, cut and align the lines, without caching.
+
+        Args:
+            **slots: Value of every slot
+
+        Returns:
+            LCDMessage: Rendered screen
+        """
+        top = fitLine(self.top.format(**slots), self.align)
+        down = fitLine(self.down.format(**slots), self.align)
+        return LCDMessage(top=top, down=down, time=self.time)
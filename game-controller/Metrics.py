@@ -0,0 +1,504 @@
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Callable, Iterable
+
+"""
+Process-wide metrics of the controller, served in the Prometheus text format.
+Collection is cheap enough to stay on during live games: hot paths bind the labels of a metric
+once (metric.labels(...)) and then only add to a slot attribute or bisect a few buckets.
+Updates take no lock: they come from the event loop and the MQTT thread, and under the GIL an
+increment is only lost if two threads update the same child at the same instant, which is
+acceptable for monitoring. Counters kept elsewhere (e.g. OutputScheduler.stats) are read by
+collectors when scraped.
+"""
+
+# Buckets of the latency histograms, in seconds: 50 µs to 1 s
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Buckets of the time spent in a game state, in seconds: from a fast button press to a long minigame
+STATE_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def formatLabels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    """
+    Format the labels of a sample, escaping the values.
+
+    Args:
+        names: Label names
+        values: Label values, in the same order
+        extra: Additional label, already formatted (e.g. 'le="0.5"')
+
+    Returns:
+        str: Labels in braces, or an empty string without labels
+    """
+    labels = [f'{name}="{escapeLabel(value)}"' for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+def escapeLabel(value) -> str:
+    """
+    Escape a label value for the text format.
+
+    Args:
+        value: Label value
+
+    Returns:
+        str: Value with backslashes, double quotes and newlines escaped
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class CounterChild:
+    """
+    Value of a counter for one combination of label values.
+
+    Attributes:
+        value (float): Current value
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Increment the counter.
+
+        Args:
+            amount: Increment (default: 1)
+
+        Returns:
+            None
+        """
+        self.value += amount
+
+
+class HistogramChild:
+    """
+    Distribution of a histogram for one combination of label values.
+
+    Attributes:
+        buckets (tuple[float, ...]): Upper bounds of the buckets, increasing
+        counts (list[int]): Values in every bucket and above the last one (not cumulative)
+        sum (float): Sum of the values
+    """
+
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Record a value.
+
+        Args:
+            value: Observed value
+
+        Returns:
+            None
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """
+    Metric with one child per combination of label values.
+
+    Attributes:
+        name (str): Metric name
+        description (str): Description of the metric
+        label_names (tuple[str, ...]): Names of the labels
+        children (dict[tuple, object]): Child of every combination of label values
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...] = ()) -> None:
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name
+            description: Description of the metric
+            label_names: Names of the labels (default: none)
+
+        Returns:
+            None
+        """
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.children: dict[tuple, object] = {}
+        self.lock = Lock()
+
+    def labels(self, *values):
+        """
+        Get the child of a combination of label values, creating it on first use.
+        Hot paths keep the child instead of calling this on every update.
+
+        Args:
+            *values: Label values, in the order of label_names
+
+        Returns:
+            The child of the label values
+        """
+        child = self.children.get(values)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(values, self.createChild())
+        return child
+
+    def createChild(self):
+        """
+        Create the child of a new combination of label values.
+
+        Returns:
+            The new child
+        """
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[str]:
+        """
+        Sample lines of the metric.
+
+        Returns:
+            Iterable[str]: Lines of every combination of label values
+        """
+        raise NotImplementedError
+
+
+class CounterMetric(Metric):
+    """
+    Monotonic counter.
+    """
+
+    kind = "counter"
+
+    def createChild(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        """
+        Increment the counter of some label values.
+
+        Args:
+            *labels: Label values, in the order of label_names
+            amount: Increment (default: 1)
+
+        Returns:
+            None
+        """
+        self.labels(*labels).value += amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, child in list(self.children.items()):
+            yield f"{self.name}{formatLabels(self.label_names, labels)} {child.value}"
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in fixed buckets.
+
+    Attributes:
+        buckets (tuple[float, ...]): Upper bounds of the buckets, increasing
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Metric name
+            description: Description of the metric
+            label_names: Names of the labels (default: none)
+            buckets: Upper bounds of the buckets (default: LATENCY_BUCKETS)
+
+        Returns:
+            None
+        """
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(buckets)
+
+    def createChild(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float, *labels) -> None:
+        """
+        Record a value for some label values.
+
+        Args:
+            value: Observed value
+            *labels: Label values, in the order of label_names
+
+        Returns:
+            None
+        """
+        self.labels(*labels).observe(value)
+
+    def samples(self) -> Iterable[str]:
+        for labels, child in list(self.children.items()):
+            total = 0
+            for bound, count in zip(self.buckets + ("+Inf",), list(child.counts)):
+                total += count
+                bucket = f'le="{bound}"'
+                yield f"{self.name}_bucket{formatLabels(self.label_names, labels, bucket)} {total}"
+            yield f"{self.name}_sum{formatLabels(self.label_names, labels)} {child.sum}"
+            yield f"{self.name}_count{formatLabels(self.label_names, labels)} {total}"
+
+
+class Metrics:
+    """
+    Registry of the metrics of the process.
+
+    Attributes:
+        metrics (dict[str, Metric]): Metrics indexed by name
+        collectors (list[Callable[[], Iterable[str]]]): Functions returning extra lines when scraped
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty registry.
+
+        Returns:
+            None
+        """
+        self.metrics: dict[str, Metric] = {}
+        self.collectors: list[Callable[[], Iterable[str]]] = []
+
+    def counter(self, name: str, description: str, label_names: tuple[str, ...] = ()) -> CounterMetric:
+        """
+        Register a counter.
+
+        Args:
+            name: Metric name
+            description: Description of the metric
+            label_names: Names of the labels (default: none)
+
+        Returns:
+            CounterMetric: The counter
+        """
+        return self.register(CounterMetric(name, description, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """
+        Register a histogram.
+
+        Args:
+            name: Metric name
+            description: Description of the metric
+            label_names: Names of the labels (default: none)
+            buckets: Upper bounds of the buckets (default: LATENCY_BUCKETS)
+
+        Returns:
+            Histogram: The histogram
+        """
+        return self.register(Histogram(name, description, label_names, buckets))
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric to the registry.
+
+        Args:
+            metric: Metric to add
+
+        Returns:
+            Metric: The metric
+
+        Raises:
+            ValueError: If a metric with the same name is already registered
+        """
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric '{metric.name}' already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def addCollector(self, collector: Callable[[], Iterable[str]]) -> None:
+        """
+        Add a function returning sample lines (with their HELP and TYPE lines) when scraped.
+
+        Args:
+            collector: Function returning the lines
+
+        Returns:
+            None
+        """
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in list(self.collectors):
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def counterLines(name: str, description: str, label_names: tuple[str, ...], values: dict) -> list[str]:
+    """
+    Format a dictionary of counts as a counter, for collectors.
+
+    Args:
+        name: Metric name
+        description: Description of the metric
+        label_names: Names of the labels
+        values: Count of every combination of label values (a single value with a single label)
+
+    Returns:
+        list[str]: HELP, TYPE and sample lines
+    """
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+    for labels, value in sorted(values.items()):
+        labels = labels if isinstance(labels, tuple) else (labels,)
+        lines.append(f"{name}{formatLabels(label_names, labels)} {value}")
+    return lines
+
+
+def gaugeLines(name: str, description: str, label_names: tuple[str, ...], values: dict) -> list[str]:
+    """
+    Format a dictionary of current values as a gauge, for collectors.
+
+    Args:
+        name: Metric name
+        description: Description of the metric
+        label_names: Names of the labels
+        values: Value of every combination of label values (a single value with a single label)
+
+    Returns:
+        list[str]: HELP, TYPE and sample lines
+    """
+    lines = counterLines(name, description, label_names, values)
+    lines[1] = f"# TYPE {name} gauge"
+    return lines
+
+
+class MetricsServer:
+    """
+    HTTP server publishing a registry on /metrics, in a background thread.
+
+    Attributes:
+        metrics (Metrics): Registry served
+        port (int): TCP port listened on
+        server (ThreadingHTTPServer): Underlying server, None until started
+    """
+
+    def __init__(self, metrics: Metrics, port: int, host: str = "0.0.0.0") -> None:
+        """
+        Initialize the server.
+
+        Args:
+            metrics: Registry to serve
+            port: TCP port to listen on (0 picks a free port)
+            host: Address to listen on (default: every interface)
+
+        Returns:
+            None
+        """
+        self.metrics = metrics
+        self.port = port
+        self.host = host
+        self.server: ThreadingHTTPServer = None
+        self.thread: Thread = None
+
+    def start(self) -> None:
+        """
+        Starts serving in a background thread.
+
+        Returns:
+            None
+        """
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = Thread(target=self.server.serve_forever, name="metrics-server", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the server.
+
+        Returns:
+            None
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = None
+            self.thread = None
+
+
+# Registry of the controller and its metrics
+metrics = Metrics()
+messagesIn = metrics.counter(
+    "game_mqtt_messages_in_total", "MQTT messages received from the player bases", ("component",)
+)
+# Its count is the number of messages published
+publishSeconds = metrics.histogram(
+    "game_mqtt_publish_seconds", "Time spent handing a message to the MQTT client", ("topic_class",)
+)
+lcdQueueSeconds = metrics.histogram(
+    "game_lcd_queue_seconds", "Time LCD frames waited in the output scheduler before being published"
+)
+messagesDropped = metrics.counter(
+    "game_mqtt_messages_dropped_total",
+    "MQTT messages dropped before reaching a session: unknown topic, table or player, malformed payload or full inbox",
+    ("reason",),
+)
+messagesIgnored = metrics.counter(
+    "game_mqtt_messages_ignored_total", "MQTT messages received in a game state that does not handle them", ("state",)
+)
+stateSeconds = metrics.histogram(
+    "game_state_seconds", "Time spent in every game state", ("state",), STATE_BUCKETS
+)
+reactionSeconds = metrics.histogram(
+    "game_minigame_reaction_seconds",
+    "Time from receiving a minigame button press to showing its result on the LCDs",
+    ("minigame",),
+)
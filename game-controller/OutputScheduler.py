@@ -0,0 +1,328 @@
+import paho.mqtt.client as mqtt
+from collections import Counter
+from threading import Lock, Thread, Event
+from time import perf_counter
+from Clock import Clock, RealClock
+from Delivery import LCD_FRAME
+from Metrics import lcdQueueSeconds
+from Tracing import Trace, currentTrace
+from Utils import BROADCAST_ID, ENVELOPE_KEY, PLAYERS_SEGMENT, PUBLISH_METRICS, QUEUED, decodeEnvelope
+
+# Topic suffix of the player LCDs, the only output that is coalesced
+LCD_SUFFIX = "/components/lcd"
+
+
+class OutputScheduler:
+    """
+    Sits between Utils and the MQTT client and batches LCD frames.
+    Only the latest pending frame of every LCD is kept: frames superseded before the next
+    tick never reach the wire, and a frame equal to what the LCD already shows is dropped.
+    Every other publish, subscribe and unsubscribe goes straight to the client.
+    Queued frames keep the trace of the button press that caused them, if any, until they leave.
+    Frames are taken from the queue and published under a send lock, so a state frame can never
+    be published between a frame leaving the queue and reaching the client.
+
+    Attributes:
+        client (mqtt.Client): MQTT client the frames are published with
+        tick (float): Seconds between flushes
+        max_fps (float | None): Default limit of frames per second sent to each LCD
+        clock (Clock): Clock the rate limits are measured with
+        rateLimits (dict[str, float]): Per-LCD frames per second, indexed by LCD topic
+        stats (Counter[str]): Frames queued, sent, coalesced (superseded while pending)
+            and dropped (same as the frame already shown), and subscribe/unsubscribe calls
+    """
+
+    def __init__(
+        self, client: mqtt.Client, tick: float = 0.05, max_fps: float | None = 10, clock: Clock = None
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            client: MQTT client to publish with
+            tick: Seconds between flushes (default: 0.05)
+            max_fps: Default frames per second limit of every LCD, None for no limit (default: 10)
+            clock: Clock the rate limits are measured with (default: real time)
+
+        Returns:
+            None
+        """
+        self.client = client
+        self.tick = tick
+        self.max_fps = max_fps
+        self.clock = clock or RealClock()
+        self.rateLimits: dict[str, float] = {}
+        self.stats: Counter[str] = Counter()
+        self.pending: dict[tuple[str, bytes | None], tuple[str, bytes, float, Trace | None]] = {}
+        self.lastPayload: dict[str, bytes] = {}
+        self.lastSent: dict[str, float] = {}
+        self.lock = Lock()
+        self.sendLock = Lock()
+        self.stopEvent = Event()
+        self.thread: Thread = None
+
+    def setRateLimit(self, topic: str, fps: float | None) -> None:
+        """
+        Sets the frames per second limit of a single LCD.
+
+        Args:
+            topic: LCD topic of the player
+            fps: Frames per second allowed, None to go back to the default
+
+        Returns:
+            None
+        """
+        if fps is None:
+            self.rateLimits.pop(topic, None)
+        else:
+            self.rateLimits[topic] = fps
+
+    def publish(self, topic: str, payload=None, qos: int = 0, retain: bool = False):
+        """
+        Queues LCD frames and publishes anything else right away.
+        LCD frames with QoS or retain carry state, so they skip the queue and replace every pending
+        frame that would only reach their LCDs. Pending frames that also reach other LCDs (e.g. a
+        broadcast, for a state frame of one player) are published first, so they cannot land on top.
+
+        Args:
+            topic: Topic to publish on
+            payload: Message payload
+            qos: MQTT quality of service
+            retain: Whether the broker retains the message
+
+        Returns:
+            QUEUED for queued frames, otherwise the client publish result
+        """
+        if not topic.endswith(LCD_SUFFIX):
+            return self.client.publish(topic, payload, qos, retain)
+        if qos or retain:
+            envelope = ENVELOPE_KEY in payload
+            with self.sendLock:
+                with self.lock:
+                    ahead = self.supersede(topic, payload, envelope)
+                    self.lastSent[topic] = self.clock.time()
+                    self.rememberPayload(topic, payload, envelope)
+                self.send(ahead)
+                return self.client.publish(topic, payload, qos, retain)
+
+        # Broadcast frames for a subset of players never replace each other
+        key = (topic, payload if ENVELOPE_KEY in payload else None)
+        trace = currentTrace.get()
+        if trace is not None:
+            trace.queueFrame()
+        with self.lock:
+            self.stats["queued"] += 1
+            superseded = self.pending.pop(key, None)
+            if superseded is not None:
+                self.stats["coalesced"] += 1
+                self.frameDone(superseded, False)
+            self.pending[key] = (topic, payload, self.clock.time(), trace)
+        return QUEUED
+
+    def subscribe(self, topic, qos=0):
+        self.stats["subscribe"] += 1
+        return self.client.subscribe(topic, qos)
+
+    def unsubscribe(self, topic):
+        self.stats["unsubscribe"] += 1
+        return self.client.unsubscribe(topic)
+
+    def flush(self, force: bool = False) -> None:
+        """
+        Publishes the pending frames whose LCD is not over its rate limit, in arrival order.
+        Once a frame of a table is held back, broadcast frames of that table wait behind it
+        (and everything waits behind a held back broadcast), so LCDs never end on a stale frame.
+
+        Args:
+            force: Ignore the rate limits and publish everything pending
+
+        Returns:
+            None
+        """
+        with self.sendLock:
+            now = self.clock.time()
+            ready = []
+            with self.lock:
+                heldTables, heldBroadcastTables = set(), set()
+                for key, (topic, payload, queued, trace) in self.pending.items():
+                    table, _, rest = topic.partition(PLAYERS_SEGMENT)
+                    broadcast = rest.startswith(f"{BROADCAST_ID}/")
+                    fps = None if force else self.rateLimits.get(topic, self.max_fps)
+                    if (
+                        table in heldBroadcastTables
+                        or (broadcast and table in heldTables)
+                        or (fps and now - self.lastSent.get(topic, 0) < 1 / fps)
+                    ):
+                        heldTables.add(table)
+                        if broadcast:
+                            heldBroadcastTables.add(table)
+                        continue
+                    ready.append((key, topic, payload, queued, trace))
+                    self.lastSent[topic] = now
+                for key, *_ in ready:
+                    del self.pending[key]
+
+                send = []
+                for key, topic, payload, queued, trace in ready:
+                    if key[1] is None and self.lastPayload.get(topic) == payload:
+                        self.stats["dropped"] += 1
+                        if trace is not None:
+                            trace.frameDone(False)
+                        continue
+                    send.append((topic, payload, trace))
+                    self.stats["sent"] += 1
+                    lcdQueueSeconds.labels().observe(now - queued)
+                    self.rememberPayload(topic, payload, key[1] is not None)
+
+            self.send(send)
+
+    def supersede(self, topic: str, payload: bytes, envelope: bool) -> list[tuple[str, bytes, Trace | None]]:
+        """
+        Takes the pending frames a state frame lands on, called with the lock held.
+        Frames reaching only LCDs the state frame reaches are coalesced; frames also reaching
+        other LCDs are returned, to be published before the state frame.
+
+        Args:
+            topic: Topic of the state frame
+            payload: Payload of the state frame
+            envelope: Whether the state frame is for a subset of players
+
+        Returns:
+            list[tuple[str, bytes, Trace | None]]: Frames to publish before the state frame
+        """
+        table, players = self.reach(topic, payload, envelope)
+        now = self.clock.time()
+        ahead = []
+        for key, entry in list(self.pending.items()):
+            pendingTable, pendingPlayers = self.reach(entry[0], entry[1], key[1] is not None)
+            if pendingTable != table or (
+                players is not None and pendingPlayers is not None and not pendingPlayers & players
+            ):
+                continue
+            del self.pending[key]
+            if players is None or (pendingPlayers is not None and pendingPlayers <= players):
+                self.stats["coalesced"] += 1
+                self.frameDone(entry, False)
+                continue
+            pendingTopic, pendingPayload, queued, trace = entry
+            ahead.append((pendingTopic, pendingPayload, trace))
+            self.stats["sent"] += 1
+            lcdQueueSeconds.labels().observe(now - queued)
+            self.lastSent[pendingTopic] = now
+            self.rememberPayload(pendingTopic, pendingPayload, key[1] is not None)
+        return ahead
+
+    @staticmethod
+    def reach(topic: str, payload: bytes, envelope: bool) -> tuple[str, frozenset[str] | None]:
+        """
+        Finds the LCDs an LCD frame is shown on.
+
+        Args:
+            topic: Topic of the frame
+            payload: Payload of the frame
+            envelope: Whether the frame is for a subset of players
+
+        Returns:
+            tuple[str, frozenset[str] | None]: Table prefix, and the player IDs of the topics
+                reached, or None for every player of the table
+        """
+        table, _, rest = topic.partition(PLAYERS_SEGMENT)
+        player = rest.partition("/")[0]
+        if player != BROADCAST_ID:
+            return table, frozenset((player,))
+        if not envelope:
+            return table, None
+        return table, frozenset(str(player_id) for player_id in decodeEnvelope(payload))
+
+    def send(self, frames: list[tuple[str, bytes, Trace | None]]) -> None:
+        """
+        Publishes LCD frames taken from the queue, with the send lock held but not the queue lock.
+        They are timed here, as lcd frames, since queueing them was not publishing them.
+
+        Args:
+            frames: Topic, payload and trace of every frame, in order
+
+        Returns:
+            None
+        """
+        published = PUBLISH_METRICS[LCD_FRAME]
+        for topic, payload, trace in frames:
+            start = perf_counter()
+            self.client.publish(topic, payload)
+            published.observe(perf_counter() - start)
+            if trace is not None:
+                trace.frameDone(True)
+
+    def frameDone(self, entry: tuple, sent: bool) -> None:
+        """
+        Ends the wait of a pending frame in the trace of the button press that caused it.
+
+        Args:
+            entry: Pending entry (topic, payload, queued time, trace)
+            sent: Whether the frame was published
+
+        Returns:
+            None
+        """
+        trace = entry[3]
+        if trace is not None:
+            trace.frameDone(sent)
+
+    def rememberPayload(self, topic: str, payload: bytes, envelope: bool) -> None:
+        """
+        Tracks the frame shown by every LCD, so repeated frames can be dropped.
+        Broadcast frames change what the player LCDs of the table show, and a frame for some
+        players means the broadcast topic no longer tells what every LCD shows.
+
+        Args:
+            topic: Topic the frame was published on
+            payload: Frame payload
+            envelope: Whether the frame was for a subset of players
+
+        Returns:
+            None
+        """
+        prefix, _, rest = topic.partition(PLAYERS_SEGMENT)
+        table = f"{prefix}{PLAYERS_SEGMENT}"
+        if rest.startswith(f"{BROADCAST_ID}/"):
+            for shown in [shown for shown in self.lastPayload if shown.startswith(table)]:
+                del self.lastPayload[shown]
+            if envelope:
+                return
+        else:
+            self.lastPayload.pop(f"{table}{BROADCAST_ID}{LCD_SUFFIX}", None)
+        self.lastPayload[topic] = payload
+
+    def run(self) -> None:
+        """
+        Flushes the pending frames every tick until stopped.
+
+        Returns:
+            None
+        """
+        while not self.stopEvent.wait(self.tick):
+            self.flush()
+
+    def start(self) -> None:
+        """
+        Starts flushing in a background thread.
+
+        Returns:
+            None
+        """
+        self.stopEvent.clear()
+        self.thread = Thread(target=self.run, name="output-scheduler", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the background thread and publishes whatever is still pending.
+
+        Returns:
+            None
+        """
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush(force=True)
@@ -1,9 +1,13 @@
+from Message import DEFAULT_CODEC
 
 class Player:
     """
     Represents a player in the game with their state and capabilities.
     Manages player position, points, and status effects.
+    Slotted, so large rosters and many sessions per process stay small.
     """
+
+    __slots__ = ("id", "points", "connected", "position", "skipped", "codec")
     
     def __init__(self, id: int) -> None:
         """
@@ -17,6 +21,7 @@ class Player:
         self.connected = False
         self.position = 0
         self.skipped = False
+        self.codec = DEFAULT_CODEC
 
     def __str__(self) -> str:
         """
@@ -77,4 +82,15 @@ class Player:
         Returns:
             bool: True if players have same ID
         """
+        if not isinstance(value, Player):
+            return NotImplemented
         return self.id == value.id
+
+    def __hash__(self) -> int:
+        """
+        Hash players by ID, consistently with __eq__, so they can key dictionaries and sets.
+
+        Returns:
+            int: Hash of the player ID
+        """
+        return hash(self.id)
@@ -0,0 +1,104 @@
+from collections.abc import Sequence
+from typing import Iterable, Iterator
+from Player import Player
+
+"""
+Roster of the players of a session, in turn order.
+Behaves like the list of players it replaces (indexing, slicing, iteration, len), and also
+indexes the players by ID, so finding a player, its seat or the next player costs a dictionary
+lookup instead of a scan of the table, whatever the size of the lobby.
+"""
+
+
+class Roster(Sequence):
+    """
+    Players of a session in turn order, indexed by ID.
+
+    Attributes:
+        players (list[Player]): Players in turn order
+        indexes (dict[int, int]): Seat of every player, indexed by player ID
+    """
+
+    __slots__ = ("players", "indexes")
+
+    def __init__(self, players: Iterable[Player]) -> None:
+        """
+        Initialize the roster.
+
+        Args:
+            players: Players in turn order
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If two players share an ID
+        """
+        self.players = list(players)
+        self.indexes = {player.id: index for index, player in enumerate(self.players)}
+        if len(self.indexes) != len(self.players):
+            raise ValueError("Players of a roster must have different IDs")
+
+    def __getitem__(self, index):
+        return self.players[index]
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __iter__(self) -> Iterator[Player]:
+        return iter(self.players)
+
+    def __contains__(self, player) -> bool:
+        return isinstance(player, Player) and player.id in self.indexes
+
+    def __repr__(self) -> str:
+        return repr(self.players)
+
+    def get(self, player_id: int) -> Player | None:
+        """
+        Finds a player by ID.
+
+        Args:
+            player_id: ID of the player
+
+        Returns:
+            Player | None: The player, or None if it is not in the roster
+        """
+        index = self.indexes.get(player_id)
+        return None if index is None else self.players[index]
+
+    def index(self, player: Player, start: int = 0, stop: int = None) -> int:
+        """
+        Seat of a player, like list.index but without scanning the roster.
+
+        Args:
+            player: Player to find
+            start: Only accept seats from this one (default: 0)
+            stop: Only accept seats before this one (default: the end)
+
+        Returns:
+            int: Seat of the player
+
+        Raises:
+            ValueError: If the player is not in the roster (or not between start and stop)
+        """
+        index = self.indexes.get(player.id)
+        if index is None or index < start or (stop is not None and index >= stop):
+            raise ValueError(f"Player {player.id} is not in the roster")
+        return index
+
+    def next(self, player: Player, steps: int = 1) -> Player:
+        """
+        Player seated some seats after another one, going around the table.
+
+        Args:
+            player: Player to start from
+            steps: Seats to move, negative to go backwards (default: 1)
+
+        Returns:
+            Player: The player in that seat
+
+        Raises:
+            ValueError: If the player is not in the roster
+        """
+        return self.players[(self.index(player) + steps) % len(self.players)]
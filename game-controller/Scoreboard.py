@@ -0,0 +1,178 @@
+from bisect import bisect_left
+from typing import Callable
+from Player import Player
+from Roster import Roster
+
+"""
+Scoring of a session: every change of points goes through the scoreboard, which keeps the
+leaderboard sorted as points change instead of sorting or scanning the players every turn.
+A change moves one entry of the ranking (a bisect and a list move), notes the span of ranks it
+shifted so only those are shown again, and keeps the set of players at or over the winning points,
+calling back the moment a player reaches them.
+"""
+
+
+class Scoreboard:
+    """
+    Points of the players of a roster, ranked.
+    Ranks go from 0 (most points) and players tied on points are ranked by seat.
+
+    Attributes:
+        players (Roster): Players scored
+        win_points (int): Points needed to win
+        on_win (Callable[[Player], None] | None): Called when a player reaches the winning points
+        ranking (list[tuple[int, int]]): (-points, seat) of every player, sorted
+        contenders (set[int]): IDs of the players at or over the winning points
+        changed (list[tuple[int, int]]): Spans of ranks (first, last) whose player or points changed
+            since they were last shown, merged when taken
+    """
+
+    def __init__(self, players: Roster, win_points: int, on_win: Callable[[Player], None] = None) -> None:
+        """
+        Initialize the scoreboard with the current points of the players.
+
+        Args:
+            players: Players to score
+            win_points: Points needed to win
+            on_win: Called with the player when they reach the winning points (default: none)
+
+        Returns:
+            None
+        """
+        self.players = players
+        self.win_points = win_points
+        self.on_win = on_win
+        self.ranking: list[tuple[int, int]] = []
+        self.contenders: set[int] = set()
+        self.changed: list[tuple[int, int]] = []
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Ranks every player again from their points, e.g. after restoring a game from its journal.
+        Every rank is marked as changed.
+
+        Returns:
+            None
+        """
+        self.ranking = sorted((-player.points, seat) for seat, player in enumerate(self.players))
+        self.contenders = {player.id for player in self.players if player.points >= self.win_points}
+        self.changed = [(0, len(self.ranking) - 1)]
+
+    def set(self, player: Player, points: int) -> None:
+        """
+        Sets the points of a player, moving them in the ranking.
+
+        Args:
+            player: Player scored
+            points: New points, at least 0
+
+        Returns:
+            None
+        """
+        old = player.points
+        if points == old:
+            return
+        seat = self.players.index(player)
+        ranking = self.ranking
+        rank = bisect_left(ranking, (-old, seat))
+        del ranking[rank]
+        newRank = bisect_left(ranking, (-points, seat))
+        ranking.insert(newRank, (-points, seat))
+        player.points = points
+        self.changed.append((rank, newRank) if rank <= newRank else (newRank, rank))
+
+        if points >= self.win_points:
+            if old < self.win_points:
+                self.contenders.add(player.id)
+                if self.on_win is not None:
+                    self.on_win(player)
+        elif old >= self.win_points:
+            self.contenders.discard(player.id)
+
+    def gain(self, player: Player, points: int) -> None:
+        """
+        Adds points to a player.
+
+        Args:
+            player: Player scored
+            points: Points to add
+
+        Returns:
+            None
+        """
+        self.set(player, player.points + points)
+
+    def lose(self, player: Player, points: int) -> None:
+        """
+        Removes points from a player, down to 0.
+
+        Args:
+            player: Player scored
+            points: Points to remove
+
+        Returns:
+            None
+        """
+        self.set(player, max(0, player.points - points))
+
+    def rank(self, player: Player) -> int:
+        """
+        Rank of a player.
+
+        Args:
+            player: Player ranked
+
+        Returns:
+            int: Rank, 0 for the player with the most points
+        """
+        return bisect_left(self.ranking, (-player.points, self.players.index(player)))
+
+    def standings(self) -> list[Player]:
+        """
+        Players from the most to the fewest points.
+
+        Returns:
+            list[Player]: Players in rank order
+        """
+        return [self.players[seat] for _, seat in self.ranking]
+
+    def leaders(self) -> list[Player]:
+        """
+        Players tied on the most points, by seat.
+
+        Returns:
+            list[Player]: Leading players
+        """
+        best = self.ranking[0][0]
+        leaders = []
+        for points, seat in self.ranking:
+            if points != best:
+                break
+            leaders.append(self.players[seat])
+        return leaders
+
+    def winners(self) -> list[Player]:
+        """
+        Players who won: the leaders, once a player has the winning points.
+
+        Returns:
+            list[Player]: Winning players by seat, empty while nobody has the winning points
+        """
+        return self.leaders() if self.contenders else []
+
+    def takeChanges(self) -> list[tuple[int, Player]]:
+        """
+        Ranks that changed since the last call, and clears them.
+
+        Returns:
+            list[tuple[int, Player]]: (rank, player) of every changed rank, in rank order
+        """
+        changes = []
+        following = 0
+        for first, last in sorted(self.changed):
+            for rank in range(max(first, following), last + 1):
+                changes.append((rank, self.players[self.ranking[rank][1]]))
+            following = max(following, last + 1)
+        self.changed.clear()
+        return changes
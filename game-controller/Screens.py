@@ -0,0 +1,101 @@
+from CellType import CellType
+from Message import LCDTemplate
+
+"""
+LCD screens of the game and the minigames, rendered with the 16x2 layout engine of Message.
+Screens without slots are rendered once, when this module is imported, and a line that does
+not fit the LCD fails at import instead of being cut by the player base.
+"""
+
+# Connection and game flow
+CONNECTED = LCDTemplate("Connected as", "Player {player}")
+WELCOME = LCDTemplate("Welcome to", "The Game")
+GAME_RESUMED = LCDTemplate("Game resumed")
+GAME_OVER = LCDTemplate("Game Over", "Player {player} wins!")
+GAME_OVER_DRAW = LCDTemplate("Game Over", "Draw!")
+STATS = LCDTemplate("{top}", "{down}", align="left")
+OPTION = LCDTemplate("{option}")
+CLEAR = LCDTemplate(" ", align="left")
+
+# Turns
+YOUR_TURN = LCDTemplate("Your turn!")
+PLAYER_TURN = LCDTemplate("Player {player} turn!")
+TURN_SKIPPED = LCDTemplate("Turn skipped!")
+PLAYER_TURN_SKIPPED = LCDTemplate("Player {player}'s", "turn skipped!")
+ROLL_DICE = LCDTemplate("Roll the dice", "Press the button")
+DICE_ROLLED = LCDTemplate("Dice rolled", "{value}")
+PLAYER_ROLLED = LCDTemplate("Player {player}", "rolled {value}")
+MOVE_MEEPLE = LCDTemplate("Move the meeple.", "{moves} moves left")
+PLAYER_MOVING = LCDTemplate("P{player} moving.", "{moves} moves left")
+MOVED = LCDTemplate("Moved to", "cell {position}")
+PLAYER_MOVED = LCDTemplate("Player {player} moved", "to cell {position}")
+
+# Cells: the screen of the player landing on every cell, and of the other players
+CELL_LANDED = {
+    CellType.GP: LCDTemplate("Gain Points"),
+    CellType.LP: LCDTemplate("Lose Points"),
+    CellType.SK: LCDTemplate("Skip Turn"),
+    CellType.RE: LCDTemplate("Random Event"),
+    CellType.MF: LCDTemplate("Move Forward"),
+    CellType.MB: LCDTemplate("Move Backwards"),
+    CellType.DE: LCDTemplate("Death Event"),
+}
+PLAYER_LANDED = LCDTemplate("Player {player} landed", "on {cell}")
+GAINED = LCDTemplate("You gained", "{points:2d} points")
+PLAYER_GAINED = LCDTemplate("Player {player} gained", "{points:2d} points")
+LOST = LCDTemplate("You lost", "{points:2d} points")
+PLAYER_LOST = LCDTemplate("Player {player} lost", "{points:2d} points")
+SKIP_NEXT_TURN = LCDTemplate("You will lose", "next turn")
+MOVE_FORWARD = LCDTemplate("Move {steps}", "steps forward")
+PLAYER_MOVES_FORWARD = LCDTemplate("Player {player} moves", "{steps} steps forward")
+MOVE_BACKWARD = LCDTemplate("Move {steps}", "steps backwards")
+PLAYER_MOVES_BACKWARD = LCDTemplate("Player {player} moves", "{steps} steps back")
+DIED = LCDTemplate("You died")
+PLAYER_DIED = LCDTemplate("Player {player} died")
+LOST_ALL = LCDTemplate("You lose", "all your points")
+PLAYER_LOST_ALL = LCDTemplate("Player {player} lost", "all points")
+
+# Minigame results
+MINIGAME_TIME = LCDTemplate("Minigame Time!")
+NO_WINNERS = LCDTemplate("No winners", "0 points")
+MINIGAME_WON = LCDTemplate("You won!")
+MINIGAME_LOST = LCDTemplate("You lost")
+GREAT_JOB = LCDTemplate("Great job!", "Congratulations!")
+BETTER_LUCK = LCDTemplate("Better luck", "next time")
+WON_POINTS = LCDTemplate("You won", "{points} points")
+PLAYER_WON_POINTS = LCDTemplate("Player {player} won", "{points} points")
+DRAW_POINTS = LCDTemplate("Draw!", "{points} points", align="left")
+
+# Minigames
+READY = LCDTemplate("Ready?", "{count}")
+
+HOT_POTATO = LCDTemplate("Hot Potato!")
+HOT_POTATO_PASS = LCDTemplate("Press button to", "pass the potato!")
+HOT_POTATO_QUICK = LCDTemplate("Pass it quickly!", "It's hot!")
+HOT_POTATO_AVOID = LCDTemplate("Avoid holding it", "when it blows!")
+HOT_POTATO_BOOM = LCDTemplate("BOOM!", "Potato exploded!")
+HOT_POTATO_HOLDER = LCDTemplate("You have", "the potato!")
+HOT_POTATO_PLAYER = LCDTemplate("Player {player} has", "the potato!")
+
+LAST_STICK = LCDTemplate("Last Stick", "Standing!")
+LAST_STICK_RULE = LCDTemplate("If you take", "the last stick", align="left")
+LAST_STICK_LOSE = LCDTemplate("You lose!")
+LAST_STICK_SHORT = LCDTemplate("Short:", "Take 1-2 sticks", align="left")
+LAST_STICK_LONG = LCDTemplate("Long:", "Confirm", align="left")
+LAST_STICK_TAKE = LCDTemplate("Take: {take} sticks", "{sticks}", align="left")
+LAST_STICK_WAIT = LCDTemplate("Wait for P{player}", "{sticks}", align="left")
+
+NUMBER_GUESSER = LCDTemplate("Number Guesser!")
+NUMBER_GUESSER_RULE = LCDTemplate("Guess the number", "between {low} and {high}", align="left")
+NUMBER_GUESSER_CONTROLS = LCDTemplate("Short: Change", "Long: Confirm", align="left")
+NUMBER_GUESSER_CURRENT = LCDTemplate("Current number", "-> {number} <-")
+NUMBER_GUESSER_CHOSEN = LCDTemplate("Number {number} chosen", "{status}")
+NUMBER_GUESSER_FINISHED = LCDTemplate("All players", "have finished")
+NUMBER_GUESSER_RESULT = LCDTemplate("The number was", "{number}")
+
+TUG_OF_WAR = LCDTemplate("Tug of War!")
+TUG_OF_WAR_PULL = LCDTemplate("Pull the rope", "to your side")
+TUG_OF_WAR_CONTROLS = LCDTemplate("Long: Pull the", "rope", align="left")
+TUG_OF_WAR_TEAM = LCDTemplate("You are in", "team {team}")
+TUG_OF_WAR_ROPE = LCDTemplate("{title}", "{rope}")
+TUG_OF_WAR_FINISHED = LCDTemplate("Tug of War", "finished!")
@@ -0,0 +1,143 @@
+import asyncio
+import paho.mqtt.client as mqtt
+from threading import Thread
+from GameSession import GameSession
+from Metrics import messagesIn, messagesDropped
+from Utils import parseTopic, BUTTON_COMPONENT, CONNECTION_COMPONENT, HALL_SENSOR_COMPONENT
+
+# Label of the incoming messages of any component the sessions do not handle
+OTHER_COMPONENT = "other"
+
+# Counter of every component, so topics sent by any client cannot add label values
+MESSAGES_IN = {
+    component: messagesIn.labels(component)
+    for component in (CONNECTION_COMPONENT, BUTTON_COMPONENT, HALL_SENSOR_COMPONENT, OTHER_COMPONENT)
+}
+
+
+class SessionRegistry:
+    """
+    Keeps track of all the game sessions hosted by the controller.
+    Routes incoming MQTT messages to the session that owns the topic prefix,
+    so every table can share a single MQTT connection.
+    Sessions either all run on one asyncio event loop (runAll) or,
+    as a compatibility path, each on its own thread (startAll).
+
+    Attributes:
+        sessions (dict[str, GameSession]): Sessions indexed by their topic prefix
+        threads (dict[str, Thread]): Thread running each session (compatibility path)
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty session registry.
+
+        Returns:
+            None
+        """
+        self.sessions: dict[str, GameSession] = {}
+        self.threads: dict[str, Thread] = {}
+
+    def register(self, session: GameSession) -> None:
+        """
+        Adds a session to the registry.
+
+        Args:
+            session: Session to register
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If a session with the same prefix is already registered
+        """
+        if session.prefix in self.sessions:
+            raise ValueError(f"Session with prefix '{session.prefix}' already registered")
+        self.sessions[session.prefix] = session
+
+    def unregister(self, prefix: str) -> None:
+        """
+        Removes a session from the registry.
+
+        Args:
+            prefix: Topic prefix of the session to remove
+
+        Returns:
+            None
+        """
+        self.sessions.pop(prefix, None)
+        self.threads.pop(prefix, None)
+
+    def getSession(self, topic: str) -> GameSession | None:
+        """
+        Finds the session owning a topic.
+
+        Args:
+            topic: Full MQTT topic (e.g. "game/table-2/players/1/components/button")
+
+        Returns:
+            GameSession | None: Owning session, or None if the prefix is unknown
+        """
+        parsed = parseTopic(topic)
+        if parsed is None:
+            return None
+        return self.sessions.get(parsed[0])
+
+    def on_message(self, client: mqtt.Client, userdata, message: mqtt.MQTTMessage) -> None:
+        """
+        MQTT callback that forwards each message to its session.
+        The topic is parsed once (and cached) into prefix, player ID and component,
+        so sessions dispatch with dictionary lookups only.
+
+        Args:
+            client: MQTT client instance
+            userdata: User defined data passed to callbacks
+            message: Received MQTT message
+
+        Returns:
+            None
+        """
+        parsed = parseTopic(message.topic)
+        if parsed is None:
+            messagesDropped.inc("unknown_topic")
+            return
+        prefix, player_id, component = parsed
+        MESSAGES_IN.get(component, MESSAGES_IN[OTHER_COMPONENT]).inc()
+        session = self.sessions.get(prefix)
+        if session is None:
+            messagesDropped.inc("unknown_table")
+        else:
+            session.onMessage(player_id, component, message)
+
+    async def runAll(self) -> None:
+        """
+        Runs every registered session concurrently on the current event loop.
+        Blocks until every session has finished.
+
+        Returns:
+            None
+        """
+        await asyncio.gather(*(session.run() for session in self.sessions.values()))
+
+    def startAll(self) -> None:
+        """
+        Starts every registered session in its own thread, each with its own event loop.
+
+        Returns:
+            None
+        """
+        for prefix, session in self.sessions.items():
+            if prefix not in self.threads:
+                thread = Thread(target=session.runBlocking, name=f"session-{prefix}", daemon=True)
+                self.threads[prefix] = thread
+                thread.start()
+
+    def joinAll(self) -> None:
+        """
+        Blocks until every running session has finished.
+
+        Returns:
+            None
+        """
+        for thread in list(self.threads.values()):
+            thread.join()
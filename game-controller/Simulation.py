@@ -0,0 +1,445 @@
+#######################
+# IMPORTS AND MODULES #
+#######################
+import argparse
+import asyncio
+import json
+import time
+
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from random import Random
+from Clock import VirtualClock
+from GameSession import GameSession
+from GameState import GameState
+from InputEvent import PRESS_TYPES
+from Tracing import tracer
+from Utils import PLAYERS_SEGMENT
+
+"""
+Headless simulation of full games.
+Sessions run on a virtual clock against a fake MQTT client, while bots play for every player
+by connecting, pressing buttons and moving meeples on the inputs the session currently handles.
+Pauses take no real time, so a game costs only its own logic and output: about 25 games/s
+with 2 players and 10 to 15 games/s with 4, played in batches that share the event loop.
+That is far from thousands of games per second, on purpose: the engine plays the real session,
+pauses and output included, so it finds the bugs of the controller itself. A 2-player game
+still makes about 1,500 pauses (each a pass through the event loop) and publishes about 3,000
+messages, and a 4-player game about 2,800 and 10,000. Cutting them would mean simulating
+another game. For board balance at scale, BalanceAnalyzer plays the rules alone, tens of
+thousands of games per second, and MarkovAnalysis computes them exactly.
+A seed makes every game reproducible for balance analysis and regression testing.
+
+Usage:
+    python Simulation.py [--games 1000] [--players 2] [--seed 1] [--board boards/classic.json]
+"""
+
+# Reaction time range of the bots in seconds
+REACTION_TIME = (0.2, 1.0)
+
+# Games played side by side on the event loop, sharing the cost of every pass through it
+BATCH_GAMES = 64
+
+# States where only the player whose turn it is sends input
+TURN_STATES = (GameState.ROLLING_DICE, GameState.MOVING, GameState.MINIGAME_ELECTION)
+
+
+class SimulatedMessage:
+    """
+    Stand-in for paho's MQTTMessage, with the attributes the handlers read.
+    """
+
+    __slots__ = ("topic", "payload")
+
+    def __init__(self, topic: str, payload: bytes) -> None:
+        self.topic = topic
+        self.payload = payload
+
+
+# Button payloads, encoded once
+PRESS_PAYLOADS = {press_type: json.dumps({"type": press_type}).encode() for press_type in PRESS_TYPES}
+
+
+class FakeMqttClient:
+    """
+    In-memory replacement of the MQTT client.
+    Keeps the active subscriptions, so bots know which inputs the game listens to,
+    and counts the broker operations instead of sending them.
+
+    Attributes:
+        subscriptions (dict[str, tuple[object, str]]): Player ID (or "+") and component
+            of every subscribed topic, in subscription order
+        operations (Counter[str]): Number of publish, subscribe and unsubscribe calls
+    """
+
+    def __init__(self) -> None:
+        self.subscriptions: dict[str, tuple[object, str]] = {}
+        self.operations: Counter[str] = Counter()
+
+    @property
+    def published(self) -> int:
+        return self.operations["publish"]
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        self.operations["publish"] += 1
+
+    def subscribe(self, topic, qos=0):
+        self.operations["subscribe"] += 1
+        _, _, rest = topic.partition(PLAYERS_SEGMENT)
+        player, _, component = rest.partition("/")
+        self.subscriptions[topic] = (int(player) if player.isdigit() else player, component)
+
+    def unsubscribe(self, topic):
+        self.operations["unsubscribe"] += 1
+        self.subscriptions.pop(topic, None)
+
+
+class Bot(ABC):
+    """
+    Plays a simulated game for every player of a session.
+    Looks at the subscribed topics the session currently handles, and sends one input after another.
+
+    Attributes:
+        wakeup (asyncio.Event): Set by the simulation when the session starts handling new inputs
+    """
+
+    def __init__(self, rng: Random = None) -> None:
+        """
+        Initialize the bot.
+
+        Args:
+            rng: Random generator for reaction times and random choices (default: unseeded)
+
+        Returns:
+            None
+        """
+        self.rng = rng or Random()
+        self.wakeup = asyncio.Event()
+
+    @abstractmethod
+    def choosePressType(self, player_id: int, component: str) -> str:
+        """
+        Chooses the button press to send.
+
+        Args:
+            player_id: ID of the player pressing
+            component: Topic component the input is sent to
+
+        Returns:
+            str: "short" or "long"
+        """
+        pass
+
+    def choosePlayer(self, session: GameSession, player_id) -> int:
+        """
+        Chooses the player sending an input to a topic.
+        During turn phases that is the player whose turn it is, otherwise any player.
+
+        Args:
+            session: Session being played
+            player_id: Player ID of the topic, or "+" for any player
+
+        Returns:
+            int: ID of the player sending the input
+        """
+        if player_id != "+":
+            return player_id
+        if session.current_state in TURN_STATES:
+            return session.players[session.turn].id
+        return self.rng.choice(session.players).id
+
+    def inputs(self, session: GameSession, client: FakeMqttClient) -> list[tuple[str, object, str]]:
+        """
+        Lists the subscribed topics the current state of the session has a handler for.
+
+        Args:
+            session: Session being played
+            client: Fake client holding the subscriptions
+
+        Returns:
+            list[tuple[str, object, str]]: Topic, player ID (or "+") and component of every input
+        """
+        handlers = session.handlers
+        return [
+            (topic, player_id, component)
+            for topic, (player_id, component) in client.subscriptions.items()
+            if component in handlers
+        ]
+
+    async def play(self, session: GameSession, client: FakeMqttClient) -> None:
+        """
+        Sends inputs to the session until the game is over.
+        Each input comes after a reaction time of the clock; with no input expected the bot waits
+        to be woken up.
+
+        Args:
+            session: Session being played
+            client: Fake client holding the subscriptions
+
+        Returns:
+            None
+        """
+        while True:
+            inputs = self.inputs(session, client)
+            if not inputs:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+            await session.clock.sleep(self.rng.uniform(*REACTION_TIME))
+            topic, player_id, component = self.rng.choice(inputs)
+            player_id = self.choosePlayer(session, player_id)
+            payload = PRESS_PAYLOADS[self.choosePressType(player_id, component)]
+            topic = topic.replace("/+/", f"/{player_id}/")
+            session.handleMessage(player_id, component, SimulatedMessage(topic, payload), time.perf_counter())
+
+
+class RandomBot(Bot):
+    """
+    Bot pressing random players' buttons with random short and long presses.
+    """
+
+    def choosePressType(self, player_id: int, component: str) -> str:
+        return self.rng.choice(PRESS_TYPES)
+
+
+class ScriptedBot(Bot):
+    """
+    Bot replaying a fixed sequence of press types, then falling back to random presses.
+    Useful to reproduce a specific game in a regression test.
+    """
+
+    def __init__(self, presses: list[str], rng: Random = None) -> None:
+        """
+        Initialize the bot.
+
+        Args:
+            presses: Press types ("short" or "long") sent in order
+            rng: Random generator for reaction times and random choices (default: unseeded)
+
+        Returns:
+            None
+        """
+        super().__init__(rng)
+        self.presses = deque(presses)
+
+    def choosePressType(self, player_id: int, component: str) -> str:
+        if self.presses:
+            return self.presses.popleft()
+        return self.rng.choice(PRESS_TYPES)
+
+
+class SimulationResult:
+    """
+    Outcome of a simulated game.
+
+    Attributes:
+        seed (int): Seed the game was played with
+        points (dict[int, int]): Final points of every player
+        winners (list[int]): IDs of the players with the best score
+        duration (float): Simulated game time in seconds
+        published (int): Number of messages published by the game
+        subscriptions (int): Number of subscribe and unsubscribe calls of the game
+    """
+
+    def __init__(self, seed: int, session: GameSession, client: FakeMqttClient) -> None:
+        self.seed = seed
+        self.points = {player.id: player.points for player in session.players}
+        best = max(self.points.values())
+        self.winners = [player_id for player_id, points in self.points.items() if points == best]
+        self.duration = session.clock.time()
+        self.published = client.published
+        self.subscriptions = client.operations["subscribe"] + client.operations["unsubscribe"]
+
+    def __str__(self) -> str:
+        return (
+            f"Seed {self.seed} - Winners: {self.winners} - Points: {self.points} - "
+            f"Duration: {self.duration:.0f}s - Published: {self.published} - Subscriptions: {self.subscriptions}"
+        )
+
+
+class Simulation:
+    """
+    Plays headless games to GAME_OVER on a virtual clock.
+
+    Attributes:
+        num_players (int): Number of players per game
+        win_points (int): Points needed to win
+        debug (bool): Whether to play on the debug board
+        bot_factory (Callable[[Random], Bot]): Builds the bot of each game from its random generator
+        board_file (str): Board file the games are played on, if any
+    """
+
+    def __init__(
+        self, num_players: int = 2, win_points: int = 50, debug: bool = False, bot_factory=RandomBot, board_file: str = None
+    ) -> None:
+        """
+        Initialize the simulation.
+
+        Args:
+            num_players: Number of players per game
+            win_points: Points needed to win
+            debug: Play on the debug board
+            bot_factory: Builds the bot of each game from its random generator (default: RandomBot)
+            board_file: Board file the games are played on (default: the built-in board)
+
+        Returns:
+            None
+        """
+        self.num_players = num_players
+        self.win_points = win_points
+        self.debug = debug
+        self.bot_factory = bot_factory
+        self.board_file = board_file
+
+    async def play(self, seed: int, clock: VirtualClock = None, client: FakeMqttClient = None) -> SimulationResult:
+        """
+        Plays a single game on the running event loop.
+
+        Args:
+            seed: Seed of the game; the same seed always plays the same game
+            clock: Virtual clock of the game (default: a new one)
+            client: Fake MQTT client of the game, e.g. a broker stand-in (default: a new one)
+
+        Returns:
+            SimulationResult: Outcome of the game
+
+        Raises:
+            RuntimeError: If the game waits for an input no bot can send
+        """
+        results = await self.playTogether([(seed, clock or VirtualClock(), client or FakeMqttClient())])
+        return results[0]
+
+    async def playTogether(self, games: list[tuple[int, VirtualClock, FakeMqttClient]]) -> list[SimulationResult]:
+        """
+        Plays games side by side on the running event loop, each on its own clock.
+        Lets every ready task run, then for every game wakes the bot if the session handles inputs,
+        or jumps its clock to its next pause, until every game is over.
+        Games only share the event loop, so each plays exactly as it would alone, and the cost
+        of every pass through the loop is split between them.
+
+        Args:
+            games: Seed, virtual clock and fake MQTT client of every game
+
+        Returns:
+            list[SimulationResult]: Outcome of every game, in order
+
+        Raises:
+            RuntimeError: If a game waits for an input no bot can send
+        """
+        playing = []
+        for seed, clock, client in games:
+            session = self.createSession(seed, clock, client)
+            player = self.bot_factory(Random(seed + 1))
+            game = asyncio.create_task(session.run())
+            bot = asyncio.create_task(player.play(session, client))
+            playing.append((seed, clock, client, session, player, game, bot))
+        tasks = [task for *_, game, bot in playing for task in (game, bot)]
+        try:
+            running = playing
+            while running:
+                await self.settle()
+                waiting = []
+                for entry in running:
+                    seed, clock, client, session, player, game, bot = entry
+                    if game.done():
+                        game.result()  # Raise the errors of the game
+                        continue
+                    waiting.append(entry)
+                    if not player.wakeup.is_set() and player.inputs(session, client):
+                        player.wakeup.set()
+                    elif not clock.advance():
+                        raise RuntimeError(f"Simulation stalled in {session.current_state.name} (seed {seed})")
+                running = waiting
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return [SimulationResult(seed, session, client) for seed, clock, client, session, *_ in playing]
+
+    def createSession(self, seed: int, clock: VirtualClock, client: FakeMqttClient) -> GameSession:
+        """
+        Creates the session of a game. Override it to configure the session (e.g. a journal).
+
+        Args:
+            seed: Seed of the game
+            clock: Virtual clock of the game
+            client: Fake MQTT client of the game
+
+        Returns:
+            GameSession: Session playing the game
+        """
+        return GameSession(
+            client, num_players=self.num_players, win_points=self.win_points, debug=self.debug,
+            clock=clock, rng=Random(seed), quiet=True, board_file=self.board_file,
+        )
+
+    async def settle(self) -> None:
+        """
+        Yields to the event loop until no other task is ready to run at the current simulated time.
+
+        Returns:
+            None
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(0)
+        # The ready queue is an implementation detail, so fall back to a single pass without it
+        while getattr(loop, "_ready", None):
+            await asyncio.sleep(0)
+
+    async def playMany(self, seeds, batch: int = BATCH_GAMES) -> list[SimulationResult]:
+        """
+        Plays games on the running event loop, a batch of them side by side at a time.
+
+        Args:
+            seeds: Seeds of the games to play
+            batch: Games played side by side (default: BATCH_GAMES)
+
+        Returns:
+            list[SimulationResult]: Outcome of every game
+        """
+        seeds = list(seeds)
+        results = []
+        for first in range(0, len(seeds), batch):
+            games = [(seed, VirtualClock(), FakeMqttClient()) for seed in seeds[first:first + batch]]
+            results += await self.playTogether(games)
+        return results
+
+    def run(self, games: int = 1, seed: int = 0) -> list[SimulationResult]:
+        """
+        Plays games with consecutive seeds on a new event loop.
+
+        Args:
+            games: Number of games to play
+            seed: Seed of the first game
+
+        Returns:
+            list[SimulationResult]: Outcome of every game
+        """
+        return asyncio.run(self.playMany(range(seed, seed + games)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play headless games on a virtual clock")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--win-points", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--board", help="board file to play on (default: the built-in board)")
+    parser.add_argument("--trace", action="store_true", help="report the button-to-feedback latency of the minigames")
+    parser.add_argument("--folded", help="file to write the traced latency breakdown to, as folded stacks")
+    args = parser.parse_args()
+    tracer.enabled = args.trace or bool(args.folded)
+
+    simulation = Simulation(args.players, args.win_points, board_file=args.board)
+    start = time.perf_counter()
+    results = simulation.run(args.games, args.seed)
+    elapsed = time.perf_counter() - start
+    if args.games <= 10:
+        for result in results:
+            print(result)
+    print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:.0f} games/s)")
+    if tracer.enabled:
+        print(tracer.report())
+    if args.folded:
+        with open(args.folded, "w") as file:
+            file.write(tracer.folded() + "\n")
@@ -0,0 +1,255 @@
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import count
+from threading import Lock
+from time import perf_counter
+
+"""
+Opt-in tracing of the button-to-feedback latency of the minigames.
+Every traced button press gets a correlation id when its handler starts. The trace is the
+current one (a context variable) while the handler runs, so the publishes it causes are
+attributed to it, including the LCD frames the output scheduler sends later.
+A trace ends when its handler returned and its last frame left the client.
+The time of each trace is split into:
+- dispatch: from receiving the message on the MQTT thread to the handler starting on the event loop
+- handler: the handler itself, without its publishes
+- publish <topic class>: handing the messages to the MQTT client
+- output queue: LCD frames waiting in the output scheduler after the handler returned
+Reports give p50/p99 latencies per minigame and the breakdown as folded stacks, e.g.
+"TugOfWar;handler;publish lcd 1234" (microseconds), the input format of flame graph tools.
+"""
+
+# Trace whose handler is running, None outside traced handlers
+currentTrace: ContextVar["Trace | None"] = ContextVar("currentTrace", default=None)
+
+# Finished traces kept for the reports (the oldest are discarded first)
+MAX_TRACES = 100_000
+
+
+class Trace:
+    """
+    Timeline of a single button press, in time.perf_counter() seconds.
+
+    Attributes:
+        id (int): Correlation id
+        label (str): What handled the press (the minigame)
+        received (float): When the message was received
+        started (float): When the handler started
+        finished (float): When the handler returned, None while it runs
+        publishes (dict[str, float]): Time spent publishing, per topic class
+        pending (int): LCD frames waiting in the output scheduler
+        sent (float): When the last frame left the client, None if nothing was sent after the handler
+    """
+
+    __slots__ = ("id", "label", "received", "started", "finished", "publishes", "pending", "sent", "tracer")
+
+    def __init__(self, tracer: "Tracer", id: int, label: str, received: float) -> None:
+        """
+        Initialize a trace whose handler starts now.
+
+        Args:
+            tracer: Tracer the trace reports to when it ends
+            id: Correlation id
+            label: What handles the press
+            received: When the message was received
+
+        Returns:
+            None
+        """
+        self.tracer = tracer
+        self.id = id
+        self.label = label
+        self.received = received
+        self.started = perf_counter()
+        self.finished: float = None
+        self.publishes: dict[str, float] = {}
+        self.pending = 0
+        self.sent: float = None
+
+    def addPublish(self, topic_class: str, seconds: float) -> None:
+        """
+        Adds the time of a publish made by the handler.
+
+        Args:
+            topic_class: Topic class of the message
+            seconds: Time spent in the MQTT client
+
+        Returns:
+            None
+        """
+        self.publishes[topic_class] = self.publishes.get(topic_class, 0) + seconds
+
+    def queueFrame(self) -> None:
+        """
+        Notes an LCD frame of the trace queued in the output scheduler.
+
+        Returns:
+            None
+        """
+        with self.tracer.lock:
+            self.pending += 1
+
+    def frameDone(self, sent: bool) -> None:
+        """
+        Notes that a queued frame of the trace left the output scheduler.
+
+        Args:
+            sent: Whether the frame was published (False when superseded or repeated)
+
+        Returns:
+            None
+        """
+        with self.tracer.lock:
+            self.pending -= 1
+            if sent:
+                self.sent = perf_counter()
+            done = self.pending == 0 and self.finished is not None
+        if done:
+            self.tracer.complete(self)
+
+    def end(self) -> None:
+        """
+        Notes that the handler returned.
+
+        Returns:
+            None
+        """
+        with self.tracer.lock:
+            self.finished = perf_counter()
+            done = self.pending == 0
+        if done:
+            self.tracer.complete(self)
+
+    def breakdown(self) -> dict[tuple[str, ...], float]:
+        """
+        Splits the latency of the trace. The parts add up to the total latency.
+
+        Returns:
+            dict[tuple[str, ...], float]: Seconds of every part, as a stack path under the label
+        """
+        publishing = sum(self.publishes.values())
+        parts = {
+            (self.label, "dispatch"): self.started - self.received,
+            (self.label, "handler"): self.finished - self.started - publishing,
+        }
+        for topic_class, seconds in self.publishes.items():
+            parts[(self.label, "handler", f"publish {topic_class}")] = seconds
+        if self.sent is not None and self.sent > self.finished:
+            parts[(self.label, "output queue")] = self.sent - self.finished
+        return parts
+
+    @property
+    def latency(self) -> float:
+        """
+        Time from receiving the press to the last feedback leaving the client.
+
+        Returns:
+            float: Seconds
+        """
+        return max(self.finished, self.sent or 0) - self.received
+
+
+class Tracer:
+    """
+    Collects the traces of the button presses, when enabled.
+
+    Attributes:
+        enabled (bool): Whether button presses are traced
+        traces (deque[Trace]): Finished traces, at most MAX_TRACES
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        """
+        Initialize the tracer.
+
+        Args:
+            enabled: Whether button presses are traced (default: False)
+
+        Returns:
+            None
+        """
+        self.enabled = enabled
+        self.traces: deque[Trace] = deque(maxlen=MAX_TRACES)
+        self.ids = count(1)
+        self.lock = Lock()
+
+    @contextmanager
+    def trace(self, label: str, received: float):
+        """
+        Traces a handler: the trace is the current one until the handler returns.
+
+        Args:
+            label: What handles the press (the minigame)
+            received: When the message was received, in time.perf_counter() seconds
+
+        Yields:
+            Trace: The trace
+        """
+        trace = Trace(self, next(self.ids), label, received)
+        token = currentTrace.set(trace)
+        try:
+            yield trace
+        finally:
+            currentTrace.reset(token)
+            trace.end()
+
+    def complete(self, trace: Trace) -> None:
+        """
+        Keeps a finished trace for the reports.
+
+        Args:
+            trace: Finished trace
+
+        Returns:
+            None
+        """
+        self.traces.append(trace)
+
+    def report(self) -> str:
+        """
+        Latency percentiles and average breakdown of every label.
+
+        Returns:
+            str: Report, one block per label
+        """
+        byLabel: dict[str, list[Trace]] = defaultdict(list)
+        for trace in list(self.traces):
+            byLabel[trace.label].append(trace)
+
+        lines = []
+        for label, traces in sorted(byLabel.items()):
+            latencies = sorted(trace.latency for trace in traces)
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]
+            lines.append(
+                f"{label}: {len(traces)} presses, p50 {p50 * 1e3:.3f} ms, p99 {p99 * 1e3:.3f} ms, "
+                f"max {latencies[-1] * 1e3:.3f} ms"
+            )
+            parts: dict[tuple[str, ...], float] = defaultdict(float)
+            for trace in traces:
+                for path, seconds in trace.breakdown().items():
+                    parts[path] += seconds
+            total = sum(parts.values()) or 1
+            for path, seconds in sorted(parts.items(), key=lambda item: -item[1]):
+                lines.append(
+                    f"  {' > '.join(path[1:]):<30}{seconds / len(traces) * 1e6:>10.1f} us{seconds / total:>8.1%}"
+                )
+        return "\n".join(lines) if lines else "No traced button presses"
+
+    def folded(self) -> str:
+        """
+        Breakdown of every trace as folded stacks, summed per stack, in microseconds.
+
+        Returns:
+            str: One "label;part;... microseconds" line per stack
+        """
+        stacks: dict[tuple[str, ...], float] = defaultdict(float)
+        for trace in list(self.traces):
+            for path, seconds in trace.breakdown().items():
+                stacks[path] += seconds
+        return "\n".join(f"{';'.join(path)} {round(seconds * 1e6)}" for path, seconds in sorted(stacks.items()))
+
+
+# Tracer of the controller, disabled until the controller or a tool enables it
+tracer = Tracer()
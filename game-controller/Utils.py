@@ -1,9 +1,105 @@
-from Message import LCDMessage, BuzzerMessage
+import json
+from collections import Counter
+from functools import lru_cache
+from time import perf_counter
+from Message import LCDMessage, BuzzerMessage, DEFAULT_CODEC
+from Delivery import DeliveryPolicy, DELIVERY_POLICIES, TURN, LCD_FRAME, LCD_STATE, BUZZER
+from Metrics import publishSeconds
+from Tracing import currentTrace
 from colorama import Fore
 
 # MQTT topic templates for player components
-PLAYERS_LCD_TOPIC = "game/players/{id}/components/lcd"
-PLAYERS_BUZZER_TOPIC = "game/players/{id}/components/buzzer"
+PLAYERS_LCD_TOPIC = "{prefix}/players/{id}/components/lcd"
+PLAYERS_BUZZER_TOPIC = "{prefix}/players/{id}/components/buzzer"
+PLAYERS_TURN_TOPIC = "{prefix}/players/{id}/turn"
+
+# Player ID used in the topics every player base listens to
+BROADCAST_ID = "all"
+
+# Key added to broadcast payloads meant for a subset of players
+ENVELOPE_KEY = b', "players": '
+
+# Messages published per approach, and player messages saved by broadcasting, for the whole process
+publishCounters: Counter[str] = Counter()
+
+# Time spent publishing the messages of every topic class, bound once
+PUBLISH_METRICS = {topic_class: publishSeconds.labels(topic_class) for topic_class in DELIVERY_POLICIES}
+
+# Returned by clients that queue a message instead of publishing it; they time it when it leaves
+QUEUED = object()
+
+# Separator between the table prefix and the player part of every game topic
+PLAYERS_SEGMENT = "/players/"
+
+# Incoming topic components, i.e. what follows "{prefix}/players/{id}/"
+CONNECTION_COMPONENT = "connection"
+BUTTON_COMPONENT = "components/button"
+HALL_SENSOR_COMPONENT = "movement"
+
+
+@lru_cache(maxsize=1024)
+def encodeEnvelope(payload: bytes, player_ids: tuple[int, ...]) -> bytes:
+    """
+    Wrap a message payload for a subset of players, to be published on the broadcast topic.
+    The recipients are added as a "players" list that every base checks for its own ID.
+
+    Args:
+        payload: JSON payload of the message
+        player_ids: IDs of the players that should apply the message
+
+    Returns:
+        bytes: JSON payload with the recipient list
+    """
+    return payload[:-1] + ENVELOPE_KEY + json.dumps(player_ids).encode() + b"}"
+
+
+def decodeEnvelope(payload: bytes) -> tuple[int, ...]:
+    """
+    Read the recipients of a payload wrapped for a subset of players.
+
+    Args:
+        payload: Payload built by encodeEnvelope
+
+    Returns:
+        tuple[int, ...]: IDs of the players that should apply the message
+    """
+    start = payload.rindex(ENVELOPE_KEY) + len(ENVELOPE_KEY)
+    return tuple(json.loads(payload[start:-1]))
+
+
+@lru_cache(maxsize=256)
+def beepMessage(duration_ms: int, frequency: int) -> BuzzerMessage:
+    """
+    Build (once) the buzzer message of a single beep.
+
+    Args:
+        duration_ms: Duration of the beep in milliseconds
+        frequency: Frequency of the beep in Hz
+
+    Returns:
+        BuzzerMessage: Shared, immutable beep message
+    """
+    return BuzzerMessage(tones=[frequency, 0], duration=[duration_ms, 0])
+
+
+@lru_cache(maxsize=4096)
+def parseTopic(topic: str) -> tuple[str, int, str] | None:
+    """
+    Split a player topic into its table prefix, player ID and component.
+    Devices publish on a small, fixed set of topics, so results are cached.
+
+    Args:
+        topic: Topic like "{prefix}/players/{id}/{component}"
+
+    Returns:
+        tuple[str, int, str] | None: (prefix, player ID, component), or None if it is not a player topic
+    """
+    prefix, separator, rest = topic.partition(PLAYERS_SEGMENT)
+    player, _, component = rest.partition("/")
+    if not separator or not player.isdigit():
+        return None
+    return prefix, int(player), component
+
 
 class Utils:
     """
@@ -13,9 +109,23 @@ class Utils:
         client (mqtt.Client): MQTT client for publishing messages
         players (list[Player]): List of active game players
         debug (bool): Whether to print debug messages
+        prefix (str): Topic prefix of the table the players belong to
+        lcdTopics (dict[int, str]): LCD topic of every player, built on first use
+        buzzerTopics (dict[int, str]): Buzzer topic of every player, built on first use
+        turnTopics (dict[int, str]): Turn topic of every player, built on first use
+        playersById (dict[int, Player]): Players indexed by ID, to find the codec of each base
+        broadcast (bool): Whether multi-player output goes to the broadcast topic
+        policies (dict[str, DeliveryPolicy]): QoS and retain of every topic class
+        lcdShown (int): LCD messages shown so far, to tell whether a handler updated the LCDs
     """
 
-    def __init__(self, client, players, debug=True) -> None:
+    # Default for new instances, set once by the controller when every base listens to the broadcast topics
+    broadcast = False
+
+    # Default delivery policies for new instances
+    policies: dict[str, DeliveryPolicy] = DELIVERY_POLICIES
+
+    def __init__(self, client, players, debug=True, prefix="game", broadcast=None, policies=None) -> None:
         """
         Initialize Utils with MQTT client and player list.
 
@@ -23,10 +133,118 @@ class Utils:
             client: MQTT client instance for communication
             players: List of Player objects
             debug: Enable/disable debug output (default: True)
+            prefix: Topic prefix of the table (default: "game")
+            broadcast: Use the broadcast topics (default: Utils.broadcast)
+            policies: Delivery policy of every topic class (default: Utils.policies)
         """
         self.client = client
         self.players = players
         self.debug = debug
+        self.prefix = prefix
+        self.lcdTopics: dict[int, str] = {}
+        self.buzzerTopics: dict[int, str] = {}
+        self.turnTopics: dict[int, str] = {}
+        self.playersById = {player.id: player for player in players}
+        self.lcdShown = 0
+        if broadcast is not None:
+            self.broadcast = broadcast
+        if policies is not None:
+            self.policies = policies
+
+    def publish(self, topic: str, payload, topic_class: str, policy: DeliveryPolicy) -> None:
+        """
+        Publish a payload with the MQTT client, timing the call in the metrics and in the current trace.
+        Messages the client only queues are left out of the metrics, the client times them when they leave.
+
+        Args:
+            topic: Topic to publish on
+            payload: Message payload
+            topic_class: Topic class of the message, see Delivery
+            policy: Delivery policy of the message
+        """
+        start = perf_counter()
+        queued = self.client.publish(topic, payload, policy.qos, policy.retain) is QUEUED
+        elapsed = perf_counter() - start
+        if not queued:
+            PUBLISH_METRICS[topic_class].observe(elapsed)
+        trace = currentTrace.get()
+        if trace is not None:
+            trace.addPublish(topic_class, elapsed)
+
+    def publishToPlayer(self, topics: dict[int, str], template: str, player_id, message, topic_class: str) -> None:
+        """
+        Publish a message to a single player, encoded with the codec of its base.
+
+        Args:
+            topics: Cache of the player topics of the component
+            template: Topic template of the component
+            player_id: ID of the recipient
+            message: LCDMessage or BuzzerMessage to publish
+            topic_class: Topic class of the message, which sets its delivery policy
+        """
+        topic = topics.get(player_id)
+        if topic is None:
+            topic = topics[player_id] = template.format(prefix=self.prefix, id=player_id)
+        self.publish(topic, message.encode(self.codec(player_id)), topic_class, self.policies[topic_class])
+
+    def publishToPlayers(
+        self, topics: dict[int, str], template: str, player_ids: list[int], message, topic_class: str
+    ) -> None:
+        """
+        Publish a message to several players, choosing the cheapest approach for the recipients:
+        one message per player, one message on the broadcast topic, or one broadcast
+        envelope listing the recipients.
+        Broadcasting needs every recipient to use the same codec, and envelopes are JSON only.
+        Retained messages are always sent per player: the broker keeps a single one per topic, and a
+        retained broadcast would outlive the per-player messages sent after it.
+
+        Args:
+            topics: Cache of the player topics of the component
+            template: Topic template of the component
+            player_ids: IDs of the recipients
+            message: LCDMessage or BuzzerMessage to publish
+            topic_class: Topic class of the message, which sets its delivery policy
+        """
+        policy = self.policies[topic_class]
+        codecs = {self.codec(player_id) for player_id in player_ids} if self.broadcast else ()
+        everyone = len(player_ids) == len(self.players)
+        if (
+            len(player_ids) < 2
+            or len(codecs) != 1
+            or policy.retain
+            or not (everyone or DEFAULT_CODEC in codecs)
+        ):
+            for player_id in player_ids:
+                self.publishToPlayer(topics, template, player_id, message, topic_class)
+            publishCounters["unicast"] += len(player_ids)
+            if self.debug:
+                self.printDebug(f"(Players {player_ids} {template.rsplit('/', 1)[1]}) {message}")
+            return
+
+        topic = template.format(prefix=self.prefix, id=BROADCAST_ID)
+        if everyone:
+            self.publish(topic, message.encode(codecs.pop()), topic_class, policy)
+            publishCounters["broadcast"] += 1
+            publishCounters["saved_by_broadcast"] += len(player_ids) - 1
+        else:
+            self.publish(topic, encodeEnvelope(message.payload, tuple(player_ids)), topic_class, policy)
+            publishCounters["envelope"] += 1
+            publishCounters["saved_by_envelope"] += len(player_ids) - 1
+        if self.debug:
+            self.printDebug(f"(Players {player_ids} {template.rsplit('/', 1)[1]}) {message}")
+
+    def codec(self, player_id) -> str:
+        """
+        Get the codec the base of a player announced.
+
+        Args:
+            player_id: ID of the player
+
+        Returns:
+            str: Codec name
+        """
+        player = self.playersById.get(player_id)
+        return DEFAULT_CODEC if player is None else player.codec
 
     def printDebug(self, message: str) -> None:
         """
@@ -38,40 +256,44 @@ class Utils:
         if self.debug:
             print(Fore.YELLOW + f"DEBUG: {message}" + Fore.RESET)
 
-    def showInLCD(self, player_id, message: LCDMessage) -> None:
+    def showInLCD(self, player_id, message: LCDMessage, state: bool = False) -> None:
         """
         Display a message on a specific player's LCD screen.
 
         Args:
             player_id: ID of the target player
             message: LCDMessage object containing display content
+            state: Whether the frame shows what the game waits for, so it is retained (default: False)
         """
-        topic = PLAYERS_LCD_TOPIC.format(id=player_id)
-        payload = message.toJson()
-        self.client.publish(topic, payload)
-        self.printDebug(f"(Player {player_id} LCD) {message}")
+        self.lcdShown += 1
+        self.publishToPlayer(self.lcdTopics, PLAYERS_LCD_TOPIC, player_id, message, LCD_STATE if state else LCD_FRAME)
+        if self.debug:
+            self.printDebug(f"(Player {player_id} LCD) {message}")
 
-    def showInOtherLCD(self, player_id, message: LCDMessage) -> None:
+    def showInOtherLCD(self, player_id, message: LCDMessage, state: bool = False) -> None:
         """
         Display a message on all LCD screens except the specified player's.
 
         Args:
             player_id: ID of the player to exclude
             message: LCDMessage object containing display content
+            state: Whether the frame shows what the game waits for, so it is retained (default: False)
         """
-        for other in self.players:
-            if other.id != player_id:
-                self.showInLCD(other.id, message)
+        others = [other.id for other in self.players if other.id != player_id]
+        self.lcdShown += 1
+        self.publishToPlayers(self.lcdTopics, PLAYERS_LCD_TOPIC, others, message, LCD_STATE if state else LCD_FRAME)
 
-    def showInAllLCD(self, message: LCDMessage) -> None:
+    def showInAllLCD(self, message: LCDMessage, state: bool = False) -> None:
         """
         Display a message on all players' LCD screens.
 
         Args:
             message: LCDMessage object containing display content
+            state: Whether the frame shows what the game waits for, so it is retained (default: False)
         """
-        for player in self.players:
-            self.showInLCD(player.id, message)
+        player_ids = [player.id for player in self.players]
+        self.lcdShown += 1
+        self.publishToPlayers(self.lcdTopics, PLAYERS_LCD_TOPIC, player_ids, message, LCD_STATE if state else LCD_FRAME)
 
     def playInBuzzer(self, player_id, message: BuzzerMessage) -> None:
         """
@@ -81,10 +303,9 @@ class Utils:
             player_id: ID of the target player
             message: BuzzerMessage object containing sound parameters
         """
-        topic = PLAYERS_BUZZER_TOPIC.format(id=player_id)
-        payload = message.toJson()
-        self.client.publish(topic, payload)
-        self.printDebug(f"(Player {player_id} Buzzer) {message}")
+        self.publishToPlayer(self.buzzerTopics, PLAYERS_BUZZER_TOPIC, player_id, message, BUZZER)
+        if self.debug:
+            self.printDebug(f"(Player {player_id} Buzzer) {message}")
 
     def playInOtherBuzzer(self, player_id, message: BuzzerMessage) -> None:
         """
@@ -94,9 +315,8 @@ class Utils:
             player_id: ID of the player to exclude
             message: BuzzerMessage object containing sound parameters
         """
-        for other in self.players:
-            if other.id != player_id:
-                self.playInBuzzer(other.id, message)
+        others = [other.id for other in self.players if other.id != player_id]
+        self.publishToPlayers(self.buzzerTopics, PLAYERS_BUZZER_TOPIC, others, message, BUZZER)
 
     def playInAllBuzzer(self, message: BuzzerMessage) -> None:
         """
@@ -105,8 +325,21 @@ class Utils:
         Args:
             message: BuzzerMessage object containing sound parameters
         """
-        for player in self.players:
-            self.playInBuzzer(player.id, message)
+        player_ids = [player.id for player in self.players]
+        self.publishToPlayers(self.buzzerTopics, PLAYERS_BUZZER_TOPIC, player_ids, message, BUZZER)
+
+    def setTurn(self, player_id, active: bool) -> None:
+        """
+        Tell a player's base whether it is its turn.
+
+        Args:
+            player_id: ID of the target player
+            active: Whether the turn of the player starts (True) or ends (False)
+        """
+        topic = self.turnTopics.get(player_id)
+        if topic is None:
+            topic = self.turnTopics[player_id] = PLAYERS_TURN_TOPIC.format(prefix=self.prefix, id=player_id)
+        self.publish(topic, int(active), TURN, self.policies[TURN])
 
     def beepPlayer(self, player_id, duration_ms=100, frequency=1000):
         """
@@ -117,7 +350,7 @@ class Utils:
             duration_ms: Duration of the beep in milliseconds (default: 100)
             frequency: Frequency of the beep in Hz (default: 1000)
         """
-        message = BuzzerMessage(tones=[frequency, 0], duration=[duration_ms, 0])
+        message = beepMessage(duration_ms, frequency)
         self.playInBuzzer(player_id, message)
         self.printDebug(f"Player {player_id} is beeping at {frequency}Hz for {duration_ms}ms")
 
@@ -130,10 +363,7 @@ class Utils:
             duration_ms: Duration of the beep in milliseconds (default: 100)
             frequency: Frequency of the beep in Hz (default: 1000)
         """
-        message = BuzzerMessage(tones=[frequency, 0], duration=[duration_ms, 0])
-        for other in self.players:
-            if other.id != player_id:
-                self.playInBuzzer(other.id, message)
+        self.playInOtherBuzzer(player_id, beepMessage(duration_ms, frequency))
 
     def beepAllPlayers(self, duration_ms=100, frequency=1000):
         """
@@ -143,6 +373,4 @@ class Utils:
             duration_ms: Duration of the beep in milliseconds (default: 100)
             frequency: Frequency of the beep in Hz (default: 1000)
         """
-        message = BuzzerMessage(tones=[frequency, 0], duration=[duration_ms, 0])
-        for player in self.players:
-            self.playInBuzzer(player.id, message)
+        self.playInAllBuzzer(beepMessage(duration_ms, frequency))
@@ -0,0 +1,11 @@
+class OfflineClient:
+    """Minimal MQTT client replacement that drops everything it is asked to send."""
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        pass
+
+    def subscribe(self, topic, qos=0):
+        pass
+
+    def unsubscribe(self, topic):
+        pass
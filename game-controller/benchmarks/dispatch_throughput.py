@@ -0,0 +1,104 @@
+"""
+Benchmark: messages per second through the MQTT message router.
+
+Feeds button and sensor messages through SessionRegistry.on_message into
+sessions sitting in different states, draining their inboxes as the event loop
+would, and reports the routed messages/second.
+
+Usage:
+    python benchmarks/dispatch_throughput.py [--messages 200000] [--sessions 20]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GameSession import GameSession  # noqa: E402
+from GameState import GameState  # noqa: E402
+from SessionRegistry import SessionRegistry  # noqa: E402
+from minigames import TugOfWar  # noqa: E402
+from OfflineClient import OfflineClient  # noqa: E402
+
+
+# Messages routed between two drains of the inboxes
+DRAIN_EVERY = 256
+
+
+class Message:
+    """Stand-in for paho's MQTTMessage with just the fields the router reads."""
+
+    def __init__(self, topic: str, payload: bytes) -> None:
+        self.topic = topic
+        self.payload = payload
+
+
+def createRegistry(sessions: int, state: GameState) -> SessionRegistry:
+    client = OfflineClient()
+    registry = SessionRegistry()
+    for table in range(sessions):
+        session = GameSession(client, f"game/table-{table}")
+        session.setGameState(GameState.PLAYING)
+        if state == GameState.MINIGAME:
+            minigame = TugOfWar(session.players, client, False, session.prefix)
+            minigame.acceptInput()
+            session.setGameState(state, minigame)
+        else:
+            session.setGameState(state)
+        registry.register(session)
+    return registry
+
+
+def measure(registry: SessionRegistry, messages: list[Message], count: int) -> float:
+    on_message = registry.on_message
+    sessions = list(registry.sessions.values())
+    start = time.perf_counter()
+    for i in range(count):
+        on_message(None, None, messages[i % len(messages)])
+        if i % DRAIN_EVERY == DRAIN_EVERY - 1:
+            for session in sessions:
+                session.inbox.drain(session.handleInput, DRAIN_EVERY)
+    for session in sessions:
+        session.inbox.drain(session.handleInput, DRAIN_EVERY)
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    tables = [f"game/table-{table}" for table in range(args.sessions)]
+    scenarios = {
+        "tug of war mashing": (
+            GameState.MINIGAME,
+            [Message(f"{table}/players/{id}/components/button", b'{"type": "short"}') for table in tables for id in (1, 2)],
+        ),
+        "dice roll": (
+            GameState.ROLLING_DICE,
+            [Message(f"{table}/players/{id}/components/button", b'{"type": "short"}') for table in tables for id in (2,)],
+        ),
+        "hall sensor": (
+            GameState.MOVING,
+            [Message(f"{table}/players/{id}/movement", b"1") for table in tables for id in (2,)],
+        ),
+        "ignored component": (
+            GameState.ROLLING_DICE,
+            [Message(f"{table}/players/{id}/movement", b"1") for table in tables for id in (1, 2)],
+        ),
+    }
+
+    print(f"sessions: {args.sessions}, messages per scenario: {args.messages}")
+    for name, (state, messages) in scenarios.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            registry = createRegistry(args.sessions, state)
+            rate = measure(registry, messages, args.messages)
+        print(f"{name:<20}{rate:>14,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
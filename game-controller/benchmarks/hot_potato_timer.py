@@ -0,0 +1,98 @@
+"""
+Benchmark: cost of the Hot Potato warning beeps, polling vs deadline scheduling.
+
+Runs the timer of N concurrent Hot Potato rounds on a scaled clock, first with the
+previous 100 ms polling loop and then with the deadline scheduler, and reports the
+threads alive, the clock wakeups, the beeps sent and the CPU time burnt per round.
+
+Usage:
+    python benchmarks/hot_potato_timer.py [--rounds 50] [--scale 20] [--duration 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Clock import ScaledClock  # noqa: E402
+from Player import Player  # noqa: E402
+from minigames import HotPotato  # noqa: E402
+from minigames.HotPotato import WARNING_BEEP  # noqa: E402
+from OfflineClient import OfflineClient  # noqa: E402
+
+
+class CountingClock(ScaledClock):
+    def __init__(self, scale: float) -> None:
+        super().__init__(scale)
+        self.wakeups = 0
+
+    async def sleep(self, seconds: float) -> None:
+        self.wakeups += 1
+        await super().sleep(seconds)
+
+
+class CountingClient(OfflineClient):
+    def __init__(self) -> None:
+        self.published = 0
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        self.published += 1
+
+
+class PollingHotPotato(HotPotato):
+    """The previous timer: a beep task waking every 100 ms, plus a sleep until the explosion."""
+
+    async def scheduleBeep(self):
+        last_beep_time = 0
+        remaining_time = self.timer_duration
+        while remaining_time > 0:
+            remaining_time = max(0, self.timer_duration - (self.clock.time() - self.start_time))
+            beep_interval = 1.5 * remaining_time / self.timer_duration + 0.1
+            if remaining_time > 0 and self.clock.time() - last_beep_time >= beep_interval:
+                self.utils.playInAllBuzzer(WARNING_BEEP)
+                last_beep_time = self.clock.time()
+            await self.clock.sleep(0.1)
+
+    async def runTimer(self):
+        beep_task = asyncio.create_task(self.scheduleBeep())
+        await self.clock.sleep(self.timer_duration)
+        beep_task.cancel()
+
+
+async def measure(minigame: type[HotPotato], rounds: int, scale: float, duration: int) -> tuple[int, float, float, float]:
+    clock = CountingClock(scale)
+    client = CountingClient()
+    games = []
+    for _ in range(rounds):
+        game = minigame([Player(1), Player(2)], client, False, clock=clock)
+        game.timer_duration = duration
+        game.start_time = clock.time()
+        games.append(game)
+    cpu = time.process_time()
+    timers = [asyncio.create_task(game.runTimer()) for game in games]
+    await asyncio.sleep(0)
+    threads = threading.active_count()
+    await asyncio.gather(*timers)
+    cpu = time.process_time() - cpu
+    return threads, clock.wakeups / rounds, client.published / rounds, cpu / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--scale", type=float, default=20)
+    parser.add_argument("--duration", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.rounds} concurrent rounds of {args.duration}s, clock x{args.scale:g}")
+    print(f"{'timer':>10}{'threads':>10}{'wakeups':>10}{'beeps':>10}{'CPU/round (ms)':>16}")
+    for name, minigame in (("polling", PollingHotPotato), ("deadline", HotPotato)):
+        threads, wakeups, beeps, cpu = asyncio.run(measure(minigame, args.rounds, args.scale, args.duration))
+        print(f"{name:>10}{threads:>10}{wakeups:>10.0f}{beeps:>10.0f}{cpu * 1000:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: CPU time and threads used by N idle games with each session engine.
+
+Starts N sessions waiting for players on a single (offline) MQTT client, first all
+on one asyncio event loop and then with one thread per session, and reports the
+threads alive and the CPU time burnt while the games sit idle.
+
+Usage:
+    python benchmarks/idle_sessions.py [--sessions 50] [--seconds 2]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GameSession import GameSession  # noqa: E402
+from SessionRegistry import SessionRegistry  # noqa: E402
+from OfflineClient import OfflineClient  # noqa: E402
+
+
+def createRegistry(sessions: int) -> SessionRegistry:
+    registry = SessionRegistry()
+    client = OfflineClient()
+    for table in range(sessions):
+        registry.register(GameSession(client, f"game/table-{table}"))
+    return registry
+
+
+def measureIdle(seconds: float) -> tuple[float, int]:
+    cpu = time.process_time()
+    time.sleep(seconds)
+    return time.process_time() - cpu, threading.active_count()
+
+
+async def measureAsyncio(sessions: int, seconds: float) -> tuple[float, int]:
+    registry = createRegistry(sessions)
+    task = asyncio.create_task(registry.runAll())
+    await asyncio.sleep(0.5)
+    cpu = time.process_time()
+    await asyncio.sleep(seconds)
+    result = time.process_time() - cpu, threading.active_count()
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+    return result
+
+
+def measureThreads(sessions: int, seconds: float) -> tuple[float, int]:
+    registry = createRegistry(sessions)
+    registry.startAll()
+    time.sleep(0.5)
+    return measureIdle(seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=2)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        base_threads = threading.active_count()
+        async_cpu, async_threads = asyncio.run(measureAsyncio(args.sessions, args.seconds))
+        # Thread sessions never return while idle, so they run last and die with the process
+        thread_cpu, thread_threads = measureThreads(args.sessions, args.seconds)
+
+    print(f"sessions: {args.sessions}, idle window: {args.seconds:.1f} s")
+    print(f"{'engine':<10}{'threads':>10}{'cpu (ms)':>12}")
+    print(f"{'asyncio':<10}{async_threads - base_threads:>10}{async_cpu * 1000:>12.2f}")
+    print(f"{'threads':<10}{thread_threads - base_threads:>10}{thread_cpu * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: time the MQTT network thread spends per incoming message.
+
+A feeder thread hands bursts of button presses to a session running on an event loop,
+once with one call_soon_threadsafe per message (the path before the inbox) and once
+through the session inbox, and reports the feeder time per message, the time to handle
+every burst and the presses dropped when a player spams the button.
+
+Usage:
+    python benchmarks/inbox_ingress.py [--messages 100000] [--burst 200] [--players 4]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GameSession import GameSession  # noqa: E402
+from GameState import GameState, Phase  # noqa: E402
+from Inbox import Inbox  # noqa: E402
+from Utils import BUTTON_COMPONENT  # noqa: E402
+from OfflineClient import OfflineClient  # noqa: E402
+
+
+class Press:
+    """Stand-in for paho's MQTTMessage carrying a button press."""
+
+    def __init__(self, payload: bytes) -> None:
+        self.topic = ""
+        self.payload = payload
+
+
+PRESS = Press(b'{"type": "short"}')
+
+
+class DirectSession(GameSession):
+    """Session waking its loop for every message, as before the inbox."""
+
+    def onMessage(self, player_id, component, message) -> None:
+        self.loop.call_soon_threadsafe(self.handleMessage, player_id, component, message, time.perf_counter())
+
+
+def measure(session: GameSession, messages: int, burst: int, players: int) -> tuple[float, float, int]:
+    handled = 0
+
+    def handle(event) -> None:
+        nonlocal handled
+        handled += 1
+
+    session.phase = Phase(GameState.PLAYING, {BUTTON_COMPONENT: handle})
+    feeding = 0.0
+
+    async def run() -> float:
+        nonlocal feeding
+        session.loop = asyncio.get_running_loop()
+
+        def feed() -> None:
+            nonlocal feeding
+            for start in range(0, messages, burst):
+                began = time.perf_counter()
+                for i in range(start, min(start + burst, messages)):
+                    session.onMessage(i % players + 1, BUTTON_COMPONENT, PRESS)
+                feeding += time.perf_counter() - began
+                time.sleep(0.0005)
+
+        began = time.perf_counter()
+        feeder = threading.Thread(target=feed)
+        feeder.start()
+        while feeder.is_alive() or session.inbox.depth or handled + session.inbox.stats["dropped"] < messages:
+            await asyncio.sleep(0.001)
+        return time.perf_counter() - began
+
+    total = asyncio.run(run())
+    return feeding / messages, total, messages - handled
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--burst", type=int, default=200)
+    parser.add_argument("--players", type=int, default=4)
+    args = parser.parse_args()
+
+    client = OfflineClient()
+    sessions = (DirectSession(client, num_players=args.players, quiet=True),
+                GameSession(client, num_players=args.players, quiet=True))
+    direct, inbox = (measure(session, args.messages, args.burst, args.players) for session in sessions)
+    spam = measure(GameSession(client, quiet=True, inbox=Inbox(8)), args.messages, args.burst, 1)
+
+    print(f"messages: {args.messages} in bursts of {args.burst}, {args.players} players")
+    for name, (perMessage, total, dropped) in (
+        ("call_soon_threadsafe", direct),
+        ("inbox", inbox),
+        ("inbox, 1 player, 8 kept", spam),
+    ):
+        print(f"{name:24} network thread {perMessage * 1e9:6.0f} ns/message, "
+              f"handled in {total:.2f}s, dropped {dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: decoding button presses while players mash their buttons.
+
+Decodes a stream of short and long presses, with a few presses in an unusual JSON shape
+and a few malformed payloads, once with json.loads as every handler used to do and once
+with InputEvent.decodeInput, and reports presses decoded per second. Then mashes the
+Tug of War buttons through GameSession.handleMessage for the end-to-end rate.
+
+Usage:
+    python benchmarks/input_decoding.py [--presses 500000] [--unusual 0.01] [--malformed 0.01]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GameSession import GameSession  # noqa: E402
+from GameState import GameState  # noqa: E402
+from InputEvent import decodeInput  # noqa: E402
+from Utils import BUTTON_COMPONENT  # noqa: E402
+from minigames import TugOfWar  # noqa: E402
+from OfflineClient import OfflineClient  # noqa: E402
+
+
+class Press:
+    """Stand-in for paho's MQTTMessage carrying a button press."""
+
+    def __init__(self, payload: bytes) -> None:
+        self.topic = ""
+        self.payload = payload
+
+
+def presses(count: int, unusual: float, malformed: float, rng: random.Random) -> list[bytes]:
+    stream = []
+    for _ in range(count):
+        press_type = rng.choice(("short", "long"))
+        draw = rng.random()
+        if draw < malformed:
+            stream.append(rng.choice((b"", b"{", b'{"type": "double"}', b"\xff\xfe")))
+        elif draw < malformed + unusual:
+            stream.append(json.dumps({"type": press_type, "ms": rng.randint(10, 900)}).encode())
+        else:
+            stream.append(rng.choice((json.dumps({"type": press_type}), f'{{"type":"{press_type}"}}')).encode())
+    return stream
+
+
+def decodeWithJson(stream: list[bytes]) -> int:
+    decoded = 0
+    for payload in stream:
+        try:
+            json.loads(payload.decode("utf-8"))["type"]
+            decoded += 1
+        except (ValueError, KeyError):
+            pass
+    return decoded
+
+
+def decodeWithInputEvent(stream: list[bytes]) -> int:
+    decoded = 0
+    for payload in stream:
+        if decodeInput(1, BUTTON_COMPONENT, payload) is not None:
+            decoded += 1
+    return decoded
+
+
+def mashTugOfWar(stream: list[bytes], players: int) -> float:
+    session = GameSession(OfflineClient(), num_players=players, quiet=True)
+    minigame = TugOfWar(session.players, session.client, False, session.prefix)
+    minigame.acceptInput()
+    session.setGameState(GameState.PLAYING)
+    session.setGameState(GameState.MINIGAME, minigame)
+    messages = [Press(payload) for payload in stream]
+    received = time.perf_counter()
+
+    async def mash() -> float:
+        start = time.perf_counter()
+        for i, message in enumerate(messages):
+            minigame.hits = 0
+            session.handleMessage(i % players + 1, BUTTON_COMPONENT, message, received)
+        return time.perf_counter() - start
+
+    return asyncio.run(mash())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--presses", type=int, default=500_000)
+    parser.add_argument("--unusual", type=float, default=0.01)
+    parser.add_argument("--malformed", type=float, default=0.01)
+    args = parser.parse_args()
+
+    stream = presses(args.presses, args.unusual, args.malformed, random.Random(0))
+    print(f"presses: {args.presses} ({args.unusual:.0%} unusual shape, {args.malformed:.0%} malformed)")
+    for name, decode in (("json.loads", decodeWithJson), ("decodeInput", decodeWithInputEvent)):
+        start = time.perf_counter()
+        decoded = decode(stream)
+        elapsed = time.perf_counter() - start
+        print(f"{name:12} {args.presses / elapsed:12,.0f} presses/s, {decoded} valid")
+    elapsed = mashTugOfWar(stream, 4)
+    print(f"{'tug of war':12} {args.presses / elapsed:12,.0f} presses/s end to end")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: cost of the game journal.
+
+Plays simulated games with a journal and reports the time spent writing it per turn
+(one fsync per turn), then measures how long recovering a long game takes when replaying
+the whole journal and when starting from the latest snapshot.
+
+Usage:
+    python benchmarks/journal_cost.py [--games 10] [--players 4] [--win-points 100]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from random import Random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GameSession import GameSession  # noqa: E402
+from Journal import SNAPSHOT_EVERY, Journal  # noqa: E402
+from Simulation import Simulation  # noqa: E402
+
+
+class TimedJournal(Journal):
+    def __init__(self, path: str, snapshot_every: int) -> None:
+        super().__init__(path, snapshot_every)
+        self.times: list[float] = []
+
+    def commit(self, snapshot=None) -> None:
+        start = time.perf_counter()
+        super().commit(snapshot)
+        self.times.append(time.perf_counter() - start)
+
+
+class JournaledSimulation(Simulation):
+    def __init__(self, directory: str, snapshot_every: int, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.journals: list[TimedJournal] = []
+
+    def createSession(self, seed, clock, client) -> GameSession:
+        journal = TimedJournal(os.path.join(self.directory, f"{seed}.journal"), self.snapshot_every)
+        self.journals.append(journal)
+        return GameSession(
+            client, num_players=self.num_players, win_points=self.win_points, debug=self.debug,
+            clock=clock, rng=Random(seed), quiet=True, journal=journal,
+        )
+
+
+def recoveryTime(path: str, players: int, repeat: int = 20) -> tuple[float, int]:
+    session = GameSession(None, num_players=players, quiet=True, journal=Journal(path))
+    start = time.perf_counter()
+    for _ in range(repeat):
+        state, events = session.journal.recover()
+        if state is not None:
+            session.restoreState(state)
+        for event in events:
+            session.applyEvent(event)
+    session.journal.close()
+    return (time.perf_counter() - start) / repeat, len(events)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--win-points", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{args.games} games, {args.players} players, {args.win_points} points to win")
+    print(f"{'snapshots':>12}{'turns':>8}{'bytes/turn':>12}{'commit p50 (ms)':>17}{'p95 (ms)':>10}"
+          f"{'replayed':>10}{'recovery (ms)':>15}")
+    for name, snapshot_every in (("none", 10**9), (f"every {SNAPSHOT_EVERY}", SNAPSHOT_EVERY)):
+        with tempfile.TemporaryDirectory() as directory:
+            simulation = JournaledSimulation(directory, snapshot_every, args.players, args.win_points)
+            asyncio.run(simulation.playMany(range(args.games)))
+            times = [t for journal in simulation.journals for t in journal.times]
+            written = sum(journal.stats["bytes"] for journal in simulation.journals)
+            # Recover the longest game, marked as unfinished by dropping its game over event
+            longest = max(simulation.journals, key=lambda journal: journal.turns)
+            for journal in simulation.journals:
+                journal.close()
+            with open(longest.path, "rb+") as file:
+                lines = file.readlines()
+                file.seek(0)
+                file.truncate()
+                file.writelines(line for line in lines if b'"game_over"' not in line)
+            recovery, replayed = recoveryTime(longest.path, args.players)
+        print(
+            f"{name:>12}{len(times):>8}{written / len(times):>12.0f}{statistics.median(times) * 1e3:>17.3f}"
+            f"{statistics.quantiles(times, n=20)[-1] * 1e3:>10.3f}{replayed:>10}{recovery * 1e3:>15.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: end-of-turn scoring cost as the roster grows.
+
+Every turn one player gains or loses points, then the winner is checked and the stats
+lines are built. Compares the full scans the session used to do (filtering every player
+against the winning points and a line for every player) with the Scoreboard (one move
+in the sorted ranking, winners from the contenders set and lines for the changed ranks),
+timing the winner check alone and with the stats lines. A move shifts every rank between
+the old and the new one, so the stats lines still grow with crowded scores.
+
+Usage:
+    python benchmarks/leaderboard_scaling.py [--turns 20000] [--players 16 256 4096 65536]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Player import Player  # noqa: E402
+from Roster import Roster  # noqa: E402
+from Scoreboard import Scoreboard  # noqa: E402
+
+# High enough that nobody wins during the benchmark, so every turn checks for a winner
+WIN_POINTS = 10**9
+
+
+def changes(players: int, turns: int) -> list[tuple[int, int]]:
+    rng = random.Random(0)
+    return [(rng.randrange(players), rng.choice((-5, -2, 5, 8, 10))) for _ in range(turns)]
+
+
+def fullScans(roster: Roster, turns: list[tuple[int, int]], lines: bool) -> float:
+    start = time.perf_counter()
+    for seat, points in turns:
+        player = roster[seat]
+        if points > 0:
+            player.gainPoints(points)
+        else:
+            player.losePoints(-points)
+        possible_winners = list(filter(lambda player: player.points >= WIN_POINTS, roster))
+        if possible_winners:
+            max(player.points for player in possible_winners)
+        if lines:
+            [f"P{player.id}: {player.points} points" for player in roster]
+    return (time.perf_counter() - start) / len(turns)
+
+
+def scoreboard(roster: Roster, turns: list[tuple[int, int]], lines: bool) -> float:
+    board = Scoreboard(roster, WIN_POINTS)
+    board.takeChanges()
+    start = time.perf_counter()
+    for seat, points in turns:
+        player = roster[seat]
+        if points > 0:
+            board.gain(player, points)
+        else:
+            board.lose(player, -points)
+        board.winners()
+        if lines:
+            [f"{rank + 1}. P{player.id}: {player.points} pts" for rank, player in board.takeChanges()]
+    return (time.perf_counter() - start) / len(turns)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20_000)
+    parser.add_argument("--players", type=int, nargs="+", default=[16, 256, 4096, 65536])
+    args = parser.parse_args()
+
+    print(f"{'':>8} {'winner check (us)':>36} {'with stats lines (us)':>36}")
+    print(f"{'players':>8}" + f"{'full scans':>14}{'scoreboard':>14}{'speedup':>8}" * 2)
+    for players in args.players:
+        turns = changes(players, max(100, args.turns * 16 // players))
+        row = f"{players:>8}"
+        for lines in (False, True):
+            scans = fullScans(Roster(Player(i) for i in range(1, players + 1)), turns, lines)
+            board = scoreboard(Roster(Player(i) for i in range(1, players + 1)), turns, lines)
+            row += f"{scans * 1e6:>14.2f}{board * 1e6:>14.2f}{scans / board:>7.1f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
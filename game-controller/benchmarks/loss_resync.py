@@ -0,0 +1,167 @@
+"""
+Loss injection: how long player bases stay out of sync after losing their connection.
+
+Plays simulated games against an in-memory broker stand-in whose player bases randomly
+lose their connection. A network blip keeps the base session, so QoS 1 messages are queued
+and delivered on reconnect. A reboot loses the session and the display, so only retained
+messages come back on resubscribe. Every message sent while a base is offline is lost,
+unless it is QoS 1 and the session survives.
+
+A base is in sync when its LCD and turn topics hold the last payload the controller sent
+them. The resync time is the time from reconnecting until the base is back in sync.
+The harness compares the best-effort policy (QoS 0, nothing retained) with the delivery
+policies of the controller.
+
+Usage:
+    python benchmarks/loss_resync.py [--games 20] [--players 4] [--mtbf 60]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+from random import Random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Clock import VirtualClock  # noqa: E402
+from Delivery import BEST_EFFORT_POLICIES, DELIVERY_POLICIES  # noqa: E402
+from Simulation import FakeMqttClient, Simulation  # noqa: E402
+from Utils import Utils, PLAYERS_LCD_TOPIC, PLAYERS_TURN_TOPIC  # noqa: E402
+
+# Seconds a base stays offline after losing its connection
+OFFLINE_TIME = (1.0, 5.0)
+
+
+class Base:
+    """A player base: its subscribed topics, what it shows and whether it is online."""
+
+    def __init__(self, topics: list[str]) -> None:
+        self.topics = topics
+        self.state: dict[str, bytes] = {}
+        self.online = True
+        self.queued: list[tuple[str, bytes]] = []
+        self.outOfSyncSince: float = None
+        self.reconnectedAt: float = None
+        self.reconnectKind: str = None
+
+
+class LossyBroker(FakeMqttClient):
+    """Broker stand-in delivering the controller output to bases that randomly go offline."""
+
+    def __init__(self, clock: VirtualClock, rng: Random, players: int, prefix: str, mtbf: float) -> None:
+        super().__init__()
+        self.clock = clock
+        self.rng = rng
+        self.mtbf = mtbf
+        self.retained: dict[str, bytes] = {}
+        self.sent: dict[str, bytes] = {}
+        self.bases = [
+            Base([PLAYERS_LCD_TOPIC.format(prefix=prefix, id=i), PLAYERS_TURN_TOPIC.format(prefix=prefix, id=i)])
+            for i in range(1, players + 1)
+        ]
+        self.subscribers = {topic: base for base in self.bases for topic in base.topics}
+        self.resync: dict[str, list[float]] = {"blip": [], "reboot": []}
+        self.outOfSync = 0.0
+        self.tasks: list[asyncio.Task] = []
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        super().publish(topic, payload, qos, retain)
+        payload = payload if isinstance(payload, bytes) else str(payload).encode()
+        if retain:
+            self.retained[topic] = payload
+        base = self.subscribers.get(topic)
+        if base is None:
+            return
+        self.sent[topic] = payload
+        if base.online:
+            base.state[topic] = payload
+        elif qos and base.reconnectKind == "blip":
+            base.queued.append((topic, payload))
+        self.check(base)
+
+    def start(self) -> None:
+        self.tasks = [asyncio.create_task(self.disconnect(base)) for base in self.bases]
+
+    def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        for base in self.bases:
+            if base.outOfSyncSince is not None:
+                self.outOfSync += self.clock.time() - base.outOfSyncSince
+
+    async def disconnect(self, base: Base) -> None:
+        while True:
+            await self.clock.sleep(self.rng.expovariate(1 / self.mtbf))
+            base.online = False
+            base.reconnectKind = self.rng.choice(("blip", "reboot"))
+            if base.reconnectKind == "reboot":
+                base.state.clear()
+            self.check(base)
+            await self.clock.sleep(self.rng.uniform(*OFFLINE_TIME))
+            base.online = True
+            base.reconnectedAt = self.clock.time()
+            if base.reconnectKind == "blip":
+                for topic, payload in base.queued:
+                    base.state[topic] = payload
+                base.queued.clear()
+            else:
+                for topic in base.topics:
+                    if topic in self.retained:
+                        base.state[topic] = self.retained[topic]
+            self.check(base)
+
+    def check(self, base: Base) -> None:
+        now = self.clock.time()
+        synced = all(base.state.get(topic) == self.sent.get(topic) for topic in base.topics)
+        if not synced and base.outOfSyncSince is None:
+            base.outOfSyncSince = now
+        elif synced and base.outOfSyncSince is not None:
+            self.outOfSync += now - base.outOfSyncSince
+            base.outOfSyncSince = None
+        if synced and base.online and base.reconnectedAt is not None:
+            self.resync[base.reconnectKind].append(now - base.reconnectedAt)
+            base.reconnectedAt = None
+
+
+async def measure(policies, games: int, players: int, mtbf: float) -> tuple[dict[str, list[float]], float]:
+    Utils.policies = policies
+    simulation = Simulation(players)
+    resync: dict[str, list[float]] = {"blip": [], "reboot": []}
+    outOfSync = duration = 0.0
+    for seed in range(games):
+        clock = VirtualClock()
+        broker = LossyBroker(clock, Random(seed), players, "game", mtbf)
+        broker.start()
+        result = await simulation.play(seed, clock, broker)
+        broker.stop()
+        for kind, times in broker.resync.items():
+            resync[kind] += times
+        outOfSync += broker.outOfSync
+        duration += result.duration * players
+    return resync, outOfSync / duration
+
+
+def describe(times: list[float]) -> str:
+    if len(times) < 2:
+        return f"{len(times):>6}{'-':>10}{'-':>10}"
+    return f"{len(times):>6}{statistics.mean(times):>10.2f}{statistics.quantiles(times, n=20)[-1]:>10.2f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--mtbf", type=float, default=60, help="mean seconds between connection losses per base")
+    args = parser.parse_args()
+
+    print(f"{args.games} games, {args.players} players, a connection loss every {args.mtbf:g}s per base")
+    print(f"{'policy':>12}{'kind':>8}{'count':>6}{'mean (s)':>10}{'p95 (s)':>10}{'out of sync':>13}")
+    for name, policies in (("best effort", BEST_EFFORT_POLICIES), ("delivery", DELIVERY_POLICIES)):
+        resync, outOfSync = asyncio.run(measure(policies, args.games, args.players, args.mtbf))
+        for kind, times in resync.items():
+            print(f"{name:>12}{kind:>8}{describe(times)}{outOfSync:>13.1%}")
+
+
+if __name__ == "__main__":
+    main()
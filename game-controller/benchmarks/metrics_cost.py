@@ -0,0 +1,71 @@
+"""
+Benchmark: cost of the controller metrics on the publish path.
+
+Publishes the same stream of LCD, buzzer and turn messages through Utils, once with the
+metrics recorded and once through a copy of Utils.publish that does not record them,
+and times a single counter increment, histogram observation and /metrics rendering.
+
+Usage:
+    python benchmarks/metrics_cost.py [--publishes 200000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Delivery import DeliveryPolicy  # noqa: E402
+from Message import LCDMessage  # noqa: E402
+from Metrics import metrics, messagesIn, publishSeconds  # noqa: E402
+from Player import Player  # noqa: E402
+from Utils import Utils  # noqa: E402
+from OfflineClient import OfflineClient  # noqa: E402
+
+
+class UnmeteredUtils(Utils):
+    """Utils publishing straight to the client, as before the metrics."""
+
+    def publish(self, topic: str, payload, topic_class: str, policy: DeliveryPolicy) -> None:
+        self.client.publish(topic, payload, policy.qos, policy.retain)
+
+
+def measure(utils: Utils, publishes: int) -> float:
+    message = LCDMessage(top="Move the meeple.", down="3 moves left")
+    start = time.perf_counter()
+    for i in range(publishes // 4):
+        utils.showInLCD(1, message)
+        utils.showInOtherLCD(1, message)
+        utils.beepPlayer(1)
+        utils.setTurn(1, i % 2 == 0)
+    return (time.perf_counter() - start) / publishes
+
+
+def perCall(function, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--publishes", type=int, default=200_000)
+    args = parser.parse_args()
+
+    players = [Player(1), Player(2)]
+    client = OfflineClient()
+    unmetered = measure(UnmeteredUtils(client, players, debug=False), args.publishes)
+    metered = measure(Utils(client, players, debug=False), args.publishes)
+    counter, histogram = messagesIn.labels("components/button"), publishSeconds.labels("lcd")
+
+    print(f"publishes: {args.publishes}")
+    print(f"publish without metrics: {unmetered * 1e9:8.0f} ns")
+    print(f"publish with metrics:    {metered * 1e9:8.0f} ns (+{(metered - unmetered) * 1e9:.0f} ns)")
+    print(f"counter increment:       {perCall(counter.inc, args.publishes) * 1e9:8.0f} ns")
+    print(f"histogram observation:   {perCall(lambda: histogram.observe(0.0003), args.publishes) * 1e9:8.0f} ns")
+    print(f"render /metrics:         {perCall(metrics.render, 100) * 1e6:8.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: turn latency as the number of players grows.
+
+Plays simulated tables of 2 to 16 players on an offline MQTT client, with the
+pacing pauses skipped and bots pressing buttons and moving meeples, and reports
+the controller time spent per turn and the messages published per turn.
+
+Usage:
+    python benchmarks/player_scaling.py [--turns 200] [--players 2 4 8 16]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Clock import Clock  # noqa: E402
+from GameSession import GameSession  # noqa: E402
+from GameState import GameState  # noqa: E402
+from Utils import BUTTON_COMPONENT, HALL_SENSOR_COMPONENT  # noqa: E402
+from OfflineClient import OfflineClient  # noqa: E402
+
+class SkipClock(Clock):
+    """Skips the pacing pauses of the game, only letting the other tasks run."""
+
+    def time(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(0)
+
+    def wait(self, seconds: float) -> None:
+        pass
+
+
+class CountingClient(OfflineClient):
+    def __init__(self) -> None:
+        self.published = 0
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        self.published += 1
+
+
+class Press:
+    """Stand-in for paho's MQTTMessage carrying a button press."""
+
+    def __init__(self, press_type: str) -> None:
+        self.topic = ""
+        self.payload = json.dumps({"type": press_type}).encode()
+
+
+PRESSES = [Press("short"), Press("long")]
+
+
+async def bot(session: GameSession, rng: random.Random) -> None:
+    """Plays for every player: rolls the dice, moves meeples and presses buttons in minigames."""
+    while session.current_state != GameState.GAME_OVER:
+        current = session.players[session.turn].id
+        match session.current_state:
+            case GameState.ROLLING_DICE:
+                session.handleMessage(current, BUTTON_COMPONENT, PRESSES[0])
+            case GameState.MOVING:
+                session.handleMessage(current, HALL_SENSOR_COMPONENT, PRESSES[0])
+            case GameState.MINIGAME:
+                player = rng.choice(session.players).id
+                session.handleMessage(player, BUTTON_COMPONENT, rng.choice(PRESSES))
+        await asyncio.sleep(0)
+
+
+async def playTable(players: int, turns: int, seed: int) -> tuple[list[float], float]:
+    client = CountingClient()
+    session = GameSession(
+        client, f"game/table-{players}", players, win_points=10**9, clock=SkipClock(), rng=random.Random(seed)
+    )
+    for player in session.players:
+        player.connected = True
+    session.loop = asyncio.get_running_loop()
+    session.setGameState(GameState.PLAYING)
+    bot_task = asyncio.create_task(bot(session, random.Random(seed)))
+
+    latencies = []
+    for turn in range(turns):
+        start = time.perf_counter()
+        await session.playTurn(session.players[turn % players])
+        await session.showStats()
+        latencies.append(time.perf_counter() - start)
+
+    session.setGameState(GameState.GAME_OVER)
+    await bot_task
+    return latencies, client.published / turns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--players", type=int, nargs="+", default=[2, 4, 8, 16])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"turns per table: {args.turns}")
+    print(f"{'players':>8}{'mean (ms)':>12}{'p95 (ms)':>12}{'max (ms)':>12}{'msgs/turn':>12}")
+    for players in args.players:
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies, published = asyncio.run(playTable(players, args.turns, args.seed))
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(
+            f"{players:>8}{statistics.mean(latencies) * 1000:>12.2f}{p95 * 1000:>12.2f}"
+            f"{max(latencies) * 1000:>12.2f}{published:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: publish cost of a full turn, with and without cached payloads.
+
+Replays the LCD/buzzer output of a typical turn (turn start, dice roll,
+movement, a Gain Points cell and the stats screen) through Utils, and through
+a copy of the previous Utils that serialized every message on every publish.
+
+Usage:
+    python benchmarks/publish_cost.py [--turns 20000] [--players 2]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Melodies  # noqa: E402
+from Message import LCDMessage  # noqa: E402
+from Player import Player  # noqa: E402
+from Utils import Utils, PLAYERS_LCD_TOPIC, PLAYERS_BUZZER_TOPIC  # noqa: E402
+from OfflineClient import OfflineClient  # noqa: E402
+
+
+class LegacyUtils(Utils):
+    """Utils as it was before payload caching: one json.dumps and topic format per publish."""
+
+    def showInLCD(self, player_id, message: LCDMessage) -> None:
+        topic = PLAYERS_LCD_TOPIC.format(prefix=self.prefix, id=player_id)
+        payload = json.dumps({"top": message.top, "down": message.down, "time": message.time})
+        self.client.publish(topic, payload)
+        self.printDebug(f"(Player {player_id} LCD) {message}")
+
+    def playInBuzzer(self, player_id, message) -> None:
+        topic = PLAYERS_BUZZER_TOPIC.format(prefix=self.prefix, id=player_id)
+        payload = json.dumps({"tones": list(message.tones), "duration": list(message.duration)})
+        self.client.publish(topic, payload)
+        self.printDebug(f"(Player {player_id} Buzzer) {message}")
+
+    def showInOtherLCD(self, player_id, message: LCDMessage) -> None:
+        for player in self.players:
+            if player.id != player_id:
+                self.showInLCD(player.id, message)
+
+    def showInAllLCD(self, message: LCDMessage) -> None:
+        for player in self.players:
+            self.showInLCD(player.id, message)
+
+    def playInAllBuzzer(self, message) -> None:
+        for player in self.players:
+            self.playInBuzzer(player.id, message)
+
+
+def playTurn(utils: Utils, player: Player, players: list[Player]) -> None:
+    """Publishes the same output as GameSession for a turn rolling a 3 onto Gain Points."""
+    utils.playInBuzzer(player.id, Melodies.YOUR_TURN_SOUND)
+    utils.showInLCD(player.id, LCDMessage(top="Your turn!".center(16)))
+    utils.showInOtherLCD(player.id, LCDMessage(top=f"Player {player.id} turn!".center(16)))
+    utils.showInLCD(player.id, LCDMessage(top="Roll the dice".center(16), down="Press the button".center(16)))
+    utils.showInLCD(player.id, LCDMessage(top="Dice rolled".center(16), down="3".center(16)))
+    utils.showInOtherLCD(player.id, LCDMessage(top=f"Player {player.id}".center(16), down="rolled 3".center(16)))
+    for i in range(3, 0, -1):
+        utils.showInLCD(player.id, LCDMessage(top="Move the meeple.".center(16), down=f"{i} moves left".center(16)))
+        utils.showInOtherLCD(player.id, LCDMessage(top=f"P{player.id} moving.".center(16), down=f"{i} moves left".center(16)))
+        utils.playInAllBuzzer(Melodies.MOVE_SOUND)
+    utils.showInLCD(player.id, LCDMessage(top="Moved to".center(16), down="cell 3".center(16)))
+    utils.showInOtherLCD(player.id, LCDMessage(top=f"Player {player.id} moved".center(16), down="to cell 3".center(16)))
+    utils.playInAllBuzzer(Melodies.GAIN_POINTS_TUNE)
+    utils.showInLCD(player.id, LCDMessage(top="Gain Points".center(16)))
+    utils.showInOtherLCD(player.id, LCDMessage(top=f"Player {player.id} landed".center(16), down="on Gain Points".center(16)))
+    utils.showInLCD(player.id, LCDMessage(top="You gained".center(16), down=" 7 points".center(16)))
+    utils.showInOtherLCD(player.id, LCDMessage(top=f"Player {player.id} gained".center(16), down=" 7 points".center(16)))
+    utils.showInAllLCD(LCDMessage(top=f"P1: {players[0].points} points", down=f"P2: {players[1].points} points"))
+
+
+def measure(utils: Utils, players: list[Player], turns: int) -> float:
+    start = time.perf_counter()
+    for turn in range(turns):
+        playTurn(utils, players[turn % len(players)], players)
+    return (time.perf_counter() - start) / turns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20_000)
+    parser.add_argument("--players", type=int, default=2)
+    args = parser.parse_args()
+
+    players = [Player(i) for i in range(1, max(args.players, 2) + 1)]
+    client = OfflineClient()
+    legacy = measure(LegacyUtils(client, players, debug=False), players, args.turns)
+    cached = measure(Utils(client, players, debug=False), players, args.turns)
+
+    print(f"players: {len(players)}, turns: {args.turns}")
+    print(f"before (serialize per publish): {legacy * 1e6:8.1f} us/turn")
+    print(f"after (cached payloads):        {cached * 1e6:8.1f} us/turn")
+    print(f"speedup:                        {legacy / cached:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
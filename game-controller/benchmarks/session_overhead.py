@@ -0,0 +1,86 @@
+"""
+Benchmark: memory and threads needed by every extra game session.
+
+Starts N sessions on a single (offline) MQTT client, lets them block waiting
+for players, first all on one asyncio event loop (the default engine) and then
+with one thread per session, and reports the memory and thread count each one adds.
+
+Usage:
+    python benchmarks/session_overhead.py [--sessions 50]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GameSession import GameSession  # noqa: E402
+from SessionRegistry import SessionRegistry  # noqa: E402
+from OfflineClient import OfflineClient  # noqa: E402
+
+
+def createRegistry(sessions: int) -> SessionRegistry:
+    registry = SessionRegistry()
+    client = OfflineClient()
+    for table in range(sessions):
+        registry.register(GameSession(client, f"game/table-{table}"))
+    return registry
+
+
+def measureOverhead() -> tuple[int, int, int]:
+    memory, peak = tracemalloc.get_traced_memory()
+    return memory, peak, threading.active_count()
+
+
+async def measureAsyncio(sessions: int) -> tuple[int, int, int]:
+    registry = createRegistry(sessions)
+    task = asyncio.create_task(registry.runAll())
+    await asyncio.sleep(0.5)
+    result = measureOverhead()
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+    return result
+
+
+def measureThreads(sessions: int) -> tuple[int, int, int]:
+    registry = createRegistry(sessions)
+    registry.startAll()
+    time.sleep(0.5)
+    return measureOverhead()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    args = parser.parse_args()
+
+    base_threads = threading.active_count()
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for engine, measure in (
+            ("asyncio", lambda: asyncio.run(measureAsyncio(args.sessions))),
+            # Thread sessions never return while idle, so they run last and die with the process
+            ("threads", lambda: measureThreads(args.sessions)),
+        ):
+            tracemalloc.start()
+            base_memory, _ = tracemalloc.get_traced_memory()
+            memory, peak, threads = measure()
+            tracemalloc.stop()
+            results[engine] = (memory - base_memory, peak, threads - base_threads)
+
+    print(f"sessions: {args.sessions}")
+    print(f"{'engine':<10}{'memory (KiB)':>14}{'peak (KiB)':>12}{'per session':>13}{'threads':>9}{'per session':>13}")
+    for engine, (memory, peak, threads) in results.items():
+        print(f"{engine:<10}{memory / 1024:>14.1f}{peak / 1024:>12.1f}{memory / args.sessions / 1024:>13.1f}"
+              f"{threads:>9}{threads / args.sessions:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Benchmark: sessions under a flood of inputs from several network threads.
+
+Runs sessions on a single event loop with a fast clock while feeder threads send them
+random button presses, hall sensor readings, connections, malformed payloads and messages
+for unknown tables through SessionRegistry.on_message, starting before the sessions run.
+Every handled input checks that it runs on the loop thread and that the session is
+consistent (phase, turn, points, leaderboard, inbox depth), and a reader thread keeps
+checking the phases of every session without a lock. Reports the inputs handled per
+second, the inputs dropped and every violation found.
+
+Usage:
+    python benchmarks/stress_inputs.py [--sessions 8] [--feeders 4] [--players 4] [--seconds 30]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Clock import ScaledClock  # noqa: E402
+from GameSession import GameSession  # noqa: E402
+from GameState import GameState  # noqa: E402
+from SessionRegistry import SessionRegistry  # noqa: E402
+from Utils import BUTTON_COMPONENT, CONNECTION_COMPONENT, HALL_SENSOR_COMPONENT  # noqa: E402
+from OfflineClient import OfflineClient  # noqa: E402
+
+# Simulated seconds per real second
+CLOCK_SCALE = 200
+
+# Points needed to win, low enough for games to end during the run
+WIN_POINTS = 20
+
+
+class Message:
+    """Stand-in for paho's MQTTMessage."""
+
+    __slots__ = ("topic", "payload")
+
+    def __init__(self, topic: str, payload: bytes) -> None:
+        self.topic = topic
+        self.payload = payload
+
+
+def messages(prefixes: list[str], players: int, rng: random.Random) -> list[Message]:
+    """Mix of the inputs the feeders send, most of them valid."""
+    pool = []
+    for prefix in prefixes:
+        for player_id in range(1, players + 1):
+            base = f"{prefix}/players/{player_id}"
+            pool.append(Message(f"{base}/{CONNECTION_COMPONENT}", b"{}"))
+            for press_type in ("short", "long"):
+                press = json.dumps({"type": press_type}).encode()
+                pool.extend([Message(f"{base}/{BUTTON_COMPONENT}", press)] * 4)
+            pool.append(Message(f"{base}/{HALL_SENSOR_COMPONENT}", json.dumps({"detected": True}).encode()))
+            pool.append(Message(f"{base}/{BUTTON_COMPONENT}", rng.choice((b"", b"{", b"\xff", b'{"type": 1}'))))
+    pool.append(Message("game/table-unknown/players/1/" + BUTTON_COMPONENT, b'{"type": "short"}'))
+    pool.append(Message("game/elsewhere", b"{}"))
+    return pool
+
+
+class Checker:
+    """
+    Checks the sessions while they are flooded with inputs.
+
+    Attributes:
+        violations (Counter): Number of times every invariant was broken
+        handled (int): Inputs handled by the sessions
+        loopThread (int | None): Identifier of the thread running the event loop
+    """
+
+    def __init__(self) -> None:
+        self.violations = Counter()
+        self.handled = 0
+        self.loopThread = None
+
+    def check(self, name: str, holds: bool) -> None:
+        if not holds:
+            self.violations[name] += 1
+
+    def checkPhase(self, session: GameSession) -> None:
+        phase = session.phase
+        if phase.state == GameState.MINIGAME:
+            self.check("minigame phase without its handlers", phase.minigame is not None
+                       and phase.handlers is phase.minigame.handlers)
+        else:
+            self.check("minigame outside the minigame phase", phase.minigame is None)
+
+    def checkSession(self, session: GameSession) -> None:
+        self.check("input handled off the loop thread", threading.get_ident() == self.loopThread)
+        self.checkPhase(session)
+        self.check("turn out of range", 0 <= session.turn < len(session.players))
+        self.check("negative points", all(player.points >= 0 for player in session.players))
+        points = [player.points for player in session.scoreboard.standings()]
+        self.check("leaderboard out of order", points == sorted(points, reverse=True))
+        contenders = {player.id for player in session.players if player.points >= WIN_POINTS}
+        self.check("contenders out of date", session.scoreboard.contenders == contenders)
+        inbox = session.inbox
+        self.check("inbox over capacity", inbox.depth <= inbox.capacity * len(session.players))
+
+    def watch(self, session: GameSession) -> None:
+        """Checks the session before every input it handles."""
+        handleEvent = session.handleEvent
+
+        def checkedEvent(event) -> None:
+            self.checkSession(session)
+            self.handled += 1
+            handleEvent(event)
+
+        session.handleEvent = checkedEvent
+
+
+def feed(registry: SessionRegistry, pool: list[Message], seed: int, stop: threading.Event, sent: list) -> None:
+    rng = random.Random(seed)
+    on_message = registry.on_message
+    count = 0
+    while not stop.is_set():
+        for message in rng.choices(pool, k=256):
+            on_message(None, None, message)
+        count += 256
+        time.sleep(0.001)
+    sent.append(count)
+
+
+def read(sessions: list[GameSession], checker: Checker, stop: threading.Event) -> None:
+    while not stop.is_set():
+        for session in sessions:
+            checker.checkPhase(session)
+        time.sleep(0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--feeders", type=int, default=4)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    args = parser.parse_args()
+
+    client = OfflineClient()
+    registry = SessionRegistry()
+    checker = Checker()
+    sessions = []
+    for table in range(args.sessions):
+        session = GameSession(
+            client,
+            f"game/table-{table}",
+            num_players=args.players,
+            win_points=WIN_POINTS,
+            clock=ScaledClock(CLOCK_SCALE),
+            rng=random.Random(table),
+            quiet=True,
+        )
+        checker.watch(session)
+        registry.register(session)
+        sessions.append(session)
+
+    stop = threading.Event()
+    sent = []
+    pool = messages([session.prefix for session in sessions], args.players, random.Random(0))
+    threads = [threading.Thread(target=feed, args=(registry, pool, seed, stop, sent)) for seed in range(args.feeders)]
+    threads.append(threading.Thread(target=read, args=(sessions, checker, stop)))
+
+    async def run() -> float:
+        checker.loopThread = threading.get_ident()
+        start = time.perf_counter()
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(registry.runAll(), args.seconds)
+        return time.perf_counter() - start
+
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = asyncio.run(run())
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    counts = Counter()
+    for session in sessions:
+        counts += session.inbox.stats
+    finished = sum(session.current_state == GameState.GAME_OVER for session in sessions)
+    print(f"sessions: {args.sessions} of {args.players} players, {args.feeders} feeder threads, "
+          f"clock x{CLOCK_SCALE}")
+    print(f"sent:     {sum(sent)} messages in {elapsed:.1f}s")
+    print(f"handled:  {checker.handled / elapsed:,.0f} inputs/s ({checker.handled} inputs)")
+    print(f"inbox:    {dict(counts)}")
+    print(f"finished: {finished} of {args.sessions} games")
+    if checker.violations:
+        for name, count in checker.violations.most_common():
+            print(f"VIOLATION {name}: {count}")
+    else:
+        print("no violations")
+
+
+if __name__ == "__main__":
+    main()
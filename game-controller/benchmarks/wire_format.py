@@ -0,0 +1,67 @@
+"""
+Benchmark: payload size and encode time of every wire format.
+
+Encodes every melody of the game and a set of typical LCD frames with each codec,
+and reports the bytes sent to the bases and the (uncached) encode time per message.
+
+Usage:
+    python benchmarks/wire_format.py [--repeat 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Melodies  # noqa: E402
+from Message import CODECS, BuzzerMessage, JsonCodec, encodeLCD  # noqa: E402
+
+FRAMES = [
+    ("Your turn!".center(16), ""),
+    ("Roll the dice".center(16), "Press the button".center(16)),
+    ("Player 12 moved".center(16), "to cell 27".center(16)),
+    ("P1: 48 points", "P2: 12 points"),
+    ("Game Over".center(16), "Player 3 wins!".center(16)),
+]
+
+
+class UncachedJsonCodec(JsonCodec):
+    def encodeLCD(self, top: str, down: str, time: int) -> bytes:
+        return encodeLCD.__wrapped__(top, down, time)
+
+
+def measure(encode, items: list[tuple], repeat: int) -> tuple[float, float]:
+    sizes = [len(encode(*item)) for item in items]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            encode(*item)
+    elapsed = time.perf_counter() - start
+    return sum(sizes) / len(sizes), elapsed / (repeat * len(items))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    melodies = [
+        (message.tones, message.duration) for message in vars(Melodies).values() if isinstance(message, BuzzerMessage)
+    ]
+    frames = [(top, down, 0) for top, down in FRAMES]
+    codecs = {**CODECS, "json": UncachedJsonCodec()}
+
+    print(f"{len(melodies)} melodies, {len(frames)} LCD frames")
+    print(f"{'codec':>8}{'LCD bytes':>12}{'LCD us':>10}{'tune bytes':>12}{'tune us':>10}{'largest tune':>14}")
+    for name, codec in codecs.items():
+        lcdSize, lcdTime = measure(codec.encodeLCD, frames, args.repeat)
+        tuneSize, tuneTime = measure(codec.encodeBuzzer, melodies, args.repeat)
+        largest = max(len(codec.encodeBuzzer(*melody)) for melody in melodies)
+        print(
+            f"{name:>8}{lcdSize:>12.1f}{lcdTime * 1e6:>10.2f}{tuneSize:>12.1f}{tuneTime * 1e6:>10.2f}{largest:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
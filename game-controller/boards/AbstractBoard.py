@@ -11,4 +11,8 @@ class Board(ABC):
         return self.cells[position]
 
     def getCellName(self, position: int) -> str:
-        return self.cells[position].value
+        return self.getCellType(position).value
+
+    def getCellRange(self, position: int, default: tuple[int, int]) -> tuple[int, int]:
+        # Range of the random amount of a cell (points or steps), the game default unless the board sets one
+        return default
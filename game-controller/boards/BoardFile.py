@@ -0,0 +1,235 @@
+import json
+from array import array
+from functools import lru_cache
+from CellType import CellType, MOVE_STEPS
+from .AbstractBoard import Board
+
+"""
+Boards defined in JSON files, e.g.:
+
+    {
+        "name": "Classic",
+        "cells": ["ST", "GP", {"type": "LP", "points": [1, 3]}, {"type": "MF", "steps": [2, 4]}, ...]
+    }
+
+A cell is the name of its CellType, or an object with its type and parameters: the points range of
+Gain Points and Lose Points, the points of MiniGame and the steps range of Move Forward and Move
+Backward. Cells without parameters use the game defaults.
+Files are validated and compiled into an array-backed board (one byte per cell type, two integers
+per cell range), cached by file content, so loading a board again before every game is cheap and a
+changed file is picked up by the next game.
+"""
+
+# Cell types in code order
+CELL_TYPES = tuple(CellType)
+CELL_CODES = {cell: code for code, cell in enumerate(CELL_TYPES)}
+
+# Parameter each cell type accepts, and whether it is a range ([low, high]) or a single value
+CELL_PARAMETERS = {
+    CellType.GP: ("points", True),
+    CellType.LP: ("points", True),
+    CellType.MG: ("points", False),
+    CellType.MF: ("steps", True),
+    CellType.MB: ("steps", True),
+}
+
+# Largest value of a cell parameter (stored as unsigned 16-bit integers)
+MAX_PARAMETER = 0xFFFF
+
+
+class BoardFileError(ValueError):
+    """Raised when a board file is not a valid board."""
+
+
+class CompiledBoard(Board):
+    """
+    Board compiled from a board file.
+    Compiled boards are cached and shared by every session loading the same file, so they must not be modified.
+
+    Attributes:
+        name (str): Name of the board
+        size (int): Number of cells
+        codes (bytes): Code of the type of every cell, see CELL_TYPES
+        ranges (array): Low and high value of every cell parameter, 0 and 0 when the cell uses the game default
+    """
+
+    def __init__(self, name: str, codes: bytes, ranges: array) -> None:
+        """
+        Initialize the board. The cell list of Board is replaced by the codes, so Board.__init__ is not called.
+
+        Args:
+            name: Name of the board
+            codes: Code of the type of every cell
+            ranges: Low and high value of every cell parameter
+
+        Returns:
+            None
+        """
+        self.name = name
+        self.codes = codes
+        self.ranges = ranges
+        self.size = len(codes)
+
+    @property
+    def cells(self) -> list[CellType]:
+        """
+        Cell types of the board, built on every access (use getCellType to read a single cell).
+
+        Returns:
+            list[CellType]: Type of every cell
+        """
+        return [CELL_TYPES[code] for code in self.codes]
+
+    def getCellType(self, position: int) -> CellType:
+        return CELL_TYPES[self.codes[position]]
+
+    def getCellRange(self, position: int, default: tuple[int, int]) -> tuple[int, int]:
+        low, high = self.ranges[2 * position], self.ranges[2 * position + 1]
+        return (low, high) if high else default
+
+
+def parseCell(index: int, cell) -> tuple[CellType, int, int]:
+    """
+    Validates a cell of a board file.
+
+    Args:
+        index: Position of the cell
+        cell: Cell as read from the file
+
+    Returns:
+        tuple[CellType, int, int]: Type of the cell, and low and high value of its parameter (0 and 0 for the default)
+
+    Raises:
+        BoardFileError: If the cell is not valid
+    """
+    fields = dict(cell) if isinstance(cell, dict) else {"type": cell}
+    name = fields.pop("type", None)
+    if not isinstance(name, str) or name not in CellType.__members__:
+        raise BoardFileError(f"Cell {index}: unknown type {name!r}, expected one of {', '.join(CellType.__members__)}")
+    cell_type = CellType[name]
+    if not fields:
+        return cell_type, 0, 0
+
+    parameter, isRange = CELL_PARAMETERS.get(cell_type, (None, False))
+    unknown = set(fields) - {parameter}
+    if unknown:
+        raise BoardFileError(f"Cell {index}: {name} does not take {', '.join(sorted(unknown))}")
+    value = fields[parameter]
+    if isRange:
+        if not (isinstance(value, list) and len(value) == 2 and all(type(bound) is int for bound in value)):
+            raise BoardFileError(f"Cell {index}: {parameter} must be a [low, high] pair of integers")
+        low, high = value
+    else:
+        if type(value) is not int:
+            raise BoardFileError(f"Cell {index}: {parameter} must be an integer")
+        low = high = value
+    if not 0 <= low <= high <= MAX_PARAMETER or high == 0 or (parameter == "steps" and low == 0):
+        raise BoardFileError(f"Cell {index}: invalid {parameter} {value}")
+    return cell_type, low, high
+
+
+def checkChains(codes: bytes, ranges: array) -> None:
+    """
+    Checks that every chain of Move Forward and Move Backward cells can end.
+    A move cell is fine when one of the cells it can move to ends the turn or is itself fine.
+
+    Args:
+        codes: Code of the type of every cell
+        ranges: Low and high value of every cell parameter
+
+    Raises:
+        BoardFileError: If some chain of moves never ends
+    """
+    size = len(codes)
+    moves = {CELL_CODES[CellType.MF]: 1, CELL_CODES[CellType.MB]: -1}
+    # Cells each cell can be moved to from, to walk back from the cells ending the turn
+    sources: list[list[int]] = [[] for _ in range(size)]
+    for position, code in enumerate(codes):
+        if code in moves:
+            low, high = ranges[2 * position], ranges[2 * position + 1]
+            low, high = (low, high) if high else MOVE_STEPS
+            for step in range(low, min(high, low + size - 1) + 1):
+                sources[(position + moves[code] * step) % size].append(position)
+
+    ending = [code not in moves for code in codes]
+    pending = [position for position in range(size) if ending[position]]
+    while pending:
+        for source in sources[pending.pop()]:
+            if not ending[source]:
+                ending[source] = True
+                pending.append(source)
+    if not all(ending):
+        raise BoardFileError(f"Cell {ending.index(False)}: the moves from this cell never end")
+
+
+@lru_cache(maxsize=64)
+def compileBoard(data: bytes) -> CompiledBoard:
+    """
+    Validates and compiles the content of a board file. Results are cached by content.
+
+    Args:
+        data: Content of the board file (JSON)
+
+    Returns:
+        CompiledBoard: Compiled board, shared by every caller with the same content
+
+    Raises:
+        BoardFileError: If the content is not a valid board
+    """
+    try:
+        definition = json.loads(data)
+    except ValueError as error:
+        raise BoardFileError(f"Invalid JSON: {error}") from error
+    if not isinstance(definition, dict) or not isinstance(definition.get("cells"), list) or not definition["cells"]:
+        raise BoardFileError("A board needs a non-empty \"cells\" list")
+
+    codes = bytearray()
+    ranges = array("H")
+    for index, cell in enumerate(definition["cells"]):
+        cell_type, low, high = parseCell(index, cell)
+        codes.append(CELL_CODES[cell_type])
+        ranges.extend((low, high))
+    checkChains(bytes(codes), ranges)
+    return CompiledBoard(str(definition.get("name", "Custom")), bytes(codes), ranges)
+
+
+def loadBoard(path: str) -> CompiledBoard:
+    """
+    Loads a board file. The file is read every time, and only compiled when its content changed.
+
+    Args:
+        path: Path of the board file
+
+    Returns:
+        CompiledBoard: Compiled board
+
+    Raises:
+        BoardFileError: If the file is not a valid board
+        OSError: If the file cannot be read
+    """
+    with open(path, "rb") as file:
+        return compileBoard(file.read())
+
+
+def getBoard(name: str) -> Board:
+    """
+    Gets a board by name, for command line tools.
+
+    Args:
+        name: Path of a board file (ending in .json) or name of a board class (e.g. "ClassicBoard")
+
+    Returns:
+        Board: The board
+
+    Raises:
+        BoardFileError: If the board file is not a valid board
+        ValueError: If there is no board class with that name
+    """
+    if name.endswith(".json"):
+        return loadBoard(name)
+    import boards
+
+    board = getattr(boards, name, None)
+    if not (isinstance(board, type) and issubclass(board, Board)):
+        raise ValueError(f"Unknown board {name!r}")
+    return board()
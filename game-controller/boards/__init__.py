@@ -1,5 +1,6 @@
 from .AbstractBoard import Board
 from .ClassicBoard import ClassicBoard
 from .DebugBoard import DebugBoard
+from .BoardFile import BoardFileError, CompiledBoard, getBoard, loadBoard
 
-__all__ = ["AbstractBoard", "ClassicBoard", "DebugBoard"]
\ No newline at end of file
+__all__ = ["AbstractBoard", "ClassicBoard", "DebugBoard", "BoardFileError", "CompiledBoard", "getBoard", "loadBoard"]
\ No newline at end of file
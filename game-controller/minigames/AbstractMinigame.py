@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
-import time
 import paho.mqtt.client as mqtt
+from random import Random
+from Clock import Clock, RealClock
 from Player import Player
-from Utils import Utils, LCDMessage
+from Roster import Roster
+import Screens
+from InputEvent import InputEvent
+from Utils import Utils, BUTTON_COMPONENT
 
 # MQTT topics for minigame communication
 general_minigame_topic = "game/minigame"
@@ -14,24 +18,59 @@ class Minigame(ABC):
     Provides common initialization and utility methods for minigame implementations.
     """
     
-    def __init__(self, players: list[Player], client: mqtt.Client, debug: bool) -> None:
+    def __init__(
+        self,
+        players: list[Player] | Roster,
+        client: mqtt.Client,
+        debug: bool,
+        prefix: str = "game",
+        clock: Clock = None,
+        rng: Random = None,
+    ) -> None:
         """
         Initialize a new minigame instance.
 
         Args:
-            players: List of players participating in the minigame
+            players: List of players participating in the minigame, kept as a Roster
             client: MQTT client for communication
             debug: Boolean flag for debug mode
+            prefix: Topic prefix of the table the minigame is played on
+            clock: Clock used for pauses (default: real time)
+            rng: Random generator of the session (default: unseeded)
 
         Returns:
             None
         """
-        self.players = players
+        self.players = players if isinstance(players, Roster) else Roster(players)
         self.client = client
-        self.utils = Utils(client, players, debug)
+        self.prefix = prefix
+        self.clock = clock or RealClock()
+        self.rng = rng or Random()
+        self.utils = Utils(client, self.players, debug, prefix)
+        # Input handlers indexed by topic component, called with the decoded InputEvent.
+        # Empty until the game accepts input, so presses during the introduction are ignored.
+        self.handlers = {}
+
+    def acceptInput(self) -> None:
+        """
+        Starts handling the button presses of the players.
+
+        Returns:
+            None
+        """
+        self.handlers[BUTTON_COMPONENT] = self.handleMQTTMessage
+
+    def ignoreInput(self) -> None:
+        """
+        Stops handling the button presses of the players.
+
+        Returns:
+            None
+        """
+        self.handlers.pop(BUTTON_COMPONENT, None)
     
     @abstractmethod
-    def playGame(self) -> list[Player]:
+    async def playGame(self) -> list[Player]:
         """
         Execute the main minigame logic.
         Must be implemented by concrete minigame classes.
@@ -42,13 +81,15 @@ class Minigame(ABC):
         pass
     
     @abstractmethod
-    def handleMQTTMessage(self, message: str) -> None:
+    def handleMQTTMessage(self, event: InputEvent) -> None:
         """
-        Process MQTT messages received during the minigame.
+        Process button presses received during the minigame.
+        Called from the session event loop, so it must not block. Presses are already decoded
+        and validated, so the press type is always "short" or "long".
         Must be implemented by concrete minigame classes.
 
         Args:
-            message: MQTT message to process
+            event: Button press of the player
 
         Returns:
             None
@@ -56,7 +97,7 @@ class Minigame(ABC):
         pass
     
     @abstractmethod
-    def introduceGame(self) -> None:
+    async def introduceGame(self) -> None:
         """
         Display introduction and instructions for the minigame.
         Must be implemented by concrete minigame classes.
@@ -66,7 +107,7 @@ class Minigame(ABC):
         """
         pass
     
-    def startCountdown(self):
+    async def startCountdown(self):
         """
         Display a countdown animation before starting the minigame.
         Shows "Ready?" and counts down from 3 to "GO!".
@@ -75,5 +116,5 @@ class Minigame(ABC):
             None
         """
         for elem in [3, 2, 1, "GO!"]:
-            self.utils.showInAllLCD(LCDMessage(top="Ready?".center(16), down=str(elem).center(16)))
-            time.sleep(1)
\ No newline at end of file
+            self.utils.showInAllLCD(Screens.READY.render(count=elem))
+            await self.clock.sleep(1)
\ No newline at end of file
@@ -1,16 +1,24 @@
 from minigames import Minigame
+from Clock import Clock
 from Player import Player
 import paho.mqtt.client as mqtt
-import time
-from Message import LCDMessage, BuzzerMessage
+import asyncio
+import Screens
+from Message import BuzzerMessage
 from Utils import Utils
-from threading import Event, Timer
+from InputEvent import InputEvent
 import json
-import random
+from random import Random
 from Melodies import HOT_POTATO_TUNE  # Add this import at the top
 
-# MQTT Topics
-BUTTON_TOPIC = "game/players/{id}/components/button"
+# Warning beep played while the potato is about to explode
+WARNING_BEEP = BuzzerMessage(tones=[1000, 0], duration=[100, 0])
+
+# Warning beep intervals: INITIAL_BEEP_INTERVAL seconds at the start, shrinking linearly
+# with the remaining time down to MIN_BEEP_INTERVAL seconds at the explosion
+INITIAL_BEEP_INTERVAL = 1.5
+MIN_BEEP_INTERVAL = 0.1
+
 
 class HotPotato(Minigame):
     """
@@ -18,16 +26,21 @@ class HotPotato(Minigame):
     The player holding the "potato" when the timer expires loses.
     """
 
-    def __init__(self, players: list[Player], client: mqtt.Client, debug: bool) -> None:
-        super().__init__(players, client, debug)
-        self.current_player = random.choice(players)
-        self.timer_duration = random.randint(10, 30)
-        self.hot_potato_event = Event()
-        self.explosion_timer = None
-        self.beep_timer = None
-        self.last_beep_time = 0
-
-    def playGame(self) -> list[Player]:
+    def __init__(
+        self,
+        players: list[Player],
+        client: mqtt.Client,
+        debug: bool,
+        prefix: str = "game",
+        clock: Clock = None,
+        rng: Random = None,
+    ) -> None:
+        super().__init__(players, client, debug, prefix, clock, rng)
+        self.current_player = self.rng.choice(players)
+        self.timer_duration = self.rng.randint(10, 30)
+        self.hot_potato_event = asyncio.Event()
+
+    async def playGame(self) -> list[Player]:
         """
         Main game loop for Hot Potato minigame.
         Manages timer, potato passing, and winner determination.
@@ -36,26 +49,20 @@ class HotPotato(Minigame):
             list[Player]: List of players who weren't holding the potato when it exploded
         """
         self.startGameDebugInfo()
-        self.introduceGame()
-        self.startCountdown()
+        await self.introduceGame()
+        await self.startCountdown()
 
-        self.start_time = time.time()
-        self.client.subscribe(BUTTON_TOPIC.format(id="+"))
+        self.start_time = self.clock.time()
+        self.acceptInput()
 
         # Display the current player holding the potato
         self.displayPotatoHolder()
 
-        # Start the timer for the explosion
-        self.explosion_timer = Timer(self.timer_duration, self.explodePotato)
-        self.explosion_timer.start()
-
-        # Start the beeping sequence
-        self.scheduleBeep()
-
-        # Wait for the game end
-        self.hot_potato_event.wait()
+        # Beep faster and faster until the explosion
+        await self.runTimer()
+        await self.explodePotato()
 
-        self.client.unsubscribe(BUTTON_TOPIC.format(id="+"))
+        self.ignoreInput()
 
         loser = self.current_player
         winners = [player for player in self.players if player != loser]
@@ -74,7 +81,7 @@ class HotPotato(Minigame):
         self.utils.printDebug(f"Timer duration: {self.timer_duration}")
         self.utils.printDebug(f"Starting player: {self.current_player.id}")
 
-    def introduceGame(self):
+    async def introduceGame(self):
         """
         Displays game introduction and instructions to players.
         Explains hot potato mechanics and passing rules.
@@ -83,29 +90,28 @@ class HotPotato(Minigame):
             None
         """
         self.utils.playInAllBuzzer(HOT_POTATO_TUNE)
-        self.utils.showInAllLCD(LCDMessage(top="Hot Potato!".center(16)))
-        time.sleep(3)
-        self.utils.showInAllLCD(LCDMessage(top="Press button to".center(16), down="pass the potato!".center(16)))
-        time.sleep(3)
-        self.utils.showInAllLCD(LCDMessage(top="Pass it quickly!".center(16), down="It's hot!".center(16)))
-        time.sleep(3)
-        self.utils.showInAllLCD(LCDMessage(top="Avoid holding it".center(16), down="when it blows!".center(16)))
-        time.sleep(3)
+        self.utils.showInAllLCD(Screens.HOT_POTATO.render())
+        await self.clock.sleep(3)
+        self.utils.showInAllLCD(Screens.HOT_POTATO_PASS.render())
+        await self.clock.sleep(3)
+        self.utils.showInAllLCD(Screens.HOT_POTATO_QUICK.render())
+        await self.clock.sleep(3)
+        self.utils.showInAllLCD(Screens.HOT_POTATO_AVOID.render())
+        await self.clock.sleep(3)
 
-    def handleMQTTMessage(self, message: mqtt.MQTTMessage):
+    def handleMQTTMessage(self, event: InputEvent):
         """
         Processes button presses for potato passing.
         Validates current holder before allowing pass.
         
         Args:
-            message: MQTT message containing button press
+            event: Button press of the player
             
         Returns:
             None
         """
         if not self.hot_potato_event.is_set():  # Ignore button presses after the game ends
-            player_id = int(message.topic.split("/")[2])
-            if message.topic == BUTTON_TOPIC.format(id=player_id) and self.current_player.id == player_id:
+            if self.current_player.id == event.player_id:
                 self.passPotato()
                 self.displayPotatoHolder()  
 
@@ -118,15 +124,13 @@ class HotPotato(Minigame):
             None
         """
         # Update the current player
-        current_player_index = self.players.index(self.current_player)
-        next_player_index = (current_player_index + 1) % len(self.players)
-        self.current_player = self.players[next_player_index]
+        self.current_player = self.players.next(self.current_player)
         self.utils.printDebug(f"Potato passed to Player {self.current_player.id}")
 
         # Sound effect to notify new potato holder
         self.utils.beepPlayer(self.current_player.id, duration_ms=200, frequency=500)
 
-    def explodePotato(self):
+    async def explodePotato(self):
         """
         Handles end of game when timer expires.
         Triggers explosion effects and stops game.
@@ -138,39 +142,41 @@ class HotPotato(Minigame):
         self.hot_potato_event.set() 
         self.utils.printDebug("BOOM! The potato exploded!")
 
-        # Cancel the explosion timer
-        if self.beep_timer:
-            self.beep_timer.cancel()
-
         # Explosion sound and message
         self.utils.beepAllPlayers(duration_ms=2000, frequency=100)
-        self.utils.showInAllLCD(LCDMessage(top="BOOM!".center(16), down="Potato exploded!".center(16)))
-        time.sleep(3)
+        self.utils.showInAllLCD(Screens.HOT_POTATO_BOOM.render())
+        await self.clock.sleep(3)
 
-    def scheduleBeep(self):
+    def nextBeep(self, last_beep: float) -> float:
         """
-        Manages warning beeps that increase in frequency.
-        Beep interval decreases as timer runs down.
-        
-        Returns:
-            None
-        """
-        time_elapsed = time.time() - self.start_time
-        remaining_time = max(0, self.timer_duration - time_elapsed) # Prevent negative values
+        Computes when the warning beep after the given one is due.
+        The interval shrinks with the remaining time: the next beep comes at t such that
+        t - last_beep = INITIAL_BEEP_INTERVAL * (duration - t) / duration + MIN_BEEP_INTERVAL.
 
-        initial_beep_rate = 1.5  # Initial beep interval in seconds
-        acceleration_factor = remaining_time / self.timer_duration 
-        beep_interval = initial_beep_rate * acceleration_factor + 0.1  # Decrease the interval as the time decreases
+        Args:
+            last_beep: Seconds since the start of the timer of the last beep
 
-        if remaining_time > 0:
-            if time.time() - self.last_beep_time >= beep_interval:
-                self.utils.playInAllBuzzer(BuzzerMessage(tones=[1000, 0], duration=[100, 0]))
-                self.last_beep_time = time.time()  
+        Returns:
+            float: Seconds since the start of the timer of the next beep
+        """
+        rate = INITIAL_BEEP_INTERVAL / self.timer_duration
+        return (last_beep + INITIAL_BEEP_INTERVAL + MIN_BEEP_INTERVAL) / (1 + rate)
 
-            # Continue scheduling the next beep
-            self.beep_timer = Timer(0.1, self.scheduleBeep)
-            self.beep_timer.start()
+    async def runTimer(self):
+        """
+        Plays the warning beeps until the potato explodes.
+        Sleeps straight to each beep deadline, then to the explosion; deadlines are measured
+        from the start of the timer, so pauses never drift. Cancelling the minigame cancels the timer.
 
+        Returns:
+            None
+        """
+        beep = 0.0
+        while beep < self.timer_duration:
+            await self.clock.sleep(beep - (self.clock.time() - self.start_time))
+            self.utils.playInAllBuzzer(WARNING_BEEP)
+            beep = self.nextBeep(beep)
+        await self.clock.sleep(self.timer_duration - (self.clock.time() - self.start_time))
 
     def displayPotatoHolder(self):
         """
@@ -182,9 +188,11 @@ class HotPotato(Minigame):
         """
         self.utils.showInLCD(
             self.current_player.id,
-            LCDMessage(top="You have".center(16), down="the potato!".center(16)),
+            Screens.HOT_POTATO_HOLDER.render(),
+            state=True,
         )
         self.utils.showInOtherLCD(
             self.current_player.id,
-            LCDMessage(top=f"Player {self.current_player.id} has".center(16), down="the potato!".center(16)),
+            Screens.HOT_POTATO_PLAYER.render(player=self.current_player.id),
+            state=True,
         )
@@ -1,14 +1,20 @@
-import json
-import time
+import asyncio
 import paho.mqtt.client as mqtt
 from random import Random
-from threading import Event
 from minigames import Minigame
+from Clock import Clock
 from Player import Player
-from Utils import Utils, LCDMessage
+import Screens
+from Message import LCD_WIDTH
+from Utils import Utils
+from InputEvent import InputEvent, SHORT_PRESS
 from Melodies import LAST_STICK_TUNE  
 
-BUTTON_TOPIC = "game/players/{id}/components/button"
+# Sticks on the pile when the game starts
+STICKS = 12
+
+# Pile drawn for every number of sticks left: one bar per stick and the count on the right
+STICK_BARS = tuple("|" * sticks + f"{sticks:>2}".rjust(LCD_WIDTH - sticks) for sticks in range(STICKS + 1))
 
 class LastStickStanding(Minigame):
     """
@@ -16,14 +22,22 @@ class LastStickStanding(Minigame):
     Players take turns removing sticks from a pile. The player who removes the last stick loses.
     """
 
-    def __init__(self, players: list[Player], client: mqtt.Client, debug: bool) -> None:
-        super().__init__(players, client, debug)
-        self.sticks = 12
-        self.lastStickStandingEvent = Event()
+    def __init__(
+        self,
+        players: list[Player],
+        client: mqtt.Client,
+        debug: bool,
+        prefix: str = "game",
+        clock: Clock = None,
+        rng: Random = None,
+    ) -> None:
+        super().__init__(players, client, debug, prefix, clock, rng)
+        self.sticks = STICKS
+        self.lastStickStandingEvent = asyncio.Event()
         self.current_player_index = 0
         self.sticks_to_take = 1
 
-    def playGame(self) -> list[Player]:
+    async def playGame(self) -> list[Player]:
         """
         Executes the main game loop for Last Stick Standing.
         Players take turns removing 1-2 sticks until none remain.
@@ -32,35 +46,31 @@ class LastStickStanding(Minigame):
             list[Player]: List of players who didn't take the last stick
         """
         self.utils.printDebug(f"Starting game with {self.sticks} sticks")
-        self.introduceGame()
-        self.client.subscribe(BUTTON_TOPIC.format(id="+"))
+        await self.introduceGame()
+        self.acceptInput()
         self.showTurnInfo()
-        self.lastStickStandingEvent.wait()
-        self.client.unsubscribe(BUTTON_TOPIC.format(id="+"))
-        time.sleep(2)
+        await self.lastStickStandingEvent.wait()
+        self.ignoreInput()
+        await self.clock.sleep(2)
         winners = [player for player in self.players if player.id != self.last_player]
         return winners  # Return winners directly without additional filtering
     
-    def handleMQTTMessage(self, message: mqtt.MQTTMessage) -> None:
+    def handleMQTTMessage(self, event: InputEvent) -> None:
         """
         Processes player button presses for stick removal.
         Short press toggles number of sticks, long press confirms selection.
         
         Args:
-            message: MQTT message containing button press information
+            event: Button press of the player
             
         Returns:
             None
         """
-        player_id = int(message.topic.split("/")[2])
-        if message.topic == BUTTON_TOPIC.format(id=player_id) and player_id == self.players[self.current_player_index].id:
-            payload = json.loads(message.payload.decode("utf-8"))
-            press_type = payload["type"]
-            self.utils.printDebug(payload)
-            if press_type == "short":
+        if event.player_id == self.players[self.current_player_index].id:
+            if event.press_type == SHORT_PRESS:
                 self.toggleSticksToTake()
-            elif press_type == "long":
-                self.removeStick(player_id)
+            else:
+                self.removeStick(event.player_id)
 
     def showTurnInfo(self) -> None:
         """
@@ -71,25 +81,21 @@ class LastStickStanding(Minigame):
             None
         """
         current_player = self.players[self.current_player_index]
-        sticks_visual = "|" * self.sticks + f"{self.sticks:>2}".rjust(16 - self.sticks)
+        sticks_visual = STICK_BARS[self.sticks]
         self.utils.printDebug(f"Turn: Player {current_player.id} - Sticks remaining: {self.sticks}")
         
         # Show turn info to current player
         self.utils.showInLCD(
             current_player.id, 
-            LCDMessage(
-                top=f"Take: {self.sticks_to_take} sticks",
-                down=sticks_visual
-            )
+            Screens.LAST_STICK_TAKE.render(take=self.sticks_to_take, sticks=sticks_visual),
+            state=True,
         )
         
         # Show wait info to other players
         self.utils.showInOtherLCD(
             current_player.id, 
-            LCDMessage(
-                top=f"Wait for P{current_player.id}",
-                down=sticks_visual
-            )
+            Screens.LAST_STICK_WAIT.render(player=current_player.id, sticks=sticks_visual),
+            state=True,
         )
 
     def toggleSticksToTake(self) -> None:
@@ -132,7 +138,7 @@ class LastStickStanding(Minigame):
             self.lastStickStandingEvent.set()
 
 
-    def introduceGame(self) -> None:
+    async def introduceGame(self) -> None:
         """
         Displays game introduction and rules to players.
         Explains controls and winning conditions.
@@ -141,15 +147,15 @@ class LastStickStanding(Minigame):
             None
         """
         self.utils.playInAllBuzzer(LAST_STICK_TUNE)
-        self.utils.showInAllLCD(LCDMessage(top="Last Stick".center(16), down="Standing!".center(16)))
-        time.sleep(3)
-        self.utils.showInAllLCD(LCDMessage(top="If you take", down="the last stick"))
-        time.sleep(3)
-        self.utils.showInAllLCD(LCDMessage(top="You lose!".center(16)))
-        time.sleep(3)
-        self.utils.showInAllLCD(LCDMessage(top="Short:", down="Take 1-2 sticks"))
-        time.sleep(3)
-        self.utils.showInAllLCD(LCDMessage(top="Long:", down="Confirm"))
-        time.sleep(3)
-        self.startCountdown()
-        time.sleep(1)
\ No newline at end of file
+        self.utils.showInAllLCD(Screens.LAST_STICK.render())
+        await self.clock.sleep(3)
+        self.utils.showInAllLCD(Screens.LAST_STICK_RULE.render())
+        await self.clock.sleep(3)
+        self.utils.showInAllLCD(Screens.LAST_STICK_LOSE.render())
+        await self.clock.sleep(3)
+        self.utils.showInAllLCD(Screens.LAST_STICK_SHORT.render())
+        await self.clock.sleep(3)
+        self.utils.showInAllLCD(Screens.LAST_STICK_LONG.render())
+        await self.clock.sleep(3)
+        await self.startCountdown()
+        await self.clock.sleep(1)
\ No newline at end of file
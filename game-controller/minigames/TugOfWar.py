@@ -1,16 +1,25 @@
-import json
-from json import JSONDecodeError
-import time
+import asyncio
 import paho.mqtt.client as mqtt
 from random import Random
-from threading import Event
 from minigames import Minigame
+from Clock import Clock
 from Player import Player
-from Utils import Utils, LCDMessage
+import Screens
+from Message import LCD_WIDTH
+from Utils import Utils
+from InputEvent import InputEvent, LONG_PRESS
 from Melodies import TUG_OF_WAR_TUNE  # Add this import at the top
 
 
-BUTTON_TOPIC = "game/players/{id}/components/button"
+# Rope movement of a long press when both teams have the same size
+PULL = 3
+
+# Rope drawn for every rope position, from fully pulled by the left team (-LCD_WIDTH)
+# to fully pulled by the right team (LCD_WIDTH); the rope wins at either end
+ROPES = tuple(
+    "-" * (LCD_WIDTH + hits) + " " * -hits if hits < 0 else " " * hits + "-" * (LCD_WIDTH - hits)
+    for hits in range(-LCD_WIDTH, LCD_WIDTH + 1)
+)
 
 
 class TugOfWar(Minigame):
@@ -18,16 +27,39 @@ class TugOfWar(Minigame):
     Tug of War: Pull the virtual rope onto your screen.
     - Rules: 
         - Players repeatedly press the button to move a virtual rope closer to their side on the control base LCD screen. 
-        - The first player to pull the rope past a threshold wins.
+        - With more than two players, players are split into two teams (A and B) that pull together.
+        - The first player (or team) to pull the rope past a threshold wins.
         - It's reminiscent of the classic "Tug of War" game ("Tira y Afloja" in Spanish).
     """
 
-    def __init__(self, players: list[Player], client: mqtt.Client, debug: bool) -> None:
-        super().__init__(players, client, debug)
+    def __init__(
+        self,
+        players: list[Player],
+        client: mqtt.Client,
+        debug: bool,
+        prefix: str = "game",
+        clock: Clock = None,
+        rng: Random = None,
+    ) -> None:
+        super().__init__(players, client, debug, prefix, clock, rng)
         self.hits = 0
-        self.tugOfWarEvent = Event()
+        self.tugOfWarEvent = asyncio.Event()
+
+        # Alternate seats between the left (A) and right (B) team
+        self.teams = (players[0::2], players[1::2])
+        left, right = self.teams
+        if len(left) == 1 and len(right) == 1:
+            self.title = f"P{left[0].id}-Tug of War-P{right[0].id}"
+            if len(self.title) > LCD_WIDTH:
+                self.title = f"P{left[0].id} <-Tug-> P{right[0].id}"
+        else:
+            self.title = "A-Tug of War-B"
+        # Each press moves the rope so that both teams pull with the same total strength
+        strength = PULL * min(len(left), len(right))
+        self.pulls = {player.id: -strength / len(left) for player in left}
+        self.pulls.update({player.id: strength / len(right) for player in right})
 
-    def introduceGame(self):
+    async def introduceGame(self):
         """
         Displays game introduction and instructions to players.
         Plays introduction tune and explains game mechanics.
@@ -36,77 +68,65 @@ class TugOfWar(Minigame):
             None
         """
         self.utils.playInAllBuzzer(TUG_OF_WAR_TUNE)
-        self.utils.showInAllLCD(LCDMessage(top="Tug of War!".center(16)))
-        time.sleep(3)
-        self.utils.showInAllLCD(LCDMessage(top="Pull the rope".center(16), down="to your side".center(16)))
-        time.sleep(3)
-        self.utils.showInAllLCD(LCDMessage(top="Long: Pull the", down="rope"))
-        time.sleep(3)
-        self.startCountdown()
-        time.sleep(1)
-        self.utils.showInAllLCD(LCDMessage(top="P1-Tug of War-P2".center(16), down="-" * 16))
+        self.utils.showInAllLCD(Screens.TUG_OF_WAR.render())
+        await self.clock.sleep(3)
+        self.utils.showInAllLCD(Screens.TUG_OF_WAR_PULL.render())
+        await self.clock.sleep(3)
+        self.utils.showInAllLCD(Screens.TUG_OF_WAR_CONTROLS.render())
+        await self.clock.sleep(3)
+        if len(self.players) > 2:
+            for name, team in zip("AB", self.teams):
+                for player in team:
+                    self.utils.showInLCD(player.id, Screens.TUG_OF_WAR_TEAM.render(team=name))
+            await self.clock.sleep(3)
+        await self.startCountdown()
+        await self.clock.sleep(1)
+        self.utils.showInAllLCD(Screens.TUG_OF_WAR_ROPE.render(title=self.title, rope=self.getRope()))
 
-    def playGame(self) -> list[Player]:
+    async def playGame(self) -> list[Player]:
         """
         Main game loop for Tug of War minigame.
         Players compete by pulling rope to their side.
         
         Returns:
-            list[Player]: List containing the winning player
+            list[Player]: List containing the winning player (or team)
         """
-        self.introduceGame()
-        self.client.subscribe(BUTTON_TOPIC.format(id="+"))
-        self.tugOfWarEvent.wait()
-        self.client.unsubscribe(BUTTON_TOPIC.format(id="+"))
-        time.sleep(2)
-        self.utils.showInAllLCD(LCDMessage(top="Tug of War".center(16), down="finished!".center(16)))
-        time.sleep(3)
-        winner: Player = self.players[0] if self.hits < 0 else self.players[1]
-        return [winner]
+        await self.introduceGame()
+        self.acceptInput()
+        await self.tugOfWarEvent.wait()
+        self.ignoreInput()
+        await self.clock.sleep(2)
+        self.utils.showInAllLCD(Screens.TUG_OF_WAR_FINISHED.render())
+        await self.clock.sleep(3)
+        left, right = self.teams
+        return list(left if self.hits < 0 else right)
 
-    def handleMQTTMessage(self, message: mqtt.MQTTMessage) -> None:
+    def handleMQTTMessage(self, event: InputEvent) -> None:
         """
         Processes button presses for rope pulling mechanics.
         Long press moves rope towards player's side.
         
         Args:
-            message: MQTT message containing button press information
+            event: Button press of the player
             
         Returns:
             None
         """
-        player_id = int(message.topic.split("/")[2])
-        if message.topic == BUTTON_TOPIC.format(id=player_id):
-            try:
-                payload = json.loads(message.payload.decode('utf-8'))
-                if payload["type"] == "long" and not self.tugOfWarEvent.is_set():
-                    self.utils.beepPlayer(player_id, frequency=500)  
-                    player_1, player_2 = self.players
-                    if player_id == player_1.id:
-                        self.hits -= 3
-                    elif player_id == player_2.id:
-                        self.hits += 3
-                    rope = self.getRope()
-                    self.utils.showInAllLCD(LCDMessage(top="P1-Tug of War-P2".center(16), down=rope))
-                    
-                    if abs(self.hits) >= 16:
-                        self.tugOfWarEvent.set()
-            except JSONDecodeError:
-                pass
+        player_id = event.player_id
+        if event.press_type == LONG_PRESS and not self.tugOfWarEvent.is_set() and player_id in self.pulls:
+            self.utils.beepPlayer(player_id, frequency=500)  
+            self.hits += self.pulls[player_id]
+            self.utils.showInAllLCD(Screens.TUG_OF_WAR_ROPE.render(title=self.title, rope=self.getRope()))
+            
+            if abs(self.hits) >= LCD_WIDTH:
+                self.tugOfWarEvent.set()
 
     def getRope(self):
         """
-        Generates visual representation of rope position.
+        Looks up the visual representation of the rope position.
         
         Returns:
             str: String showing rope position using dashes and spaces
         """
-        rope = None
-        if self.hits < 0:
-            hits = abs(self.hits)
-            rope = "-" * (16 - hits) + " " * (hits)
-        elif self.hits > 0:
-            rope = " " * (self.hits) + "-" * (16 - self.hits)
-        else:
-            rope = "-" * 16
-        return rope
+        hits = max(-LCD_WIDTH, min(round(self.hits), LCD_WIDTH))
+        return ROPES[hits + LCD_WIDTH]
@@ -0,0 +1,40 @@
+"""
+Tests of the session inbox: only the players of the session get a queue.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GameSession import GameSession  # noqa: E402
+from Utils import BUTTON_COMPONENT  # noqa: E402
+
+
+class OfflineClient:
+    """MQTT client replacement that drops everything it is asked to send."""
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        pass
+
+
+class Message:
+    """Stand-in for paho's MQTTMessage."""
+
+    def __init__(self, payload: bytes) -> None:
+        self.payload = payload
+
+
+def test_messages_of_unknown_players_are_dropped():
+    session = GameSession(OfflineClient(), num_players=2, quiet=True)
+    press = Message(b'{"type": "short"}')
+    for player_id in (1, 2, 3, 99, 10**9):
+        session.onMessage(player_id, BUTTON_COMPONENT, press)
+
+    inbox = session.inbox
+    assert set(inbox.queues) == {1, 2}
+    assert inbox.depth == 2
+    assert inbox.stats["queued"] == 2
+    assert inbox.stats["unknown_player"] == 3
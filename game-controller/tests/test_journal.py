@@ -0,0 +1,48 @@
+"""
+Tests of the game journal: a crash while writing a turn must not keep the game from restarting.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Journal import Journal  # noqa: E402
+
+
+def test_recover_cuts_partial_line(tmp_path):
+    path = str(tmp_path / "table.journal")
+    journal = Journal(path)
+    journal.append("roll", player=1, value=4)
+    journal.commit()
+    journal.close()
+    # Crash in the middle of writing the next turn
+    with open(path, "ab") as file:
+        file.write(b'{"player":2,"type":"ro')
+
+    journal = Journal(path)
+    _, events = journal.recover()
+    assert events == [{"player": 1, "value": 4, "type": "roll"}]
+    journal.append("roll", player=2, value=6)
+    journal.commit()
+    journal.close()
+
+    journal = Journal(path)
+    _, events = journal.recover()
+    assert [event["player"] for event in events] == [1, 2]
+    journal.close()
+
+
+def test_recover_keeps_complete_journal(tmp_path):
+    path = str(tmp_path / "table.journal")
+    journal = Journal(path)
+    journal.append("move", player=1, position=3)
+    journal.commit()
+    size = os.path.getsize(path)
+
+    _, events = journal.recover()
+    assert len(events) == 1
+    assert os.path.getsize(path) == size
+    journal.close()
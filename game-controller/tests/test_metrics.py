@@ -0,0 +1,39 @@
+"""
+Tests of the metrics endpoint: incoming topics can neither break the text format nor add label values.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Metrics import Metrics, messagesIn  # noqa: E402
+from SessionRegistry import SessionRegistry  # noqa: E402
+
+
+class Message:
+    """Stand-in for paho's MQTTMessage."""
+
+    def __init__(self, topic: str, payload: bytes = b"{}") -> None:
+        self.topic = topic
+        self.payload = payload
+
+
+def test_label_values_are_escaped():
+    metrics = Metrics()
+    counter = metrics.counter("test_total", "Test counter", ("name",))
+    counter.inc('a"b\\c\nd')
+
+    assert 'test_total{name="a\\"b\\\\c\\nd"} 1' in metrics.render().splitlines()
+
+
+def test_unknown_components_share_one_label():
+    registry = SessionRegistry()
+    before = set(messagesIn.children)
+    for component in ("nope", 'x"y', "a\nb"):
+        registry.on_message(None, None, Message(f"game/table/players/1/{component}"))
+
+    assert set(messagesIn.children) - before <= {("other",)}
+    assert messagesIn.labels("other").value >= 3
@@ -0,0 +1,102 @@
+"""
+Tests of the LCD output scheduler: repeated frames are only dropped when every LCD already shows them,
+and a state frame is never overtaken by a frame taken from the queue before it.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Message import LCDMessage  # noqa: E402
+from OutputScheduler import OutputScheduler  # noqa: E402
+from Player import Player  # noqa: E402
+from Roster import Roster  # noqa: E402
+from Utils import Utils  # noqa: E402
+
+
+class RecordingClient:
+    """MQTT client replacement that keeps everything it is asked to publish."""
+
+    def __init__(self) -> None:
+        self.published: list[tuple[str, bytes]] = []
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        self.published.append((topic, payload))
+
+
+def createUtils(scheduler: OutputScheduler) -> Utils:
+    players = Roster([Player(1), Player(2)])
+    return Utils(scheduler, players, debug=False, prefix="game/table", broadcast=True)
+
+
+def test_broadcast_repeated_after_player_frame_is_sent():
+    client = RecordingClient()
+    scheduler = OutputScheduler(client, max_fps=None)
+    utils = createUtils(scheduler)
+    first, second = LCDMessage("A"), LCDMessage("B")
+
+    utils.showInAllLCD(first)
+    scheduler.flush()
+    utils.showInLCD(1, second)
+    scheduler.flush()
+    utils.showInAllLCD(first)
+    scheduler.flush()
+
+    assert client.published == [
+        ("game/table/players/all/components/lcd", first.payload),
+        ("game/table/players/1/components/lcd", second.payload),
+        ("game/table/players/all/components/lcd", first.payload),
+    ]
+    assert scheduler.stats["dropped"] == 0
+
+
+def test_broadcast_repeated_is_dropped():
+    client = RecordingClient()
+    scheduler = OutputScheduler(client, max_fps=None)
+    utils = createUtils(scheduler)
+    message = LCDMessage("A")
+
+    utils.showInAllLCD(message)
+    scheduler.flush()
+    utils.showInAllLCD(message)
+    scheduler.flush()
+
+    assert len(client.published) == 1
+    assert scheduler.stats["dropped"] == 1
+
+
+class RacingClient(RecordingClient):
+    """Client that publishes a state frame from another thread while the first queued frame is being sent."""
+
+    def __init__(self, publish_state) -> None:
+        super().__init__()
+        self.publishState = publish_state
+        self.thread = None
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.publishState)
+            self.thread.start()
+            time.sleep(0.1)
+        super().publish(topic, payload, qos, retain)
+
+
+def test_state_frame_published_during_flush_lands_last():
+    queued, state = LCDMessage("A"), LCDMessage("B")
+    scheduler = OutputScheduler(None, max_fps=None)
+    utils = createUtils(scheduler)
+    client = scheduler.client = RacingClient(lambda: utils.showInLCD(1, state, state=True))
+
+    utils.showInLCD(1, queued)
+    scheduler.flush()
+    client.thread.join()
+
+    assert client.published == [
+        ("game/table/players/1/components/lcd", queued.payload),
+        ("game/table/players/1/components/lcd", state.payload),
+    ]